@@ -1,50 +1,108 @@
 """Agent that calculates the estimated budget based on user input and compares it with the user's budget."""
 
-from langchain_core.runnables import RunnableConfig
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_core.messages import HumanMessage,SystemMessage
-from langchain_tavily import TavilySearch
+import asyncio
+from functools import lru_cache
+from langchain_core.messages import BaseMessage, HumanMessage,SystemMessage
 
 from langgraph.prebuilt import create_react_agent
 
 from backend.api_key_load import GEMINI_API_KEY
-from backend.intents.rest_agent_intents import get_flight_data, get_hotel_data, get_accommodation_data_of_city, get_car_rental_data_of_city
+from backend.intents.rest_agent_intents import get_flight_data, get_hotel_data, get_accommodation_data_of_city, get_car_rental_data_of_city, run_sync
+from backend.agents.direct_fetch import direct_messages, has_required, prefetch
+from backend.agents.governed import GovernedChatGoogleGenerativeAI
+from backend.agents.llm_cache import llm_cache_for
 from backend.agents.prompts import BUDGET_AGENT_SYSTEM_PROMPT
+from backend.agents.web_search import get_web_search
+from backend.api_clients.accommodation_api import get_accommodation_data
+from backend.api_clients.car_rental_api import get_car_rental_data
+from backend.api_clients.flight_api import get_flight_data_async
+from backend.api_clients.hotel_rental_api import get_hotel_data_async
+from backend.api_clients.location_api import get_city_code
+from backend.config import AGENT_FETCH_MODE
 
 class BudgetAgent:
     """Create a budget agent."""
-    def __init__(self, budget: int, origin_city: str, destination: str, start_date: str, end_date: str, adults: int = 1):
-        self.llm = ChatGoogleGenerativeAI(model="gemini-2.5-flash", api_key=GEMINI_API_KEY, temperature=0.5)
-        self.budget = budget
-        self.origin_city = origin_city
-        self.destination = destination
-        self.start_date = start_date
-        self.end_date = end_date
-        self.adults = adults
-        self.tavily_search = TavilySearch()
+    def __init__(self) -> None:
+        self.llm = GovernedChatGoogleGenerativeAI(model="gemini-2.5-flash", api_key=GEMINI_API_KEY, temperature=0.5,
+                                                  cache=llm_cache_for("budget", "gemini-2.5-flash", 0.5))
+        self.tavily_search = get_web_search()
         self.system_prompt = BUDGET_AGENT_SYSTEM_PROMPT
         self.tools = [get_flight_data, get_hotel_data, get_accommodation_data_of_city, get_car_rental_data_of_city, self.tavily_search]
         self.budget_agent = create_react_agent(self.llm, self.tools)
+        self.direct_fetch = AGENT_FETCH_MODE == "direct"
 
-
-    def get_budget(self, suggestion_response: str) -> RunnableConfig | None:
-        """Initialize the budget agent to get its response."""
-        self.system_prompt += f"\n\n---SUGGESTIONS---\n{suggestion_response}\n---END SUGGESTIONS---"
-        budget_prompt = (f"The number of people travelling is {self.adults}. I/We have a budget of {self.budget} USD. "
-                         f"I/We are travelling from {self.origin_city} to {self.destination} from {self.start_date} to {self.end_date}. "
+    def build_messages(self, budget: int, origin_city: str, destination: str, start_date: str, end_date: str,
+                       adults: int, suggestion_response: str) -> list[BaseMessage]:
+        """Build the system and human messages for the budget agent."""
+        system_prompt = self.system_prompt
+        if suggestion_response:
+            system_prompt += f"\n\n---SUGGESTIONS---\n{suggestion_response}\n---END SUGGESTIONS---"
+        budget_prompt = (f"The number of people travelling is {adults}. I/We have a budget of {budget} USD. "
+                         f"I/We are travelling from {origin_city} to {destination} from {start_date} to {end_date}. "
                          f"Can you calculate the estimated budget for flights, hotels, accommodation, car rentals and taxi/uber? "
                          f"Compare it with my budget and provide suggestions on how to manage the budget effectively. "
                          f"Also, provide any additional information that might be useful for planning the trip.")
-        messages = [
-            SystemMessage(content=self.system_prompt),
+        return [
+            SystemMessage(content=system_prompt),
             HumanMessage(content=budget_prompt)
         ]
 
+    @staticmethod
+    async def aprefetch(origin_city: str, destination: str, start_date: str, end_date: str,
+                        adults: int) -> dict[str, str | None]:
+        """Fetch the flight and hotel offers, accommodation and car rentals the agent always asks for.
+
+        City names are resolved to IATA city codes with Amadeus instead of by the LLM.
+        """
+        async def flights() -> str | None:
+            origin_code, destination_code = await asyncio.gather(get_city_code(origin_city), get_city_code(destination))
+            if not origin_code or not destination_code:
+                return None
+            return await get_flight_data_async(origin_code, destination_code, start_date, end_date, adults)
+
+        async def hotels() -> str | None:
+            city_code = await get_city_code(destination)
+            return await get_hotel_data_async(city_code, start_date, end_date, adults) if city_code else None
+
+        return await prefetch({
+            "get_flight_data": flights(),
+            "get_hotel_data": hotels(),
+            "get_accommodation_data_of_city": get_accommodation_data(destination),
+            "get_car_rental_data_of_city": get_car_rental_data(destination),
+        })
+
+    def get_budget(self, budget: int, origin_city: str, destination: str, start_date: str, end_date: str,
+                   adults: int = 1, suggestion_response: str = "") -> str:
+        """Initialize the budget agent to get its response."""
+        messages = self.build_messages(budget, origin_city, destination, start_date, end_date, adults, suggestion_response)
+        if self.direct_fetch:
+            data = run_sync(self.aprefetch(origin_city, destination, start_date, end_date, adults))
+            if has_required("budget", data, "get_flight_data", "get_hotel_data"):
+                return str(self.llm.invoke(direct_messages(str(messages[0].content), str(messages[1].content), data)).content)
+
         response = ""
 
         for step in self.budget_agent.stream({"messages": messages}):
 
             if "messages" in step and step["messages"]:
-                response = step["messages"][-1].content
+                response = str(step["messages"][-1].content)
+
+        return response
+
+    async def aget_budget(self, budget: int, origin_city: str, destination: str, start_date: str, end_date: str,
+                          adults: int = 1, suggestion_response: str = "") -> str:
+        """Async version of get_budget that runs the tools natively on the event loop."""
+        messages = self.build_messages(budget, origin_city, destination, start_date, end_date, adults, suggestion_response)
+        if self.direct_fetch:
+            data = await self.aprefetch(origin_city, destination, start_date, end_date, adults)
+            if has_required("budget", data, "get_flight_data", "get_hotel_data"):
+                return str((await self.llm.ainvoke(direct_messages(str(messages[0].content), str(messages[1].content), data))).content)
+
+        result = await self.budget_agent.ainvoke({"messages": messages})
+        return str(result["messages"][-1].content) if result.get("messages") else ""
+
 
-        return response
\ No newline at end of file
+@lru_cache(maxsize=1)
+def get_budget_agent() -> BudgetAgent:
+    """Get the process-wide budget agent, built on first use."""
+    return BudgetAgent()
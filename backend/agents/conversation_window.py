@@ -0,0 +1,95 @@
+"""Context window policy for the Phase 2 supervisor conversation."""
+
+from typing import List, Sequence
+
+from langchain_core.messages import BaseMessage, HumanMessage, AIMessage, ToolMessage
+
+from backend.streaming import message_text
+
+# Rough characters-per-token ratio used to estimate prompt sizes without a tokenizer.
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(messages: Sequence[BaseMessage]) -> int:
+    """Approximate number of prompt tokens of the messages."""
+    chars = 0
+    for message in messages:
+        chars += len(message_text(message))
+        if isinstance(message, AIMessage) and message.tool_calls:
+            chars += len(str(message.tool_calls))
+    return chars // CHARS_PER_TOKEN
+
+
+def compact_tool_outputs(messages: Sequence[BaseMessage], max_chars: int) -> List[BaseMessage]:
+    """Cut tool outputs longer than max_chars, except those answering the latest user turn.
+
+    Tool outputs of the turn in progress are kept whole since the supervisor is still
+    reasoning over them.
+    """
+    last_turn = max((i for i, message in enumerate(messages) if isinstance(message, HumanMessage)), default=-1)
+    compacted = []
+    for i, message in enumerate(messages):
+        text = message_text(message)
+        if isinstance(message, ToolMessage) and i < last_turn and len(text) > max_chars:
+            message = message.model_copy(update={"content": text[:max_chars] + " ...[truncated]"})
+        compacted.append(message)
+    return compacted
+
+
+def window_start(messages: Sequence[BaseMessage], summarized: int, max_turns: int, token_budget: int,
+                 tool_output_chars: int, summary_batch: int) -> int:
+    """Index of the first message sent verbatim to the supervisor.
+
+    Messages before the index are folded into the rolling summary. The window always starts at
+    a user turn (or at the beginning of the thread) so tool calls stay next to their results.
+
+    Args:
+        messages: Full message history of the thread.
+        summarized: Number of leading messages already covered by the summary.
+        max_turns: Number of most recent user turns to keep.
+        token_budget: Estimated token limit of the compacted window.
+        tool_output_chars: Length that older tool outputs are cut to.
+        summary_batch: Minimum number of messages to fold into the summary at once; smaller
+            overflows stay in the window while it fits the token budget.
+
+    Returns:
+        The start index of the window, never lower than summarized.
+    """
+    turn_starts = [i for i, message in enumerate(messages) if isinstance(message, HumanMessage)]
+    if len(turn_starts) <= max_turns:
+        start = 0
+    else:
+        start = turn_starts[-max(max_turns, 1)]
+    start = max(start, summarized)
+
+    def window_tokens(first: int) -> int:
+        return estimate_tokens(compact_tool_outputs(messages[first:], tool_output_chars))
+
+    # Drop whole turns until the window fits, but always keep the latest one.
+    later_turns = [i for i in turn_starts if i > start]
+    forced = False
+    while later_turns and window_tokens(start) > token_budget:
+        start = later_turns.pop(0)
+        forced = True
+
+    # Summarizing costs an LLM call, so wait until enough messages have left the window.
+    if not forced and start - summarized < summary_batch and window_tokens(summarized) <= token_budget:
+        start = summarized
+    return start
+
+
+def transcript(messages: Sequence[BaseMessage], tool_output_chars: int) -> str:
+    """Plain-text transcript of the messages for the summarizer."""
+    lines = []
+    for message in messages:
+        text = message_text(message)
+        if isinstance(message, HumanMessage):
+            lines.append(f"User: {text}")
+        elif isinstance(message, ToolMessage):
+            lines.append(f"Tool ({message.name}): {text[:tool_output_chars]}")
+        elif isinstance(message, AIMessage):
+            if text:
+                lines.append(f"Assistant: {text}")
+            for call in message.tool_calls:
+                lines.append(f"Assistant called {call['name']} with {call['args']}")
+    return "\n".join(lines)
@@ -0,0 +1,80 @@
+"""Direct-fetch mode of the specialist agents: fetch the data in code, then make one LLM call.
+
+Each agent's prompt tells it to always call the same API tools first, so the first ReAct
+round trip only decides what is already known. In direct mode the agent fetches that data
+up front, concurrently, and hands it to a single LLM call; it falls back to its ReAct loop
+when required data is missing or fails.
+"""
+
+import asyncio
+import json
+from collections import Counter
+from typing import Any, Awaitable, Dict, Optional
+
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
+
+from backend.metrics import gauge
+
+# Runs per (agent, "direct" or "react"), to see how often prefetching falls back.
+agent_runs: Counter = Counter()
+
+
+def usable(result: Any) -> bool:
+    """Whether a tool result holds data, not None, an "Error: ..." string or an empty/error JSON payload."""
+    if not isinstance(result, str) or not result.strip() or result.startswith("Error"):
+        return False
+    try:
+        data = json.loads(result)
+    except ValueError:
+        return True
+    if isinstance(data, dict) and "error" in data:
+        return False
+    return bool(data)
+
+
+async def prefetch(fetches: Dict[str, Awaitable[Optional[str]]]) -> Dict[str, Optional[str]]:
+    """Run the fetches concurrently and return their results by name, None for failed or empty ones."""
+    names = list(fetches)
+    results = await asyncio.gather(*fetches.values(), return_exceptions=True)
+    data: Dict[str, Optional[str]] = {}
+    for name, result in zip(names, results):
+        if isinstance(result, BaseException):
+            print(f"Error prefetching {name}: {result}")
+            data[name] = None
+        else:
+            data[name] = result if usable(result) else None
+    return data
+
+
+def has_required(agent: str, data: Dict[str, Optional[str]], *required: str) -> bool:
+    """Whether every required result was fetched, recording a fallback for the agent otherwise."""
+    missing = [name for name in required if data.get(name) is None]
+    agent_runs[(agent, "react" if missing else "direct")] += 1
+    if missing:
+        print(f"{agent} agent: missing {', '.join(missing)}, falling back to ReAct")
+    return not missing
+
+
+def direct_messages(system_prompt: str, human_prompt: str, data: Dict[str, Optional[str]]) -> list[BaseMessage]:
+    """System and human messages of a direct-mode call, with the prefetched data in the system prompt.
+
+    Args:
+        system_prompt (str): The agent's system prompt.
+        human_prompt (str): The agent's request.
+        data: Prefetched tool results by name; None marks data that could not be fetched.
+
+    Returns:
+        The messages for one LLM call without tools.
+    """
+    sections = "\n".join(f"[{name}]\n{result if result is not None else 'Not available.'}"
+                         for name, result in data.items())
+    system_prompt += ("\n\n---PREFETCHED TOOL DATA---\n"
+                      "The tools were already called for you and returned the data below. Tools are not "
+                      "available in this conversation: answer from this data and your own knowledge.\n"
+                      f"{sections}\n---END PREFETCHED TOOL DATA---")
+    return [SystemMessage(content=system_prompt), HumanMessage(content=human_prompt)]
+
+
+gauge("direct_fetch_agent_runs", "Direct-mode specialist agent runs, answered from prefetched data (direct) "
+      "or by the ReAct fallback (react).",
+      lambda: [({"agent": agent, "mode": mode}, count) for (agent, mode), count in agent_runs.items()])
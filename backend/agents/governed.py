@@ -0,0 +1,117 @@
+"""Gemini chat model and Tavily search tool whose calls go through the upstream governor."""
+
+import asyncio
+import re
+import time
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
+
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+from langchain_core.messages import AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGenerationChunk, ChatResult
+from langchain_google_genai import ChatGoogleGenerativeAI
+from langchain_tavily import TavilySearch
+
+from backend.api_clients.governor import RETRY_STATUS_CODES, upstream_governors
+from backend.config import UPSTREAM_MAX_RETRIES
+
+
+def _with_call_seconds(result: ChatResult, seconds: float) -> ChatResult:
+    """Record how long the Gemini call took in the generation info, e.g. for the LLM response cache."""
+    for generation in result.generations:
+        generation.generation_info = {**(generation.generation_info or {}), "call_seconds": seconds}
+    return result
+
+
+def _call_seconds_chunk(seconds: float) -> ChatGenerationChunk:
+    """Empty last chunk of a stream carrying how long the call took, merged into the generation info."""
+    return ChatGenerationChunk(message=AIMessageChunk(content=""), generation_info={"call_seconds": seconds})
+
+
+class GovernedChatGoogleGenerativeAI(ChatGoogleGenerativeAI):
+    """ChatGoogleGenerativeAI that waits for a Gemini slot before each call.
+
+    Throttling errors are already retried with backoff inside ChatGoogleGenerativeAI
+    (max_retries), so the governor only paces and caps the calls. The duration of each call,
+    without the wait for a slot, is added to the generation info as "call_seconds".
+    """
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager: Optional[CallbackManagerForLLMRun] = None, **kwargs: Any) -> ChatResult:
+        with upstream_governors["gemini"].sync_slot():
+            start = time.perf_counter()
+            result = super()._generate(messages, stop=stop, run_manager=run_manager, **kwargs)
+            return _with_call_seconds(result, time.perf_counter() - start)
+
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                         run_manager: Optional[AsyncCallbackManagerForLLMRun] = None, **kwargs: Any) -> ChatResult:
+        async with upstream_governors["gemini"].slot():
+            start = time.perf_counter()
+            result = await super()._agenerate(messages, stop=stop, run_manager=run_manager, **kwargs)
+            return _with_call_seconds(result, time.perf_counter() - start)
+
+    def _stream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                run_manager: Optional[CallbackManagerForLLMRun] = None, **kwargs: Any) -> Iterator[ChatGenerationChunk]:
+        with upstream_governors["gemini"].sync_slot():
+            start = time.perf_counter()
+            yield from super()._stream(messages, stop=stop, run_manager=run_manager, **kwargs)
+            yield _call_seconds_chunk(time.perf_counter() - start)
+
+    async def _astream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                       run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+                       **kwargs: Any) -> AsyncIterator[ChatGenerationChunk]:
+        async with upstream_governors["gemini"].slot():
+            start = time.perf_counter()
+            async for chunk in super()._astream(messages, stop=stop, run_manager=run_manager, **kwargs):
+                yield chunk
+            yield _call_seconds_chunk(time.perf_counter() - start)
+
+
+# The Tavily client raises plain exceptions whose message starts with the status, e.g. "Error 429: ...".
+_TAVILY_ERROR_STATUS = re.compile(r"^Error (\d{3})\b")
+
+
+def _error_status_code(error: Any) -> Optional[int]:
+    """HTTP status code of a failed Tavily search, or None if the error did not come from an answer."""
+    # requests/httpx errors carry the response, aiohttp errors the status.
+    status = getattr(getattr(error, "response", None), "status_code", None)
+    if not isinstance(status, int):
+        status = getattr(error, "status", None)
+    if isinstance(status, int):
+        return status
+    match = _TAVILY_ERROR_STATUS.match(str(error))
+    return int(match.group(1)) if match else None
+
+
+def _is_throttled(result: Any) -> bool:
+    """Whether a Tavily result is the error it returns for a 429/503 answer."""
+    if not isinstance(result, dict) or "error" not in result:
+        return False
+    return _error_status_code(result["error"]) in RETRY_STATUS_CODES
+
+
+class GovernedTavilySearch(TavilySearch):
+    """TavilySearch that waits for a Tavily slot and retries throttled searches with backoff.
+
+    TavilySearch returns {"error": ...} instead of raising, so throttling is detected from
+    the returned error.
+    """
+
+    def _run(self, *args: Any, **kwargs: Any) -> Dict[str, Any]:
+        governor = upstream_governors["tavily"]
+        for attempt in range(UPSTREAM_MAX_RETRIES + 1):
+            with governor.sync_slot():
+                result = super()._run(*args, **kwargs)
+            if not _is_throttled(result) or attempt == UPSTREAM_MAX_RETRIES:
+                return result
+            time.sleep(governor.backoff(attempt))
+        return result
+
+    async def _arun(self, *args: Any, **kwargs: Any) -> Dict[str, Any]:
+        governor = upstream_governors["tavily"]
+        for attempt in range(UPSTREAM_MAX_RETRIES + 1):
+            async with governor.slot():
+                result = await super()._arun(*args, **kwargs)
+            if not _is_throttled(result) or attempt == UPSTREAM_MAX_RETRIES:
+                return result
+            await asyncio.sleep(governor.backoff(attempt))
+        return result
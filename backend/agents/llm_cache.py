@@ -0,0 +1,127 @@
+"""Response cache of the specialist agents' and synthesizer's Gemini calls.
+
+Retries, duplicate submissions and destinations whose tool data is already cached send
+byte-identical messages to the same model, so those nodes answer from a cache keyed on the
+model, temperature and a hash of the messages (plus bound tools and call options). Nodes opt
+in with LLM_CACHE_NODES; the supervisor's chat turns are never cached.
+"""
+
+import hashlib
+import uuid
+from collections import Counter
+from typing import Any, Dict, Optional, Sequence, Union
+
+from langchain_core.caches import BaseCache
+from langchain_core.messages import message_to_dict, messages_from_dict
+from langchain_core.outputs import ChatGeneration, Generation
+
+from backend.cache import AsyncTTLCache, SQLiteCacheStore
+from backend.config import LLM_CACHE_DB, LLM_CACHE_NODES, LLM_CACHE_SIZE, LLM_CACHE_TTL
+from backend.metrics import gauge
+
+llm_response_cache = AsyncTTLCache(
+    "llm_responses",
+    maxsize=LLM_CACHE_SIZE,
+    ttl=LLM_CACHE_TTL,
+    store=SQLiteCacheStore(LLM_CACHE_DB, "llm_responses") if LLM_CACHE_DB else None
+)
+
+# Hits and misses per node, and seconds of LLM calls that hits did not have to make.
+node_lookups: Counter = Counter()
+seconds_saved: Counter = Counter()
+
+
+def _dump_generation(generation: Generation) -> Dict[str, Any]:
+    """JSON form of a chat generation without message id, token usage and call duration.
+
+    Hits are not counted as spent tokens, and report no call duration of their own.
+    """
+    response_metadata = {name: value for name, value in generation.message.response_metadata.items()
+                         if name != "call_seconds"}
+    message = generation.message.model_copy(update={"id": None, "usage_metadata": None,
+                                                     "response_metadata": response_metadata})
+    generation_info = {name: value for name, value in (generation.generation_info or {}).items()
+                       if name != "call_seconds"}
+    return {"message": message_to_dict(message), "generation_info": generation_info or None}
+
+
+def _load_generation(data: Dict[str, Any]) -> ChatGeneration:
+    """Chat generation of a cache hit, whose message gets a fresh id so streamed output can be matched to it."""
+    message = messages_from_dict([data["message"]])[0]
+    message.id = str(uuid.uuid4())
+    return ChatGeneration(message=message, generation_info=data["generation_info"])
+
+
+class LLMResponseCache(BaseCache):
+    """LangChain cache of one node's chat model, stored in the shared llm_responses cache.
+
+    Passed as the cache of a chat model, it is consulted before the model's governor slot,
+    so hits neither call nor wait for Gemini. Each entry keeps how long the call took (the
+    "call_seconds" the governed model records), which is added to seconds_saved on every hit.
+    """
+    def __init__(self, node: str, model: str, temperature: Optional[float]):
+        self.node = node
+        self.model = model
+        self.temperature = temperature
+
+    def _key(self, prompt: str, llm_string: str) -> str:
+        digest = hashlib.sha256(f"{llm_string}\n{prompt}".encode()).hexdigest()
+        return f"{self.model}|{self.temperature}|{digest}"
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[Sequence[Generation]]:
+        entry = llm_response_cache.get(self._key(prompt, llm_string), count=True)
+        if entry is None:
+            node_lookups[(self.node, "miss")] += 1
+            return None
+        node_lookups[(self.node, "hit")] += 1
+        seconds_saved[self.node] += entry["seconds"]
+        return [_load_generation(generation) for generation in entry["generations"]]
+
+    def update(self, prompt: str, llm_string: str, return_val: Sequence[Generation]) -> None:
+        llm_response_cache.set(self._key(prompt, llm_string), {
+            "generations": [_dump_generation(generation) for generation in return_val],
+            "seconds": max(((generation.generation_info or {}).get("call_seconds", 0.0) for generation in return_val),
+                           default=0.0),
+        })
+
+    async def alookup(self, prompt: str, llm_string: str) -> Optional[Sequence[Generation]]:
+        return self.lookup(prompt, llm_string)
+
+    async def aupdate(self, prompt: str, llm_string: str, return_val: Sequence[Generation]) -> None:
+        self.update(prompt, llm_string, return_val)
+
+    def clear(self, **kwargs: Any) -> None:
+        llm_response_cache.clear()
+
+
+def llm_cache_for(node: str, model: str, temperature: Optional[float]) -> Union[LLMResponseCache, bool]:
+    """Cache argument for the chat model of a node: an LLMResponseCache if the node opted in, else False.
+
+    Args:
+        node (str): Graph node using the model, e.g. "weather" or "synthesizer".
+        model (str): Gemini model name.
+        temperature: Sampling temperature of the model.
+    """
+    if node not in LLM_CACHE_NODES:
+        return False
+    return LLMResponseCache(node, model, temperature)
+
+
+def llm_cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Hits, misses, hit rate and seconds saved per node."""
+    stats = {}
+    for node in sorted({node for node, _ in node_lookups}):
+        hits, misses = node_lookups[(node, "hit")], node_lookups[(node, "miss")]
+        stats[node] = {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+            "seconds_saved": round(seconds_saved[node], 3),
+        }
+    return stats
+
+
+gauge("llm_cache_lookups", "LLM response cache lookups per node and result (hit or miss).",
+      lambda: [({"node": node, "result": result}, count) for (node, result), count in node_lookups.items()])
+gauge("llm_cache_seconds_saved", "Seconds of LLM calls answered from the response cache, per node.",
+      lambda: [({"node": node}, seconds) for node, seconds in seconds_saved.items()])
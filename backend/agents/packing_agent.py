@@ -1,26 +1,48 @@
 """Agent that will communicate with other agents and will make the itinerary for the user."""
 
 # import uuid
-from typing import TypedDict, Annotated, List, Dict, Any
+from typing import TypedDict, Annotated, Awaitable, Callable, List, Dict, Any, Optional, Tuple
 from operator import add
 
 from langchain_core.messages import SystemMessage, HumanMessage, BaseMessage, AIMessage
+from langchain_core.runnables import RunnableLambda
 from langgraph.graph import StateGraph, END
-from langgraph.checkpoint.memory import MemorySaver
+from langgraph.checkpoint.base import BaseCheckpointSaver
 from langgraph.prebuilt import ToolNode
 from langgraph.graph.state import CompiledStateGraph
 
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_tavily import TavilySearch
-
 from datetime import date
-from backend.api_key_load import GEMINI_PRO_API_KEY
-from backend.agents.weather_agent import WeatherAgent
-from backend.agents.suggestion_agent import SuggestionAgent
-from backend.agents.budget_agent import BudgetAgent
-from backend.agents.prompts import PACKING_AGENT_SYSTEM_PROMPT
+from backend.api_key_load import GEMINI_API_KEY, GEMINI_PRO_API_KEY
+from backend.checkpoint import create_checkpointer
+from backend.streaming import message_text
+from backend.config import (PHASE1_TOPOLOGY, SUPERVISOR_MAX_TURNS, SUPERVISOR_TOKEN_BUDGET, SUPERVISOR_SUMMARY_ENABLED,
+                            SUPERVISOR_SUMMARY_BATCH, SUPERVISOR_TOOL_OUTPUT_CHARS)
+from backend.metrics import histogram, TOKEN_BUCKETS
+from backend.intents.rest_agent_intents import run_sync
+from backend.plan_cache import cached_stage, cached_stage_sync, stage_cached
+from backend.agents.conversation_window import estimate_tokens, compact_tool_outputs, window_start, transcript
+from backend.agents.weather_agent import get_weather_agent
+from backend.agents.suggestion_agent import get_suggestion_agent
+from backend.agents.budget_agent import get_budget_agent
+from backend.agents.governed import GovernedChatGoogleGenerativeAI
+from backend.agents.llm_cache import llm_cache_for
+from backend.agents.prompts import PACKING_AGENT_SYSTEM_PROMPT, CONVERSATION_SUMMARY_PROMPT
+from backend.agents.web_search import get_web_search
 from backend.intents.packing_agent_intents import weather_tool, suggestion_tool, budget_tool
 
+supervisor_input_tokens = histogram("supervisor_input_tokens", "Input tokens of each supervisor LLM call.",
+                                    TOKEN_BUCKETS)
+supervisor_window_messages = histogram("supervisor_window_messages",
+                                       "History messages sent verbatim to the supervisor per call.",
+                                       (2, 4, 8, 16, 32, 64))
+
+# State key, progress label and error message of each Phase 1 specialist stage.
+PHASE1_STAGES: Dict[str, Tuple[str, str, str]] = {
+    "weather": ("weather_response", "WEATHER AGENT", "Error getting weather data"),
+    "suggestion": ("suggestion_response", "SUGGESTION AGENT", "Error getting suggestions"),
+    "budget": ("budget_response", "BUDGET AGENT", "Error getting budget analysis"),
+}
+
 class TravelPlanningState(TypedDict):
     origin_city: str
     destination: str
@@ -33,23 +55,47 @@ class TravelPlanningState(TypedDict):
     business: bool
 
     weather_response: str
+    # Places the suggestion agent needs, prefetched alongside the weather agent (parallel topology).
+    suggestion_data: Dict[str, Optional[str]]
     suggestion_response: str
     budget_response: str
     final_itinerary: str
+    # Specialist agent responses appended to the system prompt of this thread only.
+    agent_context: str
+    # Rolling summary of the first summarized_messages messages, which the supervisor no longer sees.
+    conversation_summary: str
+    summarized_messages: int
 
     initial_plan_complete: bool
     messages: Annotated[List[BaseMessage], add]
 
 
 class PackingAgent:
-    def __init__(self):
-        self.llm = ChatGoogleGenerativeAI(
+    def __init__(self, phase1_topology: str = PHASE1_TOPOLOGY, checkpointer: BaseCheckpointSaver | None = None):
+        if phase1_topology not in ("serial", "parallel"):
+            raise ValueError(f"Unknown Phase 1 topology: {phase1_topology}")
+        self.phase1_topology = phase1_topology
+        self.llm = GovernedChatGoogleGenerativeAI(
             model="gemini-2.5-pro",
             api_key=GEMINI_PRO_API_KEY,
             temperature=0.5
         )
-        self.memory = MemorySaver()
-        self.tavily_search = TavilySearch()
+        # Same model for the synthesizer, whose responses may be cached; supervisor turns never are.
+        self.synthesis_llm = GovernedChatGoogleGenerativeAI(
+            model="gemini-2.5-pro",
+            api_key=GEMINI_PRO_API_KEY,
+            temperature=0.5,
+            cache=llm_cache_for("synthesizer", "gemini-2.5-pro", 0.5)
+        )
+        # Cheaper model that folds old chat turns into the rolling conversation summary. Its tokens
+        # are tagged "nostream" so they are not streamed to the client as part of the supervisor reply.
+        self.summary_llm = GovernedChatGoogleGenerativeAI(
+            model="gemini-2.5-flash",
+            api_key=GEMINI_API_KEY,
+            temperature=0
+        ).with_config(tags=["nostream"])
+        self.memory = checkpointer or create_checkpointer()
+        self.tavily_search = get_web_search()
         self.system_prompt = PACKING_AGENT_SYSTEM_PROMPT
         self.tools = [weather_tool, suggestion_tool, budget_tool, self.tavily_search]
 
@@ -60,12 +106,14 @@ class PackingAgent:
     def build_graph(self) -> CompiledStateGraph:
         workflow = StateGraph(TravelPlanningState)
 
-        workflow.add_node("weather_agent", self.call_weather_agent)
-        workflow.add_node("suggestion_agent", self.call_suggestion_agent)
-        workflow.add_node("budget_agent", self.call_budget_agent)
-        workflow.add_node("synthesizer", self.call_synthesizer)
+        # Each node has a sync implementation for graph.invoke and a native async one for graph.ainvoke.
+        workflow.add_node("weather_agent", RunnableLambda(self.call_weather_agent, afunc=self.acall_weather_agent))
+        workflow.add_node("suggestion_data", RunnableLambda(self.call_suggestion_data, afunc=self.acall_suggestion_data))
+        workflow.add_node("suggestion_agent", RunnableLambda(self.call_suggestion_agent, afunc=self.acall_suggestion_agent))
+        workflow.add_node("budget_agent", RunnableLambda(self.call_budget_agent, afunc=self.acall_budget_agent))
+        workflow.add_node("synthesizer", RunnableLambda(self.call_synthesizer, afunc=self.acall_synthesizer))
 
-        workflow.add_node("supervisor", self.call_supervisor)
+        workflow.add_node("supervisor", RunnableLambda(self.call_supervisor, afunc=self.acall_supervisor))
         tool_node = ToolNode(self.tools)
         workflow.add_node("tools", tool_node)
 
@@ -74,13 +122,20 @@ class PackingAgent:
 
         workflow.add_conditional_edges(
             "gatekeeper",
-            lambda state: "supervisor" if state.get("initial_plan_complete") else "weather_agent",
-            {"weather_agent": "weather_agent", "supervisor": "supervisor"}
+            self.route_from_gatekeeper,
+            ["weather_agent", "suggestion_data", "budget_agent", "supervisor"]
         )
 
-        workflow.add_edge("weather_agent", "suggestion_agent")
-        workflow.add_edge("suggestion_agent", "budget_agent")
-        workflow.add_edge("budget_agent", "synthesizer")
+        if self.phase1_topology == "parallel":
+            # Every upstream fetch starts at once: the weather agent, the places of the suggestion
+            # agent and the budget agent, which only needs the trip details. Only the suggestion
+            # LLM call waits for the weather text, and the synthesizer waits for everything.
+            workflow.add_edge(["weather_agent", "suggestion_data"], "suggestion_agent")
+            workflow.add_edge(["suggestion_agent", "budget_agent"], "synthesizer")
+        else:
+            workflow.add_edge("weather_agent", "suggestion_agent")
+            workflow.add_edge("suggestion_agent", "budget_agent")
+            workflow.add_edge("budget_agent", "synthesizer")
         workflow.add_edge("synthesizer", END)
 
         workflow.add_conditional_edges(
@@ -92,6 +147,14 @@ class PackingAgent:
 
         return workflow.compile(checkpointer=self.memory)
 
+    def route_from_gatekeeper(self, state: TravelPlanningState) -> str | List[str]:
+        """Route to the chat supervisor or fan out into the Phase 1 agents."""
+        if state.get("initial_plan_complete"):
+            return "supervisor"
+        if self.phase1_topology == "parallel":
+            return ["weather_agent", "suggestion_data", "budget_agent"]
+        return "weather_agent"
+
     def should_continue(self, state: TravelPlanningState) -> str:
         """Determine if we should continue to tools or end."""
         messages = state.get("messages", [])
@@ -109,56 +172,39 @@ class PackingAgent:
         print("---GATEKEEPER CHECKING---")
         return {}
 
-    def call_weather_agent(self, state: TravelPlanningState) -> Dict[str, Any]:
-        print("---(Phase 1) CALLING WEATHER AGENT---")
-        try:
-            weather_agent = WeatherAgent(
-                state["destination"],
-                date.fromisoformat(state["start_date"]),
-                date.fromisoformat(state["end_date"])
-            )
-            response = weather_agent.get_weather_data()
-            return {"weather_response": response}
-        except Exception as e:
-            print(f"Error in weather agent: {e}")
-            return {"weather_response": f"Error getting weather data: {str(e)}"}
-
-    def call_suggestion_agent(self, state: TravelPlanningState) -> Dict[str, Any]:
-        print("---(Phase 1) CALLING SUGGESTION AGENT---")
-        try:
-            suggestion_agent = SuggestionAgent(
-                state["destination"],
-                state["foodie"],
-                state["entertainment"],
-                state["business"]
-            )
-            response = suggestion_agent.get_activities_agently(state.get("weather_response", ""))
-            return {"suggestion_response": response}
-        except Exception as e:
-            print(f"Error in suggestion agent: {e}")
-            return {"suggestion_response": f"Error getting suggestions: {str(e)}"}
-
-    def call_budget_agent(self, state: TravelPlanningState) -> Dict[str, Any]:
-        print("---(Phase 1) CALLING BUDGET AGENT---")
-        try:
-            budget_agent = BudgetAgent(
-                state["budget"],
-                state["origin_city"],
-                state["destination"],
-                state["start_date"],
-                state["end_date"],
-                state["adults"]
-            )
-            response = budget_agent.get_budget(state.get("suggestion_response", ""))
-            return {"budget_response": response}
-        except Exception as e:
-            print(f"Error in budget agent: {e}")
-            return {"budget_response": f"Error getting budget analysis: {str(e)}"}
-
-    def call_synthesizer(self, state: TravelPlanningState) -> Dict[str, Any]:
-        print("---(Phase 1) SYNTHESIZING ITINERARY---")
-        try:
-            synthesis_prompt = f"""Create a comprehensive final itinerary using the following data:
+    @staticmethod
+    def _weather_args(state: TravelPlanningState) -> Dict[str, Any]:
+        return {
+            "city_to_visit": state["destination"],
+            "begin_date": date.fromisoformat(state["start_date"]),
+            "end_date": date.fromisoformat(state["end_date"])
+        }
+
+    @staticmethod
+    def _suggestion_args(state: TravelPlanningState) -> Dict[str, Any]:
+        return {
+            "city_to_visit": state["destination"],
+            "foodie": state["foodie"],
+            "business": state["business"],
+            "entertainment": state["entertainment"],
+            "weather_response": state.get("weather_response", ""),
+            "data": state.get("suggestion_data") or None
+        }
+
+    @staticmethod
+    def _budget_args(state: TravelPlanningState) -> Dict[str, Any]:
+        return {
+            "budget": state["budget"],
+            "origin_city": state["origin_city"],
+            "destination": state["destination"],
+            "start_date": state["start_date"],
+            "end_date": state["end_date"],
+            "adults": state["adults"],
+            "suggestion_response": state.get("suggestion_response", "")
+        }
+
+    def _synthesis_messages(self, state: TravelPlanningState) -> List[BaseMessage]:
+        synthesis_prompt = f"""Create a comprehensive final itinerary using the following data:
 
 TRIP DETAILS:
 - Route: {state['origin_city']} → {state['destination']}
@@ -168,43 +214,207 @@ TRIP DETAILS:
 
 Please create a detailed day-by-day itinerary with packing recommendations."""
 
-            self.system_prompt += f"""\n\n Weather Agent Response: {state.get('weather_response', 'Not available')} \n
+        agent_context = self._agent_context(state)
+        return [SystemMessage(content=self.system_prompt + agent_context), HumanMessage(content=synthesis_prompt)]
+
+    @staticmethod
+    def _agent_context(state: TravelPlanningState) -> str:
+        return f"""\n\n Weather Agent Response: {state.get('weather_response', 'Not available')} \n
         Suggestion Agent Response: {state.get('suggestion_response', 'Not available')} \n
         Budget Agent Response: {state.get('budget_response', 'Not available')} \n"""
 
-            response = self.llm.invoke([SystemMessage(content=self.system_prompt), HumanMessage(content=synthesis_prompt)])
+    @staticmethod
+    def _context_window(state: TravelPlanningState) -> Tuple[int, List[BaseMessage], List[BaseMessage]]:
+        """Split the history into messages to add to the summary and the window sent verbatim.
+
+        Returns:
+            The new summarized message count, the messages to summarize and the compacted window.
+        """
+        messages = state.get('messages', [])
+        summarized = state.get('summarized_messages', 0)
+        start = window_start(messages, summarized, SUPERVISOR_MAX_TURNS, SUPERVISOR_TOKEN_BUDGET,
+                             SUPERVISOR_TOOL_OUTPUT_CHARS, SUPERVISOR_SUMMARY_BATCH)
+        window = compact_tool_outputs(messages[start:], SUPERVISOR_TOOL_OUTPUT_CHARS)
+        return start, messages[summarized:start], window
+
+    @staticmethod
+    def _summary_messages(summary: str, messages: List[BaseMessage]) -> List[BaseMessage]:
+        request = f"""CURRENT SUMMARY:
+{summary or 'None yet.'}
+
+MESSAGES TO ADD:
+{transcript(messages, SUPERVISOR_TOOL_OUTPUT_CHARS)}"""
+        return [SystemMessage(content=CONVERSATION_SUMMARY_PROMPT), HumanMessage(content=request)]
+
+    def _supervisor_conversation(self, state: TravelPlanningState, summary: str,
+                                 window: List[BaseMessage]) -> List[BaseMessage]:
+        system_prompt = self.system_prompt + state.get('agent_context', '')
+        if summary:
+            system_prompt += f"\n\n Summary of the earlier conversation: \n{summary}\n"
+        return [SystemMessage(content=system_prompt)] + window
+
+    @staticmethod
+    def _record_supervisor_usage(response: BaseMessage, conversation: List[BaseMessage]) -> None:
+        usage = getattr(response, "usage_metadata", None)
+        input_tokens = usage["input_tokens"] if usage else estimate_tokens(conversation)
+        supervisor_input_tokens.observe(input_tokens)
+        supervisor_window_messages.observe(len(conversation) - 1)
+
+    def _itinerary_update(self, state: TravelPlanningState, content: str, message_id: str | None = None) -> Dict[str, Any]:
+        # Keeping the LLM response id lets streamed synthesizer tokens be matched to this message.
+        return {
+            "initial_plan_complete": True,
+            "agent_context": self._agent_context(state),
+            "final_itinerary": content,
+            "messages": [AIMessage(content=content, id=message_id)]
+        }
+
+    def _synthesis_error(self, state: TravelPlanningState, e: Exception) -> Dict[str, Any]:
+        print(f"Error in synthesizer: {e}")
+        return self._itinerary_update(state, f"Error creating itinerary: {str(e)}")
+
+    @staticmethod
+    def _stage_error(stage: str, e: Exception) -> Dict[str, Any]:
+        key, _, message = PHASE1_STAGES[stage]
+        print(f"Error in {stage} agent: {e}")
+        return {key: f"{message}: {str(e)}"}
+
+    def _run_stage(self, stage: str, state: TravelPlanningState, load: Callable[[], str]) -> Dict[str, Any]:
+        """Run a Phase 1 specialist agent through the plan cache and store its response in the state."""
+        key, label, _ = PHASE1_STAGES[stage]
+        print(f"---(Phase 1) CALLING {label}---")
+        try:
+            return {key: cached_stage_sync(stage, state, load)}
+        except Exception as e:
+            return self._stage_error(stage, e)
 
-            return {
-                "initial_plan_complete": True,
-                "final_itinerary": response.content,
-                "messages": [AIMessage(content=response.content)]
-            }
+    async def _arun_stage(self, stage: str, state: TravelPlanningState,
+                          load: Callable[[], Awaitable[str]]) -> Dict[str, Any]:
+        """Async version of _run_stage."""
+        key, label, _ = PHASE1_STAGES[stage]
+        print(f"---(Phase 1) CALLING {label}---")
+        try:
+            return {key: await cached_stage(stage, state, load)}
         except Exception as e:
-            print(f"Error in synthesizer: {e}")
-            error_message = f"Error creating itinerary: {str(e)}"
-            return {
-                "initial_plan_complete": True,
-                "final_itinerary": error_message,
-                "messages": [AIMessage(content=error_message)]
-            }
+            return self._stage_error(stage, e)
+
+    def _supervisor_context(self, state: TravelPlanningState) -> Tuple[int, List[BaseMessage], List[BaseMessage], str]:
+        """Window of the supervisor call, the messages to fold into the summary first, and the current summary."""
+        start, to_summarize, window = self._context_window(state)
+        if not SUPERVISOR_SUMMARY_ENABLED:
+            to_summarize = []
+        return start, to_summarize, window, state.get('conversation_summary', '')
+
+    @staticmethod
+    def _unsummarized_window(state: TravelPlanningState, e: Exception) -> Tuple[int, List[BaseMessage]]:
+        # Keep the messages in the window rather than losing them.
+        print(f"Error summarizing conversation: {e}")
+        start = state.get('summarized_messages', 0)
+        return start, compact_tool_outputs(state['messages'][start:], SUPERVISOR_TOOL_OUTPUT_CHARS)
+
+    def _supervisor_update(self, response: BaseMessage, conversation: List[BaseMessage], summary: str,
+                           start: int) -> Dict[str, Any]:
+        self._record_supervisor_usage(response, conversation)
+        return {"messages": [response], "conversation_summary": summary, "summarized_messages": start}
+
+    @staticmethod
+    def _supervisor_error(e: Exception) -> Dict[str, Any]:
+        print(f"Error in supervisor: {e}")
+        error_response = AIMessage(content=f"I encountered an error: {str(e)}. Please try again.")
+        return {"messages": [error_response]}
 
-    def call_supervisor(self, state: TravelPlanningState) -> Dict[str, Any]:
-        print("---(Phase 2) SUPERVISOR CHECKING---")
+    def call_weather_agent(self, state: TravelPlanningState) -> Dict[str, Any]:
+        return self._run_stage(
+            "weather", state, lambda: get_weather_agent().get_weather_data(**self._weather_args(state)))
+
+    async def acall_weather_agent(self, state: TravelPlanningState) -> Dict[str, Any]:
+        return await self._arun_stage(
+            "weather", state, lambda: get_weather_agent().aget_weather_data(**self._weather_args(state)))
+
+    def call_suggestion_data(self, state: TravelPlanningState) -> Dict[str, Any]:
+        return run_sync(self.acall_suggestion_data(state))
+
+    async def acall_suggestion_data(self, state: TravelPlanningState) -> Dict[str, Any]:
+        """Prefetch the places of the suggestion agent while the weather agent runs.
+
+        In ReAct mode the prefetch also fills the activities cache that the agent's tool call reads.
+        """
+        print("---(Phase 1) PREFETCHING SUGGESTION DATA---")
         try:
-            messages = state.get('messages', [])
-            if not messages:
-                return {"messages": [AIMessage(content="How can I help you with your travel plans?")]}
+            if await stage_cached("suggestion", state):
+                return {"suggestion_data": {}}
+            data = await get_suggestion_agent().aprefetch(
+                state["destination"], state["foodie"], state["business"], state["entertainment"])
+            return {"suggestion_data": data}
+        except Exception as e:
+            print(f"Error prefetching suggestion data: {e}")
+            return {"suggestion_data": {}}
+
+    def call_suggestion_agent(self, state: TravelPlanningState) -> Dict[str, Any]:
+        return self._run_stage(
+            "suggestion", state,
+            lambda: get_suggestion_agent().get_activities_agently(**self._suggestion_args(state)))
+
+    async def acall_suggestion_agent(self, state: TravelPlanningState) -> Dict[str, Any]:
+        return await self._arun_stage(
+            "suggestion", state,
+            lambda: get_suggestion_agent().aget_activities_agently(**self._suggestion_args(state)))
+
+    def call_budget_agent(self, state: TravelPlanningState) -> Dict[str, Any]:
+        return self._run_stage(
+            "budget", state, lambda: get_budget_agent().get_budget(**self._budget_args(state)))
+
+    async def acall_budget_agent(self, state: TravelPlanningState) -> Dict[str, Any]:
+        return await self._arun_stage(
+            "budget", state, lambda: get_budget_agent().aget_budget(**self._budget_args(state)))
 
-            conversation = [SystemMessage(content=self.system_prompt)] + messages
+    def call_synthesizer(self, state: TravelPlanningState) -> Dict[str, Any]:
+        print("---(Phase 1) SYNTHESIZING ITINERARY---")
+        try:
+            response = self.synthesis_llm.invoke(self._synthesis_messages(state))
+            return self._itinerary_update(state, message_text(response), response.id)
+        except Exception as e:
+            return self._synthesis_error(state, e)
 
-            response = self.llm_with_tools.invoke(conversation)
+    async def acall_synthesizer(self, state: TravelPlanningState) -> Dict[str, Any]:
+        print("---(Phase 1) SYNTHESIZING ITINERARY---")
+        try:
+            response = await self.synthesis_llm.ainvoke(self._synthesis_messages(state))
+            return self._itinerary_update(state, message_text(response), response.id)
+        except Exception as e:
+            return self._synthesis_error(state, e)
 
-            return {"messages": [response]}
+    def call_supervisor(self, state: TravelPlanningState) -> Dict[str, Any]:
+        print("---(Phase 2) SUPERVISOR CHECKING---")
+        if not state.get('messages'):
+            return {"messages": [AIMessage(content="How can I help you with your travel plans?")]}
+        try:
+            start, to_summarize, window, summary = self._supervisor_context(state)
+            if to_summarize:
+                try:
+                    summary = message_text(self.summary_llm.invoke(self._summary_messages(summary, to_summarize)))
+                except Exception as e:
+                    start, window = self._unsummarized_window(state, e)
+            conversation = self._supervisor_conversation(state, summary, window)
+            return self._supervisor_update(self.llm_with_tools.invoke(conversation), conversation, summary, start)
+        except Exception as e:
+            return self._supervisor_error(e)
 
+    async def acall_supervisor(self, state: TravelPlanningState) -> Dict[str, Any]:
+        print("---(Phase 2) SUPERVISOR CHECKING---")
+        if not state.get('messages'):
+            return {"messages": [AIMessage(content="How can I help you with your travel plans?")]}
+        try:
+            start, to_summarize, window, summary = self._supervisor_context(state)
+            if to_summarize:
+                try:
+                    summary = message_text(await self.summary_llm.ainvoke(self._summary_messages(summary, to_summarize)))
+                except Exception as e:
+                    start, window = self._unsummarized_window(state, e)
+            conversation = self._supervisor_conversation(state, summary, window)
+            return self._supervisor_update(await self.llm_with_tools.ainvoke(conversation), conversation, summary, start)
         except Exception as e:
-            print(f"Error in supervisor: {e}")
-            error_response = AIMessage(content=f"I encountered an error: {str(e)}. Please try again.")
-            return {"messages": [error_response]}
+            return self._supervisor_error(e)
 
 # The below function is just for running the agent in a console-like environment.
 #
@@ -1,54 +1,108 @@
 """Agent that will suggest activities to do in the city the user is visiting."""
 
-from langchain_core.runnables import RunnableConfig
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_core.messages import HumanMessage,SystemMessage
-from langchain_tavily import TavilySearch
+from functools import lru_cache
+from langchain_core.messages import BaseMessage, HumanMessage,SystemMessage
 from langgraph.prebuilt import create_react_agent
 
-from backend.intents.rest_agent_intents import get_activities_data_of_city_sync
+from backend.intents.rest_agent_intents import get_activities_data_of_city_sync, run_sync
+from backend.agents.direct_fetch import direct_messages, has_required, prefetch
+from backend.agents.governed import GovernedChatGoogleGenerativeAI
+from backend.agents.llm_cache import llm_cache_for
 from backend.agents.prompts import SUGGESTION_AGENT_SYSTEM_PROMPT
+from backend.agents.web_search import get_web_search
+from backend.api_clients.travel_search_api import get_activities_of_city
 from backend.api_key_load import GEMINI_API_KEY
+from backend.config import AGENT_FETCH_MODE
 
 class SuggestionAgent:
     """Create a suggestion agent."""
-    def __init__(self, city_to_visit: str, foodie: bool, business: bool, entertainment: bool ):
-        self.llm = ChatGoogleGenerativeAI(model="gemini-2.5-flash", api_key=GEMINI_API_KEY, temperature=0.5)
-        self.city_to_visit = city_to_visit
-        self.foodie = foodie
-        self.entertainment = entertainment
-        self.business = business
+    def __init__(self) -> None:
+        self.llm = GovernedChatGoogleGenerativeAI(model="gemini-2.5-flash", api_key=GEMINI_API_KEY, temperature=0.5,
+                                                  cache=llm_cache_for("suggestion", "gemini-2.5-flash", 0.5))
         self.system_prompt = SUGGESTION_AGENT_SYSTEM_PROMPT
-        self.tavily_search = TavilySearch()
+        self.tavily_search = get_web_search()
         self.tools = [get_activities_data_of_city_sync, self.tavily_search]
         self.suggestion_agent = create_react_agent(self.llm, self.tools)
+        self.direct_fetch = AGENT_FETCH_MODE == "direct"
 
-    def get_activities_agently(self, weather_response: str) -> RunnableConfig | None:
-        """Initialize the suggestion agent to get its response."""
-        self.system_prompt += f"\n\n---WEATHER DATA---\n{weather_response}\n---END WEATHER DATA---"
+    def build_messages(self, city_to_visit: str, foodie: bool, business: bool, entertainment: bool,
+                       weather_response: str) -> list[BaseMessage]:
+        """Build the system and human messages for the suggestion agent."""
+        system_prompt = self.system_prompt + f"\n\n---WEATHER DATA---\n{weather_response}\n---END WEATHER DATA---"
+        return [
+            SystemMessage(content=system_prompt),
+            HumanMessage(content=self.build_prompt(city_to_visit, foodie, business, entertainment))
+        ]
+
+    @staticmethod
+    def build_prompt(city_to_visit: str, foodie: bool, business: bool, entertainment: bool) -> str:
+        """Build the human prompt for the suggestion agent."""
         activities_prompt = ""
-        if self.foodie:
-            activities_prompt = (f"I am visiting {self.city_to_visit} and I am a foodie type of person. I love to"
-                                  f" visit different restaurants and cafes. Can you suggest some good restaurants to visit in {self.city_to_visit}?")
+        if foodie:
+            activities_prompt = (f"I am visiting {city_to_visit} and I am a foodie type of person. I love to"
+                                  f" visit different restaurants and cafes. Can you suggest some good restaurants to visit in {city_to_visit}?")
 
-        if self.business:
-            activities_prompt = (f"I am visiting {self.city_to_visit} for business purposes. "
-                                  f"Can you suggest some good places to visit in {self.city_to_visit} while I am free from work and conferences?")
+        if business:
+            activities_prompt = (f"I am visiting {city_to_visit} for business purposes. "
+                                  f"Can you suggest some good places to visit in {city_to_visit} while I am free from work and conferences?")
 
-        if self.entertainment:
-            activities_prompt = (f"I am visiting {self.city_to_visit} and my purpose is to have fun and enjoy. "
-                                  f"Can you suggest some good entertainment places to visit in {self.city_to_visit}?")
+        if entertainment:
+            activities_prompt = (f"I am visiting {city_to_visit} and my purpose is to have fun and enjoy. "
+                                  f"Can you suggest some good entertainment places to visit in {city_to_visit}?")
 
+        return activities_prompt
 
-        messages = [
-            SystemMessage(content=self.system_prompt),
-            HumanMessage(content=activities_prompt)
-        ]
+    def build_direct_messages(self, city_to_visit: str, foodie: bool, business: bool, entertainment: bool,
+                              weather_response: str, data: dict[str, str | None]) -> list[BaseMessage]:
+        """Build the messages of a direct-mode call with the prefetched places."""
+        messages = self.build_messages(city_to_visit, foodie, business, entertainment, weather_response)
+        return direct_messages(str(messages[0].content), str(messages[1].content), data)
+
+    @staticmethod
+    async def aprefetch(city_to_visit: str, foodie: bool, business: bool, entertainment: bool) -> dict[str, str | None]:
+        """Fetch the places the agent always asks for first."""
+        return await prefetch({
+            "get_activities_data_of_city_sync": get_activities_of_city(foodie, business, entertainment, city_to_visit)
+        })
+
+    def get_activities_agently(self, city_to_visit: str, foodie: bool, business: bool, entertainment: bool,
+                               weather_response: str, data: dict[str, str | None] | None = None) -> str:
+        """Initialize the suggestion agent to get its response.
 
+        In direct mode, data holds the places already prefetched while the weather agent ran;
+        without it they are fetched here.
+        """
+        if self.direct_fetch:
+            data = data or run_sync(self.aprefetch(city_to_visit, foodie, business, entertainment))
+            if has_required("suggestion", data, "get_activities_data_of_city_sync"):
+                return str(self.llm.invoke(self.build_direct_messages(
+                    city_to_visit, foodie, business, entertainment, weather_response, data)).content)
+
+        messages = self.build_messages(city_to_visit, foodie, business, entertainment, weather_response)
         response = ""
         for step in self.suggestion_agent.stream({"messages": messages}):
 
             if "messages" in step and step["messages"]:
-                response = step["messages"][-1].content
+                response = str(step["messages"][-1].content)
+
+        return response
+
+    async def aget_activities_agently(self, city_to_visit: str, foodie: bool, business: bool, entertainment: bool,
+                                      weather_response: str,
+                                      data: dict[str, str | None] | None = None) -> str:
+        """Async version of get_activities_agently that runs the tools natively on the event loop."""
+        if self.direct_fetch:
+            data = data or await self.aprefetch(city_to_visit, foodie, business, entertainment)
+            if has_required("suggestion", data, "get_activities_data_of_city_sync"):
+                return str((await self.llm.ainvoke(self.build_direct_messages(
+                    city_to_visit, foodie, business, entertainment, weather_response, data))).content)
+
+        messages = self.build_messages(city_to_visit, foodie, business, entertainment, weather_response)
+        result = await self.suggestion_agent.ainvoke({"messages": messages})
+        return str(result["messages"][-1].content) if result.get("messages") else ""
+
 
-        return response
\ No newline at end of file
+@lru_cache(maxsize=1)
+def get_suggestion_agent() -> SuggestionAgent:
+    """Get the process-wide suggestion agent, built on first use."""
+    return SuggestionAgent()
@@ -1,45 +1,85 @@
 """Agent that gets the weather data"""
 
 from datetime import date, datetime
-from langchain_core.runnables import RunnableConfig
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_core.messages import HumanMessage,SystemMessage
-from langchain_tavily import TavilySearch
+from functools import lru_cache
+from langchain_core.messages import BaseMessage, HumanMessage,SystemMessage
 from langgraph.prebuilt import create_react_agent
 
-from backend.intents.rest_agent_intents import get_weather_data_of_city
+from backend.intents.rest_agent_intents import get_weather_data_of_city, run_sync
+from backend.agents.direct_fetch import direct_messages, has_required, prefetch
+from backend.agents.governed import GovernedChatGoogleGenerativeAI
+from backend.agents.llm_cache import llm_cache_for
 from backend.agents.prompts import WEATHER_AGENT_SYSTEM_PROMPT
+from backend.agents.web_search import get_web_search
+from backend.api_clients.weather_data import get_weather
 from backend.api_key_load import GEMINI_API_KEY
+from backend.config import AGENT_FETCH_MODE
+
+# Days covered by the OpenWeatherMap forecast; later trips need the agent's web search.
+FORECAST_DAYS = 5
 
 class WeatherAgent:
     """Create a weather agent."""
-    def __init__(self, city_to_visit: str, begin_date: date, end_date: date):
-        self.llm = ChatGoogleGenerativeAI(model="gemini-1.5-flash", api_key=GEMINI_API_KEY, temperature=0.5)
-        self.city_to_visit = city_to_visit
-        self.begin_date = begin_date
-        self.end_date = end_date
+    def __init__(self) -> None:
+        self.llm = GovernedChatGoogleGenerativeAI(model="gemini-1.5-flash", api_key=GEMINI_API_KEY, temperature=0.5,
+                                                  cache=llm_cache_for("weather", "gemini-1.5-flash", 0.5))
         self.system_prompt = WEATHER_AGENT_SYSTEM_PROMPT
-        self.tavily_search = TavilySearch()
+        self.tavily_search = get_web_search()
         self.tools = [get_weather_data_of_city, self.tavily_search]
         self.weather_agent = create_react_agent(self.llm, self.tools)
+        self.direct_fetch = AGENT_FETCH_MODE == "direct"
 
-    def get_weather_data(self) -> RunnableConfig | None:
-        """Initialize the weather agent to get its response."""
+    @staticmethod
+    def build_prompt(city_to_visit: str, begin_date: date, end_date: date) -> str:
+        """Build the human prompt for the weather agent."""
         current_date = datetime.now().date()
-        weather_prompt = (f"Today is {current_date}. "
-            f"Get weather forecast for {self.city_to_visit} from {self.begin_date} to {self.end_date}. "
+        return (f"Today is {current_date}. "
+            f"Get weather forecast for {city_to_visit} from {begin_date} to {end_date}. "
             f"Analyze the conditions and provide travel and packing recommendations.")
 
-        messages = [
+    def build_messages(self, city_to_visit: str, begin_date: date, end_date: date) -> list[BaseMessage]:
+        """Build the system and human messages for the weather agent."""
+        return [
             SystemMessage(content=self.system_prompt),
-            HumanMessage(content=weather_prompt)
+            HumanMessage(content=self.build_prompt(city_to_visit, begin_date, end_date))
         ]
 
+    async def aprefetch(self, city_to_visit: str, begin_date: date) -> dict[str, str | None]:
+        """Fetch the forecast the agent always asks for first, unless the trip starts after it ends."""
+        if (begin_date - datetime.now().date()).days > FORECAST_DAYS:
+            return {"get_weather": None}
+        return await prefetch({"get_weather": get_weather(city_to_visit)})
+
+    def get_weather_data(self, city_to_visit: str, begin_date: date, end_date: date) -> str:
+        """Initialize the weather agent to get its response."""
+        if self.direct_fetch:
+            data = run_sync(self.aprefetch(city_to_visit, begin_date))
+            if has_required("weather", data, "get_weather"):
+                prompt = self.build_prompt(city_to_visit, begin_date, end_date)
+                return str(self.llm.invoke(direct_messages(self.system_prompt, prompt, data)).content)
+
         response = ""
 
-        for step in self.weather_agent.stream({"messages": messages}):
+        for step in self.weather_agent.stream({"messages": self.build_messages(city_to_visit, begin_date, end_date)}):
 
             if "messages" in step and step["messages"]:
-                response = step["messages"][-1].content
+                response = str(step["messages"][-1].content)
+
+        return response
+
+    async def aget_weather_data(self, city_to_visit: str, begin_date: date, end_date: date) -> str:
+        """Async version of get_weather_data that runs the tools natively on the event loop."""
+        if self.direct_fetch:
+            data = await self.aprefetch(city_to_visit, begin_date)
+            if has_required("weather", data, "get_weather"):
+                prompt = self.build_prompt(city_to_visit, begin_date, end_date)
+                return str((await self.llm.ainvoke(direct_messages(self.system_prompt, prompt, data))).content)
+
+        result = await self.weather_agent.ainvoke({"messages": self.build_messages(city_to_visit, begin_date, end_date)})
+        return str(result["messages"][-1].content) if result.get("messages") else ""
+
 
-        return response
\ No newline at end of file
+@lru_cache(maxsize=1)
+def get_weather_agent() -> WeatherAgent:
+    """Get the process-wide weather agent, built on first use."""
+    return WeatherAgent()
@@ -0,0 +1,127 @@
+"""Shared, cached web search tool of every agent, backed by Tavily or an offline stub.
+
+Agents search for near-identical queries across plans ("Best restaurants in Paris",
+"best restaurants Paris"), so results are cached per normalized query and search options,
+concurrent searches for the same query share one upstream call, and results are trimmed to
+what the LLM needs before they enter any prompt.
+"""
+
+import asyncio
+import hashlib
+import json
+import re
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+from backend.agents.governed import GovernedTavilySearch
+from backend.cache import AsyncTTLCache, SQLiteCacheStore
+from backend.config import (WEB_SEARCH_BACKEND, WEB_SEARCH_CACHE_DB, WEB_SEARCH_CACHE_SIZE, WEB_SEARCH_CACHE_TTL,
+                            WEB_SEARCH_CONTENT_CHARS, WEB_SEARCH_MAX_RESULTS, WEB_SEARCH_STUB_LATENCY)
+from backend.intents.rest_agent_intents import run_sync
+
+# Words that do not change what a search finds.
+STOPWORDS = frozenset({"a", "an", "and", "at", "for", "in", "is", "of", "on", "the", "to", "what", "with"})
+
+web_search_cache = AsyncTTLCache(
+    "web_search",
+    maxsize=WEB_SEARCH_CACHE_SIZE,
+    ttl=WEB_SEARCH_CACHE_TTL,
+    store=SQLiteCacheStore(WEB_SEARCH_CACHE_DB, "web_search") if WEB_SEARCH_CACHE_DB else None
+)
+
+
+def normalize_query(query: str) -> str:
+    """Lowercase words of a query without filler words, e.g. "Best restaurants in Paris!" -> "best restaurants paris".
+
+    Word order is kept, since it carries direction ("flights from New York to Paris").
+    """
+    words = re.findall(r"\w+", query.lower())
+    return " ".join(word for word in words if word not in STOPWORDS)
+
+
+def search_key(query: str, options: Dict[str, Any]) -> str:
+    """Cache key of a search: the normalized query plus the options that change its results."""
+    used = {name: value for name, value in options.items() if value not in (None, [], "")}
+    return f"{normalize_query(query)}|{json.dumps(used, sort_keys=True, default=str)}"
+
+
+def trim_results(raw: Dict[str, Any], max_results: int = WEB_SEARCH_MAX_RESULTS,
+                 content_chars: int = WEB_SEARCH_CONTENT_CHARS) -> Dict[str, Any]:
+    """Keep the answer and the title, URL and shortened content of the top results.
+
+    Raw content, images, scores and request metadata are dropped, since they only cost tokens.
+    """
+    results = []
+    for result in raw.get("results", [])[:max_results]:
+        content = (result.get("content") or "").strip()
+        if len(content) > content_chars:
+            content = content[:content_chars].rsplit(" ", 1)[0] + "..."
+        results.append({"title": result.get("title"), "url": result.get("url"), "content": content})
+
+    trimmed: Dict[str, Any] = {"query": raw.get("query"), "results": results}
+    if raw.get("answer"):
+        trimmed["answer"] = raw["answer"]
+    return trimmed
+
+
+async def stub_search(query: str, latency: float = WEB_SEARCH_STUB_LATENCY) -> Dict[str, Any]:
+    """Deterministic offline stand-in for a Tavily search, answered after a fixed latency."""
+    await asyncio.sleep(latency)
+    digest = hashlib.sha1(normalize_query(query).encode()).hexdigest()[:8]
+    return {
+        "query": query,
+        "results": [
+            {
+                "title": f"Result {index + 1} for {query}",
+                "url": f"https://search.example/{digest}/{index + 1}",
+                "content": f"Stub search result {index + 1} about {query}. " * 20,
+                "score": 1 - index / 10,
+                "raw_content": None,
+            }
+            for index in range(WEB_SEARCH_MAX_RESULTS + 2)
+        ],
+        "images": [],
+        "response_time": latency,
+    }
+
+
+class CachedTavilySearch(GovernedTavilySearch):
+    """Tavily search tool with a shared TTL cache, single-flight loading and trimmed results.
+
+    Keeps the name and arguments of TavilySearch, so the agents' prompts and tool calls are
+    unchanged. With backend="stub" searches are answered by stub_search, without network.
+    """
+    backend: str = "tavily"
+
+    async def _search(self, query: str, **kwargs: Any) -> Dict[str, Any]:
+        if self.backend == "stub":
+            return await stub_search(query)
+        return await super()._arun(query, **kwargs)
+
+    def _run(self, query: str, *args: Any, run_manager: Optional[Any] = None, **kwargs: Any) -> Dict[str, Any]:
+        return run_sync(self._arun(query, *args, **kwargs))
+
+    async def _arun(self, query: str, *args: Any, run_manager: Optional[Any] = None, **kwargs: Any) -> Dict[str, Any]:
+        names = ("include_domains", "exclude_domains", "search_depth", "include_images", "time_range", "topic",
+                 "start_date", "end_date")
+        options = dict(zip(names, args), **kwargs)
+        # Error answers are returned to the agent but not cached.
+        errors: Dict[str, Any] = {}
+
+        async def load() -> Optional[Dict[str, Any]]:
+            raw = await self._search(query, **options)
+            if "error" in raw:
+                errors["result"] = raw
+                return None
+            return trim_results(raw)
+
+        result = await web_search_cache.get_or_load(search_key(query, options), load)
+        return result if result is not None else errors.get("result", {"error": "Search failed."})
+
+
+@lru_cache(maxsize=1)
+def get_web_search() -> CachedTavilySearch:
+    """Get the process-wide web search tool, built on first use."""
+    if WEB_SEARCH_BACKEND == "stub":
+        return CachedTavilySearch(backend="stub", tavily_api_key="stub")
+    return CachedTavilySearch()
@@ -1,25 +1,34 @@
 """Get accommodation data from the API."""
 
-import httpx
-import json
-
+from backend.api_clients.http_client import get_client
+from backend.api_clients.projections import compact_json, summarize_places
 from backend.api_clients.travel_search_api import get_place_id_of_city
 from backend.api_key_load import GEOAPIFY_API_KEY
+from backend.places_index import places_index
+
+ACCOMMODATION_CATEGORIES = ("accommodation.motel", "accommodation", "accommodation.hotel", "accommodation.guest_house",
+                            "accommodation.hostel")
+ACCOMMODATION_LIMIT = 5
 
 
 async def get_accommodation_data(city_full_info: str) -> str:
-    """Get accommodation data from the API.
+    """Get accommodation data from the local places index, or from the API for cities not in it.
 
     Args:
         city_full_info (str): The city_to_visit name with state and country.
 
     Returns:
-        json_data (str): JSON string with accommodation data but won't give prices of the accommodation.
+        json_data (str): Compact JSON string with accommodation data but won't give prices of the accommodation.
         """
     place_id = await get_place_id_of_city(city_full_info)
-    get_accommodation_url = f"https://api.geoapify.com/v2/places?categories=accommodation.motel,accommodation,accommodation.hotel,accommodation.guest_house,accommodation.hostel&filter=place:{place_id}&limit=5&apiKey={GEOAPIFY_API_KEY}"
-    async with httpx.AsyncClient() as client:
-        response = await client.get(get_accommodation_url)
-        response.raise_for_status()
-        travel_data = response.json()
-        return json.dumps(travel_data, indent=2)
\ No newline at end of file
+    if places_index is not None and place_id is not None:
+        places = await places_index.alookup(place_id, [ACCOMMODATION_CATEGORIES], ACCOMMODATION_LIMIT)
+        if places is not None:
+            return compact_json(places)
+
+    get_accommodation_url = f"https://api.geoapify.com/v2/places?categories={','.join(ACCOMMODATION_CATEGORIES)}&filter=place:{place_id}&limit={ACCOMMODATION_LIMIT}&apiKey={GEOAPIFY_API_KEY}"
+    client = get_client(get_accommodation_url)
+    response = await client.get(get_accommodation_url)
+    response.raise_for_status()
+    travel_data = response.json()
+    return compact_json(summarize_places(travel_data))
\ No newline at end of file
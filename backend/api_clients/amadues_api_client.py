@@ -1,17 +1,48 @@
 """Amadeus API client"""
 
+import asyncio
+import concurrent.futures
+import threading
+import time
+from typing import Any
+
 import httpx
+
+from backend.api_clients.http_client import get_client
 from backend.api_key_load import AMADEUS_API_KEY, AMADEUS_API_SECRET
+from backend.config import AMADEUS_TOKEN_REFRESH_MARGIN
+from backend.metrics import gauge
+
+# Lifetime of an Amadeus access token in seconds, assumed when the token response omits it.
+DEFAULT_TOKEN_LIFETIME = 1799
 
 class AmadeusApi:
-    """Amadeus API client"""
-    def __init__(self):
+    """Amadeus API client
+
+    Tracks the OAuth2 token expiry, refreshes it shortly before it expires and lets only
+    one caller in the process request a new token at a time, whichever thread's event loop
+    it runs on; the others wait for that refresh.
+    """
+    def __init__(self) -> None:
         self.api_key = AMADEUS_API_KEY
         self.api_secret = AMADEUS_API_SECRET
-        self.token = None
+        self.token: str | None = None
+        self.token_expires_at = 0.0
         self.base_url = "https://test.api.amadeus.com"
+        self.token_refreshes = 0
+        self.unauthorized_retries = 0
+        self._lock = threading.Lock()
+        # Thread-safe future of the token request in flight, so callers on any loop can wait for it.
+        self._refresh: concurrent.futures.Future[str] | None = None
 
-    async def get_access_token(self):
+    def _fresh_token(self, rejected_token: str | None = None) -> str | None:
+        """The current token unless it is about to expire or is the rejected one."""
+        token = self.token
+        if token is None or token == rejected_token or time.time() >= self.token_expires_at - AMADEUS_TOKEN_REFRESH_MARGIN:
+            return None
+        return token
+
+    async def get_access_token(self) -> str:
         """Get OAuth2 access token"""
         token_url = f"{self.base_url}/v1/security/oauth2/token"
 
@@ -20,12 +51,84 @@ class AmadeusApi:
             "client_id": self.api_key,
             "client_secret": self.api_secret
         }
-        async with httpx.AsyncClient() as client:
-            response = await client.post(token_url, data=data)
-            if response.status_code == 200:
-                self.token = response.json()["access_token"]
-                return self.token
+        client = get_client(token_url)
+        response = await client.post(token_url, data=data)
+        if response.status_code == 200:
+            token_data = response.json()
+            token: str = token_data["access_token"]
+            self.token = token
+            expires_in = token_data.get("expires_in")
+            if expires_in is None:
+                print(f"Amadeus token response has no expires_in, assuming {DEFAULT_TOKEN_LIFETIME} seconds")
+                expires_in = DEFAULT_TOKEN_LIFETIME
+            self.token_expires_at = time.time() + expires_in
+            self.token_refreshes += 1
+            return token
+        else:
+            raise Exception(f"Failed to get token: {response.text}")
+
+    async def get_token(self, rejected_token: str | None = None) -> str:
+        """Get a valid access token, refreshing it when it is about to expire or was rejected.
+
+        Args:
+            rejected_token: Token that just got a 401; it is only replaced if nobody has already done so.
+
+        Returns:
+            The current access token.
+        """
+        if token := self._fresh_token(rejected_token):
+            return token
+
+        with self._lock:
+            # Another caller may have refreshed the token in the meantime.
+            if token := self._fresh_token(rejected_token):
+                return token
+            refresh = self._refresh
+            if refresh is None:
+                refresh = self._refresh = concurrent.futures.Future()
+                leader = True
             else:
-                raise Exception(f"Failed to get token: {response.text}")
+                leader = False
+
+        if not leader:
+            return await asyncio.shield(asyncio.wrap_future(refresh))
+        try:
+            token = await self.get_access_token()
+            refresh.set_result(token)
+            return token
+        except asyncio.CancelledError:
+            refresh.cancel()
+            raise
+        except Exception as e:
+            refresh.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._refresh = None
+
+    async def get(self, url: str, params: dict[str, Any]) -> httpx.Response:
+        """Send an authorized GET request, retrying once with a new token on 401."""
+        client = get_client(url)
+        token = await self.get_token()
+        response = await client.get(url, headers={"Authorization": f"Bearer {token}"}, params=params)
+
+        if response.status_code == 401:
+            self.unauthorized_retries += 1
+            token = await self.get_token(rejected_token=token)
+            response = await client.get(url, headers={"Authorization": f"Bearer {token}"}, params=params)
+
+        return response
+
+    def stats(self) -> dict[str, int]:
+        """Token refresh and 401 retry counters."""
+        return {
+            "token_refreshes": self.token_refreshes,
+            "unauthorized_retries": self.unauthorized_retries,
+        }
+
+amadeus = AmadeusApi()
 
-amadeus = AmadeusApi()
\ No newline at end of file
+gauge("amadeus_token_refreshes", "Amadeus access tokens fetched, on expiry or after a 401.",
+      lambda: [({}, amadeus.token_refreshes)])
+gauge("amadeus_unauthorized_retries", "Amadeus requests retried with a new token after a 401.",
+      lambda: [({}, amadeus.unauthorized_retries)])
@@ -1,26 +1,34 @@
 """Get car rental data"""
 
-import httpx
-import json
-
+from backend.api_clients.http_client import get_client
+from backend.api_clients.projections import compact_json, summarize_places
 from backend.api_clients.travel_search_api import get_place_id_of_city
 from backend.api_key_load import GEOAPIFY_API_KEY
+from backend.places_index import places_index
+
+CAR_RENTAL_CATEGORIES = ("rental.car",)
+CAR_RENTAL_LIMIT = 5
 
 
 async def get_car_rental_data(city_to_visit: str) -> str:
-    """Get car rental data from the API.
+    """Get car rental data from the local places index, or from the API for cities not in it.
 
     Args:
         city_to_visit (str): The city_to_visit name with state and country.
 
     Returns:
-        json_data (str): JSON string with car rental data but won't give prices of the car rental.
+        json_data (str): Compact JSON string with car rental data but won't give prices of the car rental.
         """
 
     place_id = await get_place_id_of_city(city_to_visit)
-    get_car_rental_url = f"https://api.geoapify.com/v2/places?categories=rental.car&filter=place:{place_id}&limit=5&apiKey={GEOAPIFY_API_KEY}"
-    async with httpx.AsyncClient() as client:
-        response = await client.get(get_car_rental_url)
-        response.raise_for_status()
-        travel_data = response.json()
-        return json.dumps(travel_data, indent=2)
\ No newline at end of file
+    if places_index is not None and place_id is not None:
+        places = await places_index.alookup(place_id, [CAR_RENTAL_CATEGORIES], CAR_RENTAL_LIMIT)
+        if places is not None:
+            return compact_json(places)
+
+    get_car_rental_url = f"https://api.geoapify.com/v2/places?categories={','.join(CAR_RENTAL_CATEGORIES)}&filter=place:{place_id}&limit={CAR_RENTAL_LIMIT}&apiKey={GEOAPIFY_API_KEY}"
+    client = get_client(get_car_rental_url)
+    response = await client.get(get_car_rental_url)
+    response.raise_for_status()
+    travel_data = response.json()
+    return compact_json(summarize_places(travel_data))
\ No newline at end of file
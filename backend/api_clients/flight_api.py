@@ -1,10 +1,8 @@
 """Get flight ticket information from API """
 
 from datetime import date, datetime
-import httpx
-import json
-
 from backend.api_clients.amadues_api_client import amadeus
+from backend.api_clients.projections import compact_json, summarize_flight_offers
 
 async def search_flights(origin: str, destination: str, departure_date: date, return_date: date, adults: int = 1) -> str:
     """Search for flights with authentication
@@ -19,15 +17,8 @@ async def search_flights(origin: str, destination: str, departure_date: date, re
     Returns:
         Weather data in JSON string format
     """
-    if not amadeus.token:
-        await amadeus.get_access_token()
-
     url = f"{amadeus.base_url}/v2/shopping/flight-offers"
 
-    headers = {
-        "Authorization": f"Bearer {amadeus.token}"
-        }
-
     params = {
         "originLocationCode": origin,
         "destinationLocationCode": destination,
@@ -38,16 +29,9 @@ async def search_flights(origin: str, destination: str, departure_date: date, re
         "max": 5
     }
 
-    async with httpx.AsyncClient() as client:
-        response = await client.get(url, headers=headers, params=params)
-
-        if response.status_code == 401:
-            await amadeus.get_access_token()
-            headers["Authorization"] = f"Bearer {amadeus.token}"
-            response = await client.get(url, headers=headers, params=params)
-
-        response.raise_for_status()
-        return response.json()
+    response = await amadeus.get(url, params=params)
+    response.raise_for_status()
+    return response.json()
 
 async def get_flight_data_async(origin: str, destination: str, departure_date: str, return_date: str, adults: int = 1) -> str:
     """
@@ -61,13 +45,13 @@ async def get_flight_data_async(origin: str, destination: str, departure_date: s
         adults: Number of adults (default: 1)
 
     Returns:
-        Weather data in JSON string format, or raise an exception if an error occurs.
+        Compact JSON string with price, carriers, duration and stops of each offer, or an error message.
     """
     departure_date = datetime.strptime(departure_date, "%Y-%m-%d").date()
     return_date = datetime.strptime(return_date, "%Y-%m-%d").date()
 
     try:
         data = await search_flights(origin, destination, departure_date, return_date, adults)
-        return json.dumps(data, indent=2)
+        return compact_json(summarize_flight_offers(data))
     except Exception as e:
         return f"Error: {str(e)}"
\ No newline at end of file
@@ -0,0 +1,313 @@
+"""Per-upstream rate limits, in-flight caps and 429/503 backoff for every outgoing call."""
+
+import asyncio
+import concurrent.futures
+import random
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from email.utils import parsedate_to_datetime
+from typing import Any, AsyncIterator, Deque, Dict, Iterator, Optional
+
+import httpx
+
+from backend.config import (
+    AMADEUS_MAX_IN_FLIGHT,
+    AMADEUS_RATE_LIMIT,
+    GEMINI_MAX_IN_FLIGHT,
+    GEMINI_RATE_LIMIT,
+    GEOAPIFY_MAX_IN_FLIGHT,
+    GEOAPIFY_RATE_LIMIT,
+    OPENWEATHER_MAX_IN_FLIGHT,
+    OPENWEATHER_RATE_LIMIT,
+    TAVILY_MAX_IN_FLIGHT,
+    TAVILY_RATE_LIMIT,
+    UPSTREAM_BACKOFF_BASE,
+    UPSTREAM_BACKOFF_MAX,
+    UPSTREAM_MAX_RETRIES,
+)
+from backend.metrics import LATENCY_BUCKETS, gauge, histogram
+from backend.tracing import record_span
+
+# Status codes that mean "slow down" rather than "this request is wrong".
+RETRY_STATUS_CODES = (429, 503)
+
+upstream_wait_seconds = histogram("upstream_wait_seconds", "Seconds requests waited for an upstream slot.",
+                                  (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30))
+http_request_seconds = histogram("http_request_duration_seconds", "Duration of upstream HTTP requests.",
+                                 LATENCY_BUCKETS)
+
+
+class InFlightLimiter:
+    """Cap on concurrent calls shared by every thread and event loop, granting slots in arrival order.
+
+    Waiters hold thread-safe futures, so a slot released by a synchronous caller or on one
+    event loop is handed straight to the next waiter, wherever it runs.
+    """
+    def __init__(self, limit: int):
+        self.limit = limit
+        self._active = 0
+        self._waiters: Deque[concurrent.futures.Future] = deque()
+        self._lock = threading.Lock()
+
+    def _enter(self) -> Optional[concurrent.futures.Future]:
+        """Take a free slot and return None, or return the future that is resolved once one is handed over."""
+        with self._lock:
+            if self._active < self.limit and not self._waiters:
+                self._active += 1
+                return None
+            waiter: concurrent.futures.Future = concurrent.futures.Future()
+            self._waiters.append(waiter)
+            return waiter
+
+    def _abandon(self, waiter: concurrent.futures.Future) -> None:
+        with self._lock:
+            if not waiter.done():
+                self._waiters.remove(waiter)
+                return
+        # The slot was handed over just as the waiter gave up, so pass it on.
+        self.release()
+
+    async def acquire(self) -> None:
+        """Wait for a slot without blocking the event loop."""
+        waiter = self._enter()
+        if waiter is None:
+            return
+        try:
+            await asyncio.shield(asyncio.wrap_future(waiter))
+        except BaseException:
+            self._abandon(waiter)
+            raise
+
+    def acquire_sync(self) -> None:
+        """Block the calling thread until a slot is free."""
+        waiter = self._enter()
+        if waiter is not None:
+            waiter.result()
+
+    def release(self) -> None:
+        """Give the slot to the longest waiting caller, or free it."""
+        with self._lock:
+            if self._waiters:
+                self._waiters.popleft().set_result(None)
+            else:
+                self._active -= 1
+
+
+class UpstreamGovernor:
+    """Token bucket plus in-flight cap for one upstream API.
+
+    Both are shared by every thread and event loop of the process, so the synchronous calls
+    of run_sync threads and the server's coroutines count against the same limits.
+    """
+    def __init__(self, name: str, rate: float, max_in_flight: int):
+        self.name = name
+        self.rate = rate
+        self.burst = max(1.0, rate)
+        self.max_in_flight = max_in_flight
+        self.requests = 0
+        self.throttled = 0
+        self.queued = 0
+        self.max_queued = 0
+        self.in_flight = 0
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+        self._limiter = InFlightLimiter(max_in_flight)
+
+    def _reserve(self) -> float:
+        """Take a token and return how long to wait before using it.
+
+        Tokens may go negative: each caller reserves the next free slot, so waiters are
+        served in arrival order without polling.
+        """
+        with self._lock:
+            now = time.monotonic()
+            wait = max(0.0, self._paused_until - now)
+            if self.rate > 0:
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                self._tokens -= 1
+                if self._tokens < 0:
+                    wait = max(wait, -self._tokens / self.rate)
+            return wait
+
+    def _enqueue(self) -> None:
+        with self._lock:
+            self.queued += 1
+            self.max_queued = max(self.max_queued, self.queued)
+
+    def _start(self, queued_at: float) -> None:
+        with self._lock:
+            self.queued -= 1
+            self.in_flight += 1
+            self.requests += 1
+        upstream_wait_seconds.observe(time.monotonic() - queued_at, upstream=self.name)
+
+    def _finish(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Wait for an in-flight slot and a rate limit token, then hold the slot for one call."""
+        queued_at = time.monotonic()
+        self._enqueue()
+        try:
+            await self._limiter.acquire()
+            try:
+                await asyncio.sleep(self._reserve())
+            except BaseException:
+                self._limiter.release()
+                raise
+        except BaseException:
+            with self._lock:
+                self.queued -= 1
+            raise
+        self._start(queued_at)
+        try:
+            yield
+        finally:
+            self._finish()
+            self._limiter.release()
+
+    @contextmanager
+    def sync_slot(self) -> Iterator[None]:
+        """Blocking variant of slot for synchronous callers."""
+        queued_at = time.monotonic()
+        self._enqueue()
+        self._limiter.acquire_sync()
+        try:
+            time.sleep(self._reserve())
+            self._start(queued_at)
+        except BaseException:
+            self._limiter.release()
+            with self._lock:
+                self.queued -= 1
+            raise
+        try:
+            yield
+        finally:
+            self._finish()
+            self._limiter.release()
+
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Record a 429/503 and pause the whole upstream.
+
+        Args:
+            attempt (int): Zero-based number of the failed attempt.
+            retry_after: Seconds the upstream asked to wait, if it sent Retry-After.
+
+        Returns:
+            Seconds the caller should wait before retrying.
+        """
+        if retry_after is not None:
+            delay = min(retry_after, UPSTREAM_BACKOFF_MAX) + random.uniform(0, UPSTREAM_BACKOFF_BASE)
+        else:
+            # Exponential backoff with jitter so retries of a burst do not line up again.
+            ceiling = min(UPSTREAM_BACKOFF_MAX, UPSTREAM_BACKOFF_BASE * 2 ** attempt)
+            delay = ceiling / 2 + random.uniform(0, ceiling / 2)
+        with self._lock:
+            self.throttled += 1
+            self._paused_until = max(self._paused_until, time.monotonic() + delay)
+        print(f"{self.name} throttled (attempt {attempt + 1}), retrying in {delay:.2f}s")
+        return delay
+
+    def stats(self) -> Dict[str, Any]:
+        """Request, throttle and queue counters plus the mean wait for a slot."""
+        return {
+            "requests": self.requests,
+            "throttled": self.throttled,
+            "queued": self.queued,
+            "max_queued": self.max_queued,
+            "in_flight": self.in_flight,
+            "mean_wait_seconds": upstream_wait_seconds.stats(upstream=self.name)["mean"],
+        }
+
+
+upstream_governors: Dict[str, UpstreamGovernor] = {
+    "geoapify": UpstreamGovernor("geoapify", GEOAPIFY_RATE_LIMIT, GEOAPIFY_MAX_IN_FLIGHT),
+    "openweather": UpstreamGovernor("openweather", OPENWEATHER_RATE_LIMIT, OPENWEATHER_MAX_IN_FLIGHT),
+    "amadeus": UpstreamGovernor("amadeus", AMADEUS_RATE_LIMIT, AMADEUS_MAX_IN_FLIGHT),
+    "tavily": UpstreamGovernor("tavily", TAVILY_RATE_LIMIT, TAVILY_MAX_IN_FLIGHT),
+    "gemini": UpstreamGovernor("gemini", GEMINI_RATE_LIMIT, GEMINI_MAX_IN_FLIGHT),
+}
+
+# Hosts of the upstreams called through the pooled httpx clients.
+UPSTREAM_HOSTS = {
+    "api.geoapify.com": "geoapify",
+    "api.openweathermap.org": "openweather",
+    "test.api.amadeus.com": "amadeus",
+    "api.amadeus.com": "amadeus",
+}
+
+
+def retry_after_seconds(headers: httpx.Headers) -> Optional[float]:
+    """Parse a Retry-After header given either in seconds or as an HTTP date."""
+    value = headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class GovernedTransport(httpx.AsyncBaseTransport):
+    """httpx transport that sends requests to known upstreams through their governor.
+
+    Requests wait for a slot instead of failing, and 429/503 answers are retried with
+    backoff, so the API clients never see a throttling error unless retries run out.
+    """
+    def __init__(self, transport: httpx.AsyncBaseTransport):
+        self._transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        name = UPSTREAM_HOSTS.get(request.url.host)
+        if name is None:
+            return await self._send(request, request.url.host)
+
+        governor = upstream_governors[name]
+        attempt = 0
+        while True:
+            async with governor.slot():
+                response = await self._send(request, name)
+            if response.status_code not in RETRY_STATUS_CODES or attempt >= UPSTREAM_MAX_RETRIES:
+                return response
+            delay = governor.backoff(attempt, retry_after_seconds(response.headers))
+            await response.aclose()
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def _send(self, request: httpx.Request, upstream: str) -> httpx.Response:
+        start = time.perf_counter()
+        status = "error"
+        try:
+            response = await self._transport.handle_async_request(request)
+            status = str(response.status_code)
+            return response
+        finally:
+            duration = time.perf_counter() - start
+            http_request_seconds.observe(duration, upstream=upstream, status=status)
+            record_span("http", f"{request.method} {request.url.host}{request.url.path}", start, duration,
+                        upstream=upstream, status=status)
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+def governor_stats() -> Dict[str, Dict[str, Any]]:
+    """Statistics of every upstream governor, keyed by upstream name."""
+    return {name: governor.stats() for name, governor in upstream_governors.items()}
+
+
+gauge("upstream_queue_depth", "Requests waiting for an upstream slot.",
+      lambda: [({"upstream": name}, governor.queued) for name, governor in upstream_governors.items()])
+gauge("upstream_in_flight", "Requests running against an upstream.",
+      lambda: [({"upstream": name}, governor.in_flight) for name, governor in upstream_governors.items()])
@@ -1,15 +1,25 @@
 """Get hotel information from Amadeus API"""
 
+import asyncio
 from datetime import date, datetime
 from typing import Any
-import httpx
-import json
 
 from backend.api_clients.amadues_api_client import amadeus
+from backend.api_clients.projections import compact_json
+from backend.cache import AsyncTTLCache, SQLiteCacheStore
+from backend.config import (HOTEL_IDS_CACHE_DB, HOTEL_IDS_CACHE_SIZE, HOTEL_IDS_CACHE_TTL, HOTEL_OFFERS_CHUNK_SIZE,
+                            HOTEL_RESULTS_LIMIT, HOTEL_SEARCH_LIMIT)
+
+hotel_ids_cache = AsyncTTLCache(
+    "amadeus_hotel_ids",
+    maxsize=HOTEL_IDS_CACHE_SIZE,
+    ttl=HOTEL_IDS_CACHE_TTL,
+    store=SQLiteCacheStore(HOTEL_IDS_CACHE_DB, "amadeus_hotel_ids") if HOTEL_IDS_CACHE_DB else None
+)
 
 
 async def search_hotels_by_city(city_code: str) -> list[str]:
-    """ Get a list of hotels in the visiting city
+    """ Get a list of hotels in the visiting city, cached per city code
 
     Args:
         city_code: IATA city code (e.g., "NYC", "BOS", "LAX")
@@ -17,14 +27,15 @@ async def search_hotels_by_city(city_code: str) -> list[str]:
     Returns:
         List of hotel IDs
     """
-    if not amadeus.token:
-        await amadeus.get_access_token()
+    city_code = city_code.strip().upper()
+    # Empty lists are not cached, so a city without results is looked up again next time.
+    hotel_ids = await hotel_ids_cache.get_or_load(city_code, lambda: _fetch_hotel_ids(city_code))
+    return hotel_ids or []
 
-    url = f"{amadeus.base_url}/v1/reference-data/locations/hotels/by-city"
 
-    headers = {
-            "Authorization": f"Bearer {amadeus.token}"
-        }
+async def _fetch_hotel_ids(city_code: str) -> list[str] | None:
+    """Get the hotel ids of a city from the Amadeus hotel list API."""
+    url = f"{amadeus.base_url}/v1/reference-data/locations/hotels/by-city"
 
     params = {
         "cityCode": city_code,
@@ -33,19 +44,12 @@ async def search_hotels_by_city(city_code: str) -> list[str]:
         "hotelSource": "ALL"
     }
 
-    async with httpx.AsyncClient() as client:
-        response = await client.get(url, headers=headers, params=params)
-
-        if response.status_code == 401:
-            await amadeus.get_access_token()
-            headers["Authorization"] = f"Bearer {amadeus.token}"
-            response = await client.get(url, headers=headers, params=params)
-
-        response.raise_for_status()
-        data = response.json()
+    response = await amadeus.get(url, params=params)
+    response.raise_for_status()
+    data = response.json()
 
-        hotel_ids = [hotel["hotelId"] for hotel in data.get("data", [])]
-        return hotel_ids[:10]
+    hotel_ids = [hotel["hotelId"] for hotel in data.get("data", [])]
+    return hotel_ids[:HOTEL_SEARCH_LIMIT] or None
 
 async def get_hotel_offers(hotel_ids: list, check_in: date, check_out: date, adults: int = 1) -> dict[str, Any]:
     """Get hotel prices
@@ -59,15 +63,8 @@ async def get_hotel_offers(hotel_ids: list, check_in: date, check_out: date, adu
     Returns:
         Hotel prices
     """
-    if not amadeus.token:
-        await amadeus.get_access_token()
-
     url = f"{amadeus.base_url}/v3/shopping/hotel-offers"
 
-    headers = {
-        "Authorization": f"Bearer {amadeus.token}"
-    }
-
     params = {
         "hotelIds": ",".join(hotel_ids),
         "checkInDate": check_in.strftime("%Y-%m-%d"),
@@ -78,16 +75,108 @@ async def get_hotel_offers(hotel_ids: list, check_in: date, check_out: date, adu
         "bestRateOnly": True
     }
 
-    async with httpx.AsyncClient() as client:
-        response = await client.get(url, headers=headers, params=params)
+    response = await amadeus.get(url, params=params)
+    response.raise_for_status()
+    return response.json()
+
+
+async def get_hotel_offers_chunked(hotel_ids: list, check_in: date, check_out: date, adults: int = 1) -> dict[str, Any]:
+    """Get hotel prices for any number of hotels with concurrent requests of HOTEL_OFFERS_CHUNK_SIZE ids
 
-        if response.status_code == 401:
-            await amadeus.get_access_token()
-            headers["Authorization"] = f"Bearer {amadeus.token}"
-            response = await client.get(url, headers=headers, params=params)
+    Amadeus limits the hotel ids per request and answers with an error when none of the
+    hotels of a request has availability, so a failed chunk only drops its own hotels.
+
+    Args:
+        hotel_ids: List of hotel IDs
+        check_in: Check-in date
+        check_out: Check-out date
+        adults: Number of adults
+
+    Returns:
+        Hotel prices of every chunk merged into one response
+
+    Raises:
+        Exception: The error of the first chunk if every chunk failed.
+    """
+    chunks = [hotel_ids[start:start + HOTEL_OFFERS_CHUNK_SIZE]
+              for start in range(0, len(hotel_ids), HOTEL_OFFERS_CHUNK_SIZE)]
+    responses = await asyncio.gather(
+        *(get_hotel_offers(chunk, check_in, check_out, adults) for chunk in chunks),
+        return_exceptions=True
+    )
+
+    offers = [response for response in responses if not isinstance(response, BaseException)]
+    errors = [response for response in responses if isinstance(response, BaseException)]
+    if not offers:
+        raise errors[0]
+    for error in errors:
+        print(f"Error getting hotel offers chunk: {error}")
+    return {"data": [offer for response in offers for offer in response.get("data", [])]}
+
+
+def _offer_price(offer: dict[str, Any]) -> float:
+    """Total price of a formatted offer, infinity if it has none."""
+    try:
+        return float(offer["price"])
+    except (TypeError, ValueError):
+        return float("inf")
 
-        response.raise_for_status()
-        return response.json()
+
+def _lowest_price(hotel: dict[str, Any]) -> float:
+    """Lowest offer price of a formatted hotel."""
+    return min((_offer_price(offer) for offer in hotel["offers"]), default=float("inf"))
+
+
+def rank_hotels_by_price(hotels: list[dict[str, Any]], limit: int = HOTEL_RESULTS_LIMIT) -> list[dict[str, Any]]:
+    """De-duplicate formatted hotels and keep the limit cheapest ones, cheapest first
+
+    Args:
+        hotels: Output of format_hotel_offers
+        limit: Number of hotels to keep
+
+    Returns:
+        The cheapest hotels, each with its offers sorted by price
+    """
+    unique: dict[str, dict[str, Any]] = {}
+    for hotel in hotels:
+        unique.setdefault(hotel["hotelId"], hotel)
+    for hotel in unique.values():
+        hotel["offers"].sort(key=_offer_price)
+    return sorted(unique.values(), key=_lowest_price)[:limit]
+
+
+def format_hotel_offers(offers: dict[str, Any]) -> list[dict[str, Any]]:
+    """Reduce Amadeus hotel offers to name, address, room type and price per offer
+
+    Args:
+        offers: Raw response of the hotel offers endpoint
+
+    Returns:
+        One entry per hotel with its offers
+    """
+    formatted_offers = []
+    for offer in offers.get("data", []):
+        hotel_info = {
+            "hotelId": offer.get("hotel", {}).get("hotelId"),
+            "hotelName": offer.get("hotel", {}).get("name"),
+            "address": offer.get("hotel", {}).get("address", {}),
+            "offers": []
+        }
+
+        for hotel_offer in offer.get("offers", []):
+            offer_info = {
+                "roomType": hotel_offer.get("room", {}).get("typeEstimated", {}).get("category"),
+                "bedType": hotel_offer.get("room", {}).get("typeEstimated", {}).get("bedType"),
+                "price": hotel_offer.get("price", {}).get("total"),
+                "currency": hotel_offer.get("price", {}).get("currency"),
+                "checkInDate": hotel_offer.get("checkInDate"),
+                "checkOutDate": hotel_offer.get("checkOutDate")
+            }
+            hotel_info["offers"].append(offer_info)
+
+        formatted_offers.append(hotel_info)
+
+    return formatted_offers
 
 
 async def get_hotel_data_async(city_code: str, check_in: str, check_out: str, adults: int = 1) -> str:
@@ -101,7 +190,7 @@ async def get_hotel_data_async(city_code: str, check_in: str, check_out: str, ad
         adults: Number of adults (default: 1)
 
     Returns:
-        JSON string with hotel options and prices
+        JSON string with the cheapest hotel options and prices, cheapest first
     """
     check_in_date = datetime.strptime(check_in, "%Y-%m-%d").date()
     check_out_date = datetime.strptime(check_out, "%Y-%m-%d").date()
@@ -110,34 +199,13 @@ async def get_hotel_data_async(city_code: str, check_in: str, check_out: str, ad
         hotel_ids = await search_hotels_by_city(city_code)
 
         if not hotel_ids:
-            return json.dumps({"error": "No hotels found in this city"})
+            return compact_json({"error": "No hotels found in this city"})
 
-        offers = await get_hotel_offers(hotel_ids, check_in_date, check_out_date, adults)
+        offers = await get_hotel_offers_chunked(hotel_ids, check_in_date, check_out_date, adults)
 
-        formatted_offers = []
-        for offer in offers.get("data"):
-            hotel_info = {
-                "hotelId": offer.get("hotel", {}).get("hotelId"),
-                "hotelName": offer.get("hotel", {}).get("name"),
-                "address": offer.get("hotel", {}).get("address", {}),
-                "offers": []
-            }
+        formatted_offers = rank_hotels_by_price(format_hotel_offers(offers))
 
-            for hotel_offer in offer.get("offers"):
-                offer_info = {
-                    "id": hotel_offer.get("id"),
-                    "roomType": hotel_offer.get("room", {}).get("typeEstimated", {}).get("category"),
-                    "bedType": hotel_offer.get("room", {}).get("typeEstimated", {}).get("bedType"),
-                    "price": hotel_offer.get("price", {}).get("total"),
-                    "currency": hotel_offer.get("price", {}).get("currency"),
-                    "checkInDate": hotel_offer.get("checkInDate"),
-                    "checkOutDate": hotel_offer.get("checkOutDate")
-                }
-                hotel_info["offers"].append(offer_info)
-
-            formatted_offers.append(hotel_info)
-
-        return json.dumps({"hotels": formatted_offers}, indent=2)
+        return compact_json({"hotels": formatted_offers})
 
     except Exception as e:
         return f"Error: {str(e)}"
\ No newline at end of file
@@ -0,0 +1,72 @@
+"""Shared, pooled HTTP clients for the API clients."""
+
+import asyncio
+from urllib.parse import urlsplit
+
+import httpx
+
+from backend.api_clients.governor import GovernedTransport
+from backend.config import (
+    HTTP2_ENABLED,
+    HTTP_KEEPALIVE_EXPIRY,
+    HTTP_MAX_CONNECTIONS,
+    HTTP_MAX_KEEPALIVE_CONNECTIONS,
+    HTTP_TIMEOUT,
+)
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+if HTTP2_ENABLED and not HTTP2_AVAILABLE:
+    print("HTTP2_ENABLED is set but the h2 package is not installed, so upstream requests use HTTP/1.1 "
+          "(pip install 'httpx[http2]')")
+
+# Connection pools are bound to the event loop that opened them, so clients are
+# kept per loop and per upstream host.
+_clients: dict[asyncio.AbstractEventLoop, dict[str, httpx.AsyncClient]] = {}
+
+
+def _new_client() -> httpx.AsyncClient:
+    """Create a pooled client with the configured keep-alive limits, governed per upstream."""
+    limits = httpx.Limits(
+        max_connections=HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+    )
+    transport = httpx.AsyncHTTPTransport(http2=HTTP2_ENABLED and HTTP2_AVAILABLE, limits=limits)
+    return httpx.AsyncClient(
+        transport=GovernedTransport(transport),
+        timeout=HTTP_TIMEOUT,
+    )
+
+
+def get_client(url: str) -> httpx.AsyncClient:
+    """Get the shared client for the host of the given URL.
+
+    Args:
+        url (str): Any URL on the upstream host, e.g. "https://api.geoapify.com/v2/places".
+
+    Returns:
+        httpx.AsyncClient: A pooled client reused by every request to that host on the running loop.
+    """
+    loop = asyncio.get_running_loop()
+    for stale_loop in [known for known in _clients if known.is_closed()]:
+        del _clients[stale_loop]
+
+    host = urlsplit(url).netloc
+    clients = _clients.setdefault(loop, {})
+    client = clients.get(host)
+    if client is None or client.is_closed:
+        client = _new_client()
+        clients[host] = client
+    return client
+
+
+async def aclose_clients() -> None:
+    """Close every client opened on the running event loop."""
+    clients = _clients.pop(asyncio.get_running_loop(), {})
+    for client in clients.values():
+        await client.aclose()
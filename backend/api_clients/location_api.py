@@ -0,0 +1,43 @@
+"""Get IATA city codes from the Amadeus location API"""
+
+from backend.api_clients.amadues_api_client import amadeus
+from backend.cache import AsyncTTLCache, SQLiteCacheStore, normalize_text
+from backend.config import GEOCODE_CACHE_DB, GEOCODE_CACHE_SIZE, GEOCODE_CACHE_TTL
+
+city_code_cache = AsyncTTLCache(
+    "amadeus_city_code",
+    maxsize=GEOCODE_CACHE_SIZE,
+    ttl=GEOCODE_CACHE_TTL,
+    store=SQLiteCacheStore(GEOCODE_CACHE_DB, "amadeus_city_code") if GEOCODE_CACHE_DB else None
+)
+
+
+async def get_city_code(city: str) -> str | None:
+    """Get the IATA city code of a city, cached per normalized city
+
+    Amadeus accepts city codes (e.g. "PAR") both for hotel searches and as flight origin
+    and destination, where they cover every airport of the city.
+
+    Args:
+        city: The city name, optionally with state and country (e.g. "Paris, France")
+
+    Returns:
+        The IATA city code, or None if Amadeus knows no such city
+    """
+    return await city_code_cache.get_or_load(normalize_text(city), lambda: _fetch_city_code(city))
+
+
+async def _fetch_city_code(city: str) -> str | None:
+    """Search the city by name with the Amadeus locations API."""
+    url = f"{amadeus.base_url}/v1/reference-data/locations"
+    params = {
+        "subType": "CITY",
+        # The keyword search only matches names, so drop the state and country.
+        "keyword": city.split(",")[0].strip().upper(),
+        "page[limit]": 1
+    }
+
+    response = await amadeus.get(url, params=params)
+    response.raise_for_status()
+    locations = response.json().get("data", [])
+    return locations[0].get("iataCode") if locations else None
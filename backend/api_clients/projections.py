@@ -0,0 +1,118 @@
+"""Trim upstream API payloads down to the fields the agents use before they reach the LLM."""
+
+import json
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+
+def compact_json(data: Any) -> str:
+    """Serialize data as JSON without indentation or extra whitespace."""
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+
+
+def summarize_forecast(forecast: dict[str, Any]) -> dict[str, Any]:
+    """Aggregate an OpenWeather 5-day / 3-hour forecast into daily summaries.
+
+    Args:
+        forecast: Raw response of the /data/2.5/forecast endpoint (metric units).
+
+    Returns:
+        City details and one entry per local day with min/max temperature, precipitation and conditions.
+    """
+    city = forecast.get("city", {})
+    offset = timedelta(seconds=city.get("timezone", 0))
+
+    slots_by_day: dict[str, list[dict[str, Any]]] = defaultdict(list)
+    for slot in forecast.get("list", []):
+        local_time = datetime.fromtimestamp(slot["dt"], tz=timezone.utc) + offset
+        slots_by_day[local_time.date().isoformat()].append(slot)
+
+    days = []
+    for day, slots in slots_by_day.items():
+        main = [slot.get("main", {}) for slot in slots]
+        conditions = Counter(
+            weather.get("description") for slot in slots for weather in slot.get("weather", [])[:1]
+        )
+        precipitation = sum(
+            slot.get("rain", {}).get("3h", 0) + slot.get("snow", {}).get("3h", 0) for slot in slots
+        )
+        days.append({
+            "date": day,
+            "temp_min_c": round(min(m.get("temp_min", m.get("temp", 0)) for m in main), 1),
+            "temp_max_c": round(max(m.get("temp_max", m.get("temp", 0)) for m in main), 1),
+            "humidity_pct": round(sum(m.get("humidity", 0) for m in main) / len(main)),
+            "wind_max_ms": round(max(slot.get("wind", {}).get("speed", 0) for slot in slots), 1),
+            "precip_mm": round(precipitation, 1),
+            "precip_chance_pct": round(max(slot.get("pop", 0) for slot in slots) * 100),
+            "conditions": [description for description, _ in conditions.most_common(2)],
+        })
+
+    return {
+        "city": city.get("name"),
+        "country": city.get("country"),
+        "days": days,
+    }
+
+
+def summarize_places(places: dict[str, Any]) -> list[dict[str, Any]]:
+    """Reduce a Geoapify places feature collection to name, address, categories and contact details.
+
+    Args:
+        places: Raw response of the /v2/places endpoint.
+
+    Returns:
+        One entry per place, without geometry or the raw datasource record.
+    """
+    summaries = []
+    for feature in places.get("features", []):
+        properties = feature.get("properties", {})
+        contact = properties.get("contact", {})
+        summary = {
+            "name": properties.get("name"),
+            "address": properties.get("formatted") or properties.get("address_line2"),
+            "categories": [category for category in properties.get("categories", []) if "." in category][:3],
+            "website": properties.get("website"),
+            "phone": contact.get("phone"),
+            "opening_hours": properties.get("opening_hours"),
+        }
+        summaries.append({key: value for key, value in summary.items() if value})
+    return summaries
+
+
+def summarize_flight_offers(offers: dict[str, Any]) -> list[dict[str, Any]]:
+    """Reduce Amadeus flight offers to price, carriers, duration and stops per itinerary.
+
+    Args:
+        offers: Raw response of the /v2/shopping/flight-offers endpoint.
+
+    Returns:
+        One entry per offer with its outbound and return itineraries.
+    """
+    carrier_names = offers.get("dictionaries", {}).get("carriers", {})
+    summaries = []
+    for offer in offers.get("data", []):
+        itineraries = []
+        for itinerary in offer.get("itineraries", []):
+            segments = itinerary.get("segments", [])
+            if not segments:
+                continue
+            itineraries.append({
+                "from": segments[0].get("departure", {}).get("iataCode"),
+                "to": segments[-1].get("arrival", {}).get("iataCode"),
+                "departure": segments[0].get("departure", {}).get("at"),
+                "arrival": segments[-1].get("arrival", {}).get("at"),
+                "duration": itinerary.get("duration"),
+                "stops": len(segments) - 1,
+                "flights": [f"{segment.get('carrierCode')}{segment.get('number')}" for segment in segments],
+            })
+
+        carriers = offer.get("validatingAirlineCodes", [])
+        summaries.append({
+            "price": offer.get("price", {}).get("grandTotal") or offer.get("price", {}).get("total"),
+            "currency": offer.get("price", {}).get("currency"),
+            "carriers": [carrier_names.get(code, code) for code in carriers],
+            "seats_left": offer.get("numberOfBookableSeats"),
+            "itineraries": itineraries,
+        })
+    return summaries
@@ -1,13 +1,35 @@
 """Get data from the Travel Search API"""
 
-import httpx
+import asyncio
 import json
+from typing import Any
 
+from backend.api_clients.http_client import get_client
+from backend.api_clients.projections import compact_json, summarize_places
 from backend.api_key_load import GEOAPIFY_API_KEY
+from backend.cache import AsyncTTLCache, SQLiteCacheStore, normalize_text
+from backend.config import (ACTIVITIES_CACHE_DB, ACTIVITIES_CACHE_SIZE, ACTIVITIES_CACHE_TTL, GEOCODE_CACHE_DB,
+                            GEOCODE_CACHE_SIZE, GEOCODE_CACHE_TTL)
+from backend.places_index import places_index
+
+place_id_cache = AsyncTTLCache(
+    "geocode_place_id",
+    maxsize=GEOCODE_CACHE_SIZE,
+    ttl=GEOCODE_CACHE_TTL,
+    store=SQLiteCacheStore(GEOCODE_CACHE_DB, "geocode_place_id") if GEOCODE_CACHE_DB else None
+)
+
+activities_cache = AsyncTTLCache(
+    "geoapify_activities",
+    maxsize=ACTIVITIES_CACHE_SIZE,
+    ttl=ACTIVITIES_CACHE_TTL,
+    store=SQLiteCacheStore(ACTIVITIES_CACHE_DB, "geoapify_activities") if ACTIVITIES_CACHE_DB else None
+)
+
 
 async def get_place_id_of_city(full_city_to_visit_info: str) -> str | None:
     """
-    Fetches place ID of a city from GeoAPIfy API asynchronously.
+    Fetches place ID of a city from GeoAPIfy API asynchronously, cached per normalized city.
 
     Args:
         full_city_to_visit_info (str): The city_to_visit name with state and country.
@@ -15,20 +37,72 @@ async def get_place_id_of_city(full_city_to_visit_info: str) -> str | None:
     Returns:
         place_id (str): Place ID of the city.
     """
+    return await place_id_cache.get_or_load(
+        normalize_text(full_city_to_visit_info),
+        lambda: _load_place_id_of_city(full_city_to_visit_info)
+    )
+
+
+async def _load_place_id_of_city(full_city_to_visit_info: str) -> str | None:
+    """Place id recorded in the local places index, else geocoded with the GeoAPIfy API."""
+    if places_index is not None:
+        place_id = await places_index.aplace_id(full_city_to_visit_info)
+        if place_id:
+            return place_id
+    return await fetch_place_id_of_city(full_city_to_visit_info)
+
+
+async def fetch_place_id_of_city(full_city_to_visit_info: str) -> str | None:
+    """Geocode a city with the GeoAPIfy API."""
     full_city_to_visit_info = full_city_to_visit_info.replace(" ", "%20")
     search_place_id_url = f"https://api.geoapify.com/v1/geocode/search?text=38%20{full_city_to_visit_info}&apiKey={GEOAPIFY_API_KEY}"
 
-    async with httpx.AsyncClient() as client:
-        response = await client.get(search_place_id_url)
-        response.raise_for_status()
-        data = response.json()
-        return data["features"][0]["properties"]["place_id"]
+    client = get_client(search_place_id_url)
+    response = await client.get(search_place_id_url)
+    response.raise_for_status()
+    data = response.json()
+    return data["features"][0]["properties"]["place_id"]
+
+
+# Geoapify categories fetched for each trip purpose.
+FOODIE_CATEGORIES = ("catering.restaurant", "catering.cafe")
+BUSINESS_CATEGORIES = ("leisure", "natural", "tourism", "heritage", "beach")
+ENTERTAINMENT_CATEGORIES = ("entertainment", "entertainment.theme_park", "entertainment.water_park")
+# Places requested per purpose. Each selected purpose is fetched separately, so one purpose
+# cannot crowd the others out of the merged result.
+PLACES_PER_PURPOSE = 10
+
+
+def activity_category_groups(foodie: bool, business: bool, adventure_or_fun: bool) -> list[tuple[str, ...]]:
+    """Geoapify categories of each selected purpose, sightseeing if no purpose is selected."""
+    return [categories for wanted, categories in (
+        (foodie, FOODIE_CATEGORIES),
+        (business, BUSINESS_CATEGORIES),
+        (adventure_or_fun, ENTERTAINMENT_CATEGORIES),
+    ) if wanted] or [BUSINESS_CATEGORIES]
+
+
+def merge_places(groups: list[list[dict[str, Any]]]) -> list[dict[str, Any]]:
+    """Concatenate the places of each purpose in order, keeping the first copy of places found by several."""
+    places = []
+    seen = set()
+    for group in groups:
+        for place in group:
+            key = json.dumps(place, sort_keys=True)
+            if key not in seen:
+                seen.add(key)
+                places.append(place)
+    return places
 
 
 async def get_activities_of_city(foodie: bool, business: bool, adventure_or_fun: bool, city_to_visit: str) -> str | None:
     """
     Fetches the activities to in a city from GeoAPIfy API asynchronously.
 
+    Cities in the local places index are answered from it. Otherwise the places of each
+    selected purpose are fetched concurrently, cached per place id and purpose, and merged
+    so that every purpose keeps up to PLACES_PER_PURPOSE places.
+
     Args:
         foodie (bool): Whether the user is a foodie.
         adventure_or_fun (bool): Whether the user wants to do adventure or fun.
@@ -36,26 +110,34 @@ async def get_activities_of_city(foodie: bool, business: bool, adventure_or_fun:
         city_to_visit (str): The city_to_visit name with state and country.
 
     Returns:
-        json_data (str): JSON string with activities data.
+        json_data (str): Compact JSON string with the name, address and contact details of each place.
     """
 
     place_id = await get_place_id_of_city(city_to_visit)
+    category_groups = activity_category_groups(foodie, business, adventure_or_fun)
+    if places_index is not None and place_id is not None:
+        places = await places_index.alookup(place_id, category_groups, PLACES_PER_PURPOSE)
+        if places is not None:
+            return compact_json(places)
 
-    get_activities_url = ""
-    if foodie:
-        get_activities_url = f"https://api.geoapify.com/v2/places?categories=catering.restaurant,catering.cafe&filter=place:{place_id}&limit=10&apiKey={GEOAPIFY_API_KEY}"
-
-    if business:
+    groups = await asyncio.gather(*(_get_places(place_id, categories) for categories in category_groups))
+    return compact_json(merge_places(groups))
 
-        get_activities_url = f"https://api.geoapify.com/v2/places?categories=leisure,natural,tourism,heritage,beach&filter=place:{place_id}&limit=10&apiKey={GEOAPIFY_API_KEY}"
 
-    if adventure_or_fun:
+async def _get_places(place_id: str, categories: tuple[str, ...]) -> list[dict[str, Any]]:
+    """Places of one purpose in a city, cached per place id, categories and limit."""
+    return await activities_cache.get_or_load(
+        f"{place_id}|{','.join(categories)}|{PLACES_PER_PURPOSE}",
+        lambda: _fetch_activities(place_id, categories, PLACES_PER_PURPOSE)
+    )
 
-        get_activities_url = f"https://api.geoapify.com/v2/places?categories=entertainment,entertainment.theme_park,entertainment.water_park&filter=place:{place_id}&limit=10&apiKey={GEOAPIFY_API_KEY}"
 
-    async with httpx.AsyncClient() as client:
+async def _fetch_activities(place_id: str, categories: tuple[str, ...], limit: int) -> list[dict[str, Any]]:
+    """Fetch the places of the categories in a city from the GeoAPIfy API."""
+    get_activities_url = f"https://api.geoapify.com/v2/places?categories={','.join(categories)}&filter=place:{place_id}&limit={limit}&apiKey={GEOAPIFY_API_KEY}"
 
-        response = await client.get(get_activities_url)
-        response.raise_for_status()
-        travel_data = response.json()
-        return json.dumps(travel_data, indent=2)
\ No newline at end of file
+    client = get_client(get_activities_url)
+    response = await client.get(get_activities_url)
+    response.raise_for_status()
+    travel_data = response.json()
+    return summarize_places(travel_data)
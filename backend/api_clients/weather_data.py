@@ -1,31 +1,51 @@
 """Get necessary information regarding the weather."""
 
 import httpx
-import json
 
+from backend.api_clients.http_client import get_client
+from backend.api_clients.projections import compact_json, summarize_forecast
 from backend.api_key_load import OPEN_WEATHER_KEY
+from backend.cache import AsyncTTLCache, normalize_text
+from backend.config import WEATHER_CACHE_SIZE, WEATHER_CACHE_STALE_TTL, WEATHER_CACHE_TTL
+
+# One forecast per city and forecast slot: entries expire at the next slot boundary.
+weather_cache = AsyncTTLCache(
+    "openweather_forecast",
+    maxsize=WEATHER_CACHE_SIZE,
+    ttl=WEATHER_CACHE_TTL,
+    align_ttl=True,
+    stale_ttl=WEATHER_CACHE_STALE_TTL
+)
+
 
 async def get_weather(city_to_visit: str) -> str | None:
     """
-    Fetches weather data from OpenWeatherMap API asynchronously.
+    Fetches weather data from OpenWeatherMap API asynchronously, cached per city and forecast slot.
+
+    Concurrent calls for the same city share one upstream request.
 
     Args:
         city_to_visit (str): The city_to_visit name.
 
     Returns:
-        Weather data in JSON string format, or None if an error occurs.
+        Compact JSON string with daily forecast summaries, or None if an error occurs.
     """
+    return await weather_cache.get_or_load(normalize_text(city_to_visit), lambda: _fetch_weather(city_to_visit))
+
+
+async def _fetch_weather(city_to_visit: str) -> str | None:
+    """Fetch the 5-day / 3-hour forecast of a city from OpenWeatherMap."""
     base_url = "https://api.openweathermap.org/data/2.5/forecast"
     params = {"q": city_to_visit, "appid": OPEN_WEATHER_KEY, "units": "metric"}
 
-    async with httpx.AsyncClient() as client:
+    client = get_client(base_url)
 
-        try:
-          response = await client.get(base_url, params=params)
-          response.raise_for_status()
-          weather_data = response.json()
-          return json.dumps(weather_data, indent=2)
+    try:
+        response = await client.get(base_url, params=params)
+        response.raise_for_status()
+        weather_data = response.json()
+        return compact_json(summarize_forecast(weather_data))
 
-        except httpx.HTTPError as e:
-            print(f"HTTP Error: {e}")
-            return None
\ No newline at end of file
+    except httpx.HTTPError as e:
+        print(f"HTTP Error: {e}")
+        return None
\ No newline at end of file
@@ -0,0 +1,205 @@
+"""Batch plan generation: run many CreatePlanRequests with bounded concurrency.
+
+The same runner backs the /plan/batch endpoint and an offline job runner that reads a JSONL
+file of CreatePlanRequests and appends one result per line to an output JSONL file:
+
+    python -m backend.batch plans.jsonl itineraries.jsonl --concurrency 8
+
+Every plan of a batch runs in one process, so they share the PackingAgent, the upstream
+connection pools and the geocode, weather and plan caches. Rerunning the same command after
+a crash skips the plans already written to the output file and retries the failed ones.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, Optional, Set, Tuple
+
+from langgraph.graph.state import CompiledStateGraph
+
+from backend.config import BATCH_CONCURRENCY
+from backend.schemas import CreatePlanRequest
+from backend.tracing import run_config
+
+
+async def generate_itinerary(graph: CompiledStateGraph, request: CreatePlanRequest) -> str:
+    """Run Phase 1 of the graph for one request and return the itinerary.
+
+    Raises:
+        ValueError: If the graph produced no itinerary.
+    """
+    config = run_config(request.thread_id)
+
+    initial_data = request.model_dump()
+    initial_data["initial_plan_complete"] = False
+    initial_data["messages"] = []
+
+    response = await graph.ainvoke(initial_data, config=config)
+
+    itinerary = response["messages"][-1].content if response.get("messages") else None
+    if not itinerary:
+        raise ValueError("AI failed to generate an itinerary.")
+    return itinerary
+
+
+def request_id(payload: Dict[str, Any]) -> str:
+    """Stable id of a batch entry: its "id" or "thread_id" field, else a hash of its content."""
+    explicit = payload.get("id") or payload.get("thread_id")
+    if explicit:
+        return str(explicit)
+    digest = hashlib.sha1(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+    return f"plan-{digest[:16]}"
+
+
+async def _run_one(graph: CompiledStateGraph, plan_id: str, payload: Optional[Dict[str, Any]],
+                   keep_threads: bool) -> Dict[str, Any]:
+    if payload is None:
+        return {"id": plan_id, "status": "error", "error": "Invalid JSON line."}
+
+    # Reusing the id as thread_id keeps reruns of the same entry on the same chat thread.
+    thread_id = payload.get("thread_id") or plan_id
+    try:
+        request = CreatePlanRequest.model_validate(dict(payload, thread_id=thread_id))
+        itinerary = await generate_itinerary(graph, request)
+        return {"id": plan_id, "status": "ok", "thread_id": thread_id, "itinerary": itinerary}
+    except Exception as e:
+        print(f"Error in batch plan {plan_id}: {e}")
+        return {"id": plan_id, "status": "error", "thread_id": thread_id, "error": str(e)}
+    finally:
+        if not keep_threads:
+            try:
+                await graph.checkpointer.adelete_thread(thread_id)
+            except Exception as e:
+                print(f"Error deleting thread {thread_id}: {e}")
+
+
+async def run_batch(graph: CompiledStateGraph, requests: Iterable[Tuple[str, Optional[Dict[str, Any]]]],
+                    concurrency: int = BATCH_CONCURRENCY, keep_threads: bool = True) -> AsyncIterator[Dict[str, Any]]:
+    """Generate the plans with at most concurrency running at once, yielding results as they finish.
+
+    Requests are pulled from the iterable only when a worker is free, so large batches are
+    never loaded into memory at once.
+
+    Args:
+        graph: The compiled PackingAgent graph.
+        requests: (id, CreatePlanRequest fields) pairs; None fields mark an unparseable entry.
+        concurrency (int): Number of plans generated at once.
+        keep_threads (bool): Keep the checkpointed chat thread of each plan for later /plan/chat calls.
+
+    Yields:
+        One result per request with "id", "status" ("ok" or "error") and "itinerary" or "error".
+    """
+    pending: asyncio.Queue = asyncio.Queue(maxsize=concurrency)
+    results: asyncio.Queue = asyncio.Queue()
+
+    async def produce() -> None:
+        try:
+            for item in requests:
+                await pending.put(item)
+        except Exception as e:
+            print(f"Error reading batch requests: {e}")
+        for _ in range(concurrency):
+            await pending.put(None)
+
+    async def work() -> None:
+        while (item := await pending.get()) is not None:
+            results.put_nowait(await _run_one(graph, *item, keep_threads=keep_threads))
+        results.put_nowait(None)
+
+    tasks = [asyncio.create_task(produce())] + [asyncio.create_task(work()) for _ in range(concurrency)]
+    try:
+        finished_workers = 0
+        while finished_workers < concurrency:
+            result = await results.get()
+            if result is None:
+                finished_workers += 1
+                continue
+            yield result
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+def read_requests(path: str, skip: Set[str]) -> Iterator[Tuple[str, Optional[Dict[str, Any]]]]:
+    """Read (id, fields) pairs from a JSONL file of CreatePlanRequests, skipping ids in skip."""
+    with open(path, encoding="utf-8") as file:
+        for line_number, line in enumerate(file, start=1):
+            if not line.strip():
+                continue
+            try:
+                payload = json.loads(line)
+            except json.JSONDecodeError:
+                yield f"line-{line_number}", None
+                continue
+            plan_id = request_id(payload)
+            if plan_id not in skip:
+                yield plan_id, payload
+
+
+def completed_ids(path: str) -> Set[str]:
+    """Ids already generated successfully in an output file, dropping a line cut off by a crash."""
+    if not os.path.exists(path):
+        return set()
+
+    with open(path, "rb+") as file:
+        content = file.read()
+        if content and not content.endswith(b"\n"):
+            file.truncate(content.rfind(b"\n") + 1)
+
+    completed = set()
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            try:
+                result = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if result.get("status") == "ok":
+                completed.add(result["id"])
+    return completed
+
+
+async def run_file(graph: CompiledStateGraph, input_path: str, output_path: str,
+                   concurrency: int = BATCH_CONCURRENCY, keep_threads: bool = False) -> Dict[str, int]:
+    """Generate the plans of a JSONL file, appending results to the output JSONL as they finish.
+
+    Returns:
+        Counts of "skipped", "ok" and "error" plans.
+    """
+    done = completed_ids(output_path)
+    counts = {"skipped": len(done), "ok": 0, "error": 0}
+    with open(output_path, "a", encoding="utf-8") as output:
+        async for result in run_batch(graph, read_requests(input_path, done), concurrency, keep_threads):
+            output.write(json.dumps(result) + "\n")
+            output.flush()
+            os.fsync(output.fileno())
+            counts[result["status"]] += 1
+            print(f"[{counts['ok'] + counts['error']}] {result['id']}: {result['status']}")
+    return counts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Generate travel plans for a JSONL file of CreatePlanRequests.")
+    parser.add_argument("input", help="JSONL file with one CreatePlanRequest per line.")
+    parser.add_argument("output", help="JSONL file the results are appended to; rerun to resume.")
+    parser.add_argument("--concurrency", type=int, default=BATCH_CONCURRENCY)
+    parser.add_argument("--keep-threads", action="store_true",
+                        help="Keep each plan's chat thread in the checkpointer (use with CHECKPOINTER=sqlite).")
+    args = parser.parse_args()
+
+    from backend.agents.packing_agent import PackingAgent
+    from backend.api_clients.http_client import aclose_clients
+
+    async def run() -> Dict[str, int]:
+        try:
+            return await run_file(PackingAgent().graph, args.input, args.output, args.concurrency, args.keep_threads)
+        finally:
+            await aclose_clients()
+
+    counts = asyncio.run(run())
+    print(f"Batch finished: {counts['ok']} generated, {counts['error']} failed, {counts['skipped']} already done.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+"""Offline benchmarks for the packing assistant backend."""
@@ -0,0 +1,54 @@
+"""Microbenchmark of per-plan agent construction overhead, fresh versus cached agents.
+
+Builds the real Gemini/Tavily/create_react_agent stack (no network calls
+are made), so dummy keys are enough:
+
+    python -m backend.benchmarks.agent_construction --plans 50
+"""
+
+import argparse
+import os
+import time
+
+for key in ("GEMINI_API_KEY", "GEMINI_PRO_API_KEY", "TAVILY_API_KEY"):
+    os.environ.setdefault(key, "benchmark")
+
+from backend.agents.budget_agent import BudgetAgent, get_budget_agent  # noqa: E402
+from backend.agents.suggestion_agent import SuggestionAgent, get_suggestion_agent  # noqa: E402
+from backend.agents.weather_agent import WeatherAgent, get_weather_agent  # noqa: E402
+
+
+def fresh_agents() -> None:
+    """What every plan used to pay: one new agent per Phase 1 node."""
+    WeatherAgent()
+    SuggestionAgent()
+    BudgetAgent()
+
+
+def cached_agents() -> None:
+    get_weather_agent()
+    get_suggestion_agent()
+    get_budget_agent()
+
+
+def time_per_plan(build, plans: int) -> float:
+    start = time.perf_counter()
+    for _ in range(plans):
+        build()
+    return (time.perf_counter() - start) / plans
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--plans", type=int, default=50)
+    args = parser.parse_args()
+
+    fresh = time_per_plan(fresh_agents, args.plans)
+    cached_agents()
+    cached = time_per_plan(cached_agents, args.plans)
+    print(f"fresh agents per plan:  {fresh * 1000:8.2f} ms")
+    print(f"cached agents per plan: {cached * 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Regression benchmark: supervisor prompts must stay bounded over a long chat.
+
+Creates one plan, then sends N chat turns to the same thread with a fake LLM whose replies are
+as long as a real itinerary, and reports the supervisor prompt size of each turn. With the
+context policy (SUPERVISOR_MAX_TURNS, SUPERVISOR_TOKEN_BUDGET) the prompt stops growing once the
+window is full.
+
+    python -m backend.benchmarks.chat_growth --turns 40
+"""
+
+import argparse
+import asyncio
+import sys
+from typing import cast
+
+from langchain_core.messages import HumanMessage
+from langchain_core.runnables import RunnableConfig
+
+from backend.benchmarks.fakes import FakeChatModel
+from backend.benchmarks.plan_create_load import PLAN_REQUEST, install_fake_llm
+from backend.config import SUPERVISOR_TOKEN_BUDGET
+from backend.agents.conversation_window import CHARS_PER_TOKEN
+
+
+async def run(turns: int, reply_chars: int, report_every: int) -> bool:
+    from backend.agents.packing_agent import PackingAgent
+    from backend.metrics import metrics_stats
+
+    agent = PackingAgent()
+    supervisor_llm = cast(FakeChatModel, agent.llm)
+    supervisor_llm.response = " ".join(["word"] * (reply_chars // 5))
+    config: RunnableConfig = {"configurable": {"thread_id": "chat-growth"}}
+    state = dict(PLAN_REQUEST, initial_plan_complete=False, messages=[])
+    await agent.graph.ainvoke(state, config=config)
+
+    system_chars = 0
+    prompt_sizes = []
+    for turn in range(1, turns + 1):
+        message = HumanMessage(content=f"Question {turn}: what should I pack for day {turn}?")
+        result = await agent.graph.ainvoke({"messages": [message]}, config=config)
+        prompt_sizes.append(supervisor_llm.last_prompt_chars)
+        system_chars = len(agent.system_prompt + result.get("agent_context", "")) + len(result.get("conversation_summary", ""))
+        if turn == 1 or turn % report_every == 0:
+            print(f"turn {turn:>4}: supervisor prompt {prompt_sizes[-1]:>7} chars, "
+                  f"history {len(result['messages']):>4} messages, {result.get('summarized_messages', 0):>4} summarized")
+
+    print(f"supervisor input tokens: {metrics_stats()['supervisor_input_tokens']['mean']} mean per turn")
+    # The window may overshoot the budget by the latest turn, which is always kept whole.
+    limit = system_chars + SUPERVISOR_TOKEN_BUDGET * CHARS_PER_TOKEN + 2 * reply_chars
+    bounded = max(prompt_sizes[len(prompt_sizes) // 2:]) <= limit
+    print("supervisor prompt is bounded" if bounded else "supervisor prompt GREW past the token budget")
+    return bounded
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--turns", type=int, default=40)
+    parser.add_argument("--reply-chars", type=int, default=4000)
+    parser.add_argument("--report-every", type=int, default=10)
+    args = parser.parse_args()
+
+    install_fake_llm(latency=0)
+    bounded = asyncio.run(run(args.turns, args.reply_chars, args.report_every))
+    sys.exit(0 if bounded else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Benchmark of checkpoint read/write latency versus thread history length.
+
+Drives a one-node chat graph (so the checkpointer dominates each step) with the in-memory and
+SQLite backends and reports per-turn write latency and latest-checkpoint read latency:
+
+    python -m backend.benchmarks.checkpoint_latency --turns 1000
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from operator import add
+from typing import Annotated, Any, Dict, List, TypedDict
+
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import BaseCheckpointSaver
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.graph import END, StateGraph
+
+from backend.checkpoint import SQLiteCheckpointSaver
+
+REPLY = AIMessage(content="Here is a detailed answer about your trip. " * 20)
+
+
+class ChatState(TypedDict):
+    messages: Annotated[List[BaseMessage], add]
+
+
+def reply(state: ChatState) -> Dict[str, Any]:
+    return {"messages": [REPLY]}
+
+
+async def measure(saver: BaseCheckpointSaver, turns: int, report_at: List[int]) -> None:
+    workflow = StateGraph(ChatState)
+    workflow.add_node("reply", reply)
+    workflow.set_entry_point("reply")
+    workflow.add_edge("reply", END)
+    graph = workflow.compile(checkpointer=saver)
+    config: RunnableConfig = {"configurable": {"thread_id": "benchmark"}}
+
+    samples = []
+    for turn in range(1, turns + 1):
+        start = time.perf_counter()
+        await graph.ainvoke(ChatState(messages=[HumanMessage(content=f"Question {turn} about my trip?")]), config)
+        samples.append(time.perf_counter() - start)
+
+        if turn in report_at:
+            start = time.perf_counter()
+            await saver.aget_tuple(config)
+            read = time.perf_counter() - start
+            window = samples[-10:]
+            print(f"  {turn * 2:>6} messages: turn {sum(window) / len(window) * 1000:7.2f} ms, "
+                  f"read latest checkpoint {read * 1000:7.2f} ms")
+
+
+async def run(turns: int) -> None:
+    report_at = sorted({turn for turn in (10, 50, 100, 250, 500, 1000, turns) if turn <= turns})
+    print("memory:")
+    await measure(MemorySaver(), turns, report_at)
+
+    with tempfile.TemporaryDirectory() as directory:
+        print("sqlite:")
+        await measure(SQLiteCheckpointSaver(os.path.join(directory, "checkpoints.sqlite"), history_limit=10),
+                      turns, report_at)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--turns", type=int, default=500)
+    args = parser.parse_args()
+    asyncio.run(run(args.turns))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Benchmark of LLM calls and latency per plan with the specialist agents in ReAct versus direct mode.
+
+Runs the plan requests through PackingAgent.graph offline (recorded upstream fixtures and the
+scripted fake model of the harness) once with AGENT_FETCH_MODE=react and once with direct,
+clearing the caches in between:
+
+    python -m backend.benchmarks.direct_fetch --plans 24 --concurrency 4 --llm-latency 0.5
+"""
+
+import argparse
+import asyncio
+import os
+from typing import Any, Dict
+
+from backend.benchmarks.fakes import ScriptedChatModel
+from backend.benchmarks.harness import DEFAULT_REQUESTS, RATE_LIMITS, drive, load_requests
+
+
+async def run(args: argparse.Namespace) -> None:
+    from backend.batch import generate_itinerary
+    from backend.benchmarks.plan_create_load import install_fake_llm
+    from backend.benchmarks.upstreams import install_fixture_transport
+
+    install_fake_llm(args.llm_latency, ScriptedChatModel)
+    fixtures = install_fixture_transport(args.http_latency)
+
+    from backend.agents.budget_agent import get_budget_agent
+    from backend.agents.packing_agent import PackingAgent
+    from backend.agents.suggestion_agent import get_suggestion_agent
+    from backend.agents.weather_agent import get_weather_agent
+    from backend.api_clients.http_client import aclose_clients
+    from backend.cache import clear_caches
+    from backend.schemas import CreatePlanRequest
+    from backend.tracing import llm_seconds
+
+    requests = load_requests(args.requests)
+    plans = [requests[index % len(requests)] for index in range(args.plans or len(requests))]
+    agent = PackingAgent()
+    specialists = (get_weather_agent(), get_suggestion_agent(), get_budget_agent())
+
+    reports: Dict[str, Dict[str, Any]] = {}
+    for mode in ("react", "direct"):
+        for specialist in specialists:
+            specialist.direct_fetch = mode == "direct"
+        clear_caches()
+        llm_calls = llm_seconds.stats()["count"]
+        upstream_requests = sum(fixtures.requests.values())
+
+        async def send(index: int, trip: Dict[str, Any]) -> None:
+            await generate_itinerary(agent.graph, CreatePlanRequest(**trip, thread_id=f"{mode}-{index}"))
+
+        report = await drive(plans, args.concurrency, send)
+        report["llm_calls_per_plan"] = (llm_seconds.stats()["count"] - llm_calls) / len(plans)
+        report["upstream_requests_per_plan"] = (sum(fixtures.requests.values()) - upstream_requests) / len(plans)
+        reports[mode] = report
+    await aclose_clients()
+
+    print(f"\n{len(plans)} plans, concurrency {args.concurrency}, LLM latency {args.llm_latency}s, "
+          f"HTTP latency {args.http_latency}s\n")
+    print(f"{'mode':<8}{'LLM calls/plan':>16}{'HTTP/plan':>11}{'p50':>9}{'p95':>9}{'plans/s':>9}{'errors':>8}")
+    for mode, report in reports.items():
+        latency = report["latency_seconds"]
+        print(f"{mode:<8}{report['llm_calls_per_plan']:>16.2f}{report['upstream_requests_per_plan']:>11.2f}"
+              f"{latency['p50']:>8.2f}s{latency['p95']:>8.2f}s{report['throughput_plans_per_second']:>9.2f}"
+              f"{report['errors']:>8}")
+    saved = reports["react"]["llm_calls_per_plan"] - reports["direct"]["llm_calls_per_plan"]
+    speedup = reports["react"]["latency_seconds"]["p50"] / max(reports["direct"]["latency_seconds"]["p50"], 1e-9)
+    print(f"\ndirect mode saves {saved:.2f} LLM calls per plan; p50 latency is {speedup:.2f}x faster")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", default=str(DEFAULT_REQUESTS), help="JSONL file of /plan/create bodies.")
+    parser.add_argument("--plans", type=int, default=0, help="Plans per mode, cycling through the requests.")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--llm-latency", type=float, default=0.5, help="Seconds each fake LLM call takes.")
+    parser.add_argument("--http-latency", type=float, default=0.05, help="Seconds each fixture HTTP response takes.")
+    args = parser.parse_args()
+
+    # Configuration is read on import, so it has to be set before the backend is loaded.
+    os.environ.setdefault("TAVILY_API_KEY", "benchmark")
+    os.environ["PLAN_CACHE_ENABLED"] = "false"
+    os.environ["LLM_CACHE_NODES"] = ""
+    for name in RATE_LIMITS:
+        os.environ.setdefault(name, "0")
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""Fake upstreams used by the offline benchmarks."""
+
+import asyncio
+import time
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+
+class FakeChatModel(BaseChatModel):
+    """Chat model that answers with a fixed text after a fixed latency and never calls tools."""
+    model: str = "fake-chat-model"
+    latency: float = 0.2
+    response: str = "Fake response."
+    calls: int = 0
+    last_prompt_chars: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-chat-model"
+
+    def bind_tools(self, tools: Any, **kwargs: Any) -> "FakeChatModel":
+        return self
+
+    def _record(self, messages: List[BaseMessage]) -> None:
+        self.calls += 1
+        self.last_prompt_chars = sum(len(str(message.content)) for message in messages)
+
+    def _message(self) -> AIMessage:
+        """The response with token usage estimated at four characters per token."""
+        input_tokens = self.last_prompt_chars // 4
+        output_tokens = len(self.response) // 4
+        return AIMessage(content=self.response, usage_metadata={
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "total_tokens": input_tokens + output_tokens,
+        })
+
+    def _result(self, message: AIMessage) -> ChatResult:
+        """Result of one call, with its duration in the generation info like the governed Gemini model."""
+        return ChatResult(generations=[ChatGeneration(message=message, generation_info={"call_seconds": self.latency})])
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager: Optional[CallbackManagerForLLMRun] = None, **kwargs: Any) -> ChatResult:
+        self._record(messages)
+        time.sleep(self.latency)
+        return self._result(self._message())
+
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                         run_manager: Optional[AsyncCallbackManagerForLLMRun] = None, **kwargs: Any) -> ChatResult:
+        self._record(messages)
+        await asyncio.sleep(self.latency)
+        return self._result(self._message())
+
+    async def _astream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                       run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+                       **kwargs: Any) -> AsyncIterator[ChatGenerationChunk]:
+        """Stream the response word by word, spreading the latency over the words."""
+        self._record(messages)
+        words = self.response.split(" ")
+        for index, word in enumerate(words):
+            await asyncio.sleep(self.latency / len(words))
+            text = word if index == 0 else f" {word}"
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=text))
+            if run_manager:
+                await run_manager.on_llm_new_token(text, chunk=chunk)
+            yield chunk
+
+
+# Trip of the plan being generated, set by the benchmark driver before each run.
+current_trip: ContextVar[Dict[str, Any]] = ContextVar("current_trip")
+
+
+def _airport(city: str) -> str:
+    return city.split(",")[0].strip()[:3].upper()
+
+
+# Arguments the scripted model passes to each API-backed tool for a trip.
+SCRIPTED_TOOL_ARGS: Dict[str, Callable[[Dict[str, Any]], Dict[str, Any]]] = {
+    "get_weather_data_of_city": lambda trip: {"city": trip["destination"]},
+    "get_activities_data_of_city_sync": lambda trip: {
+        "foodie": trip["foodie"], "business": trip["business"],
+        "adventure_or_fun": trip["entertainment"], "city_to_visit": trip["destination"],
+    },
+    "get_flight_data": lambda trip: {
+        "origin": _airport(trip["origin_city"]), "destination": _airport(trip["destination"]),
+        "departure_date": trip["start_date"], "return_date": trip["end_date"], "adults": trip["adults"],
+    },
+    "get_hotel_data": lambda trip: {
+        "city_code": _airport(trip["destination"]), "check_in": trip["start_date"],
+        "check_out": trip["end_date"], "adults": trip["adults"],
+    },
+    "get_accommodation_data_of_city": lambda trip: {"city": trip["destination"]},
+    "get_car_rental_data_of_city": lambda trip: {"city": trip["destination"]},
+}
+
+
+class ScriptedChatModel(FakeChatModel):
+    """Fake chat model that behaves like a ReAct agent over the recorded fixtures.
+
+    When tools are bound, the first call asks for every API-backed tool at once with
+    arguments built from current_trip; once tool results are in the conversation it answers
+    with the fixed response. Tavily and the supervisor tools are never called, so no network
+    or nested agents are involved.
+    """
+    tool_names: List[str] = []
+
+    def bind_tools(self, tools: Any, **kwargs: Any) -> "ScriptedChatModel":
+        names = [getattr(tool, "name", "") for tool in tools]
+        return self.model_copy(update={"tool_names": [name for name in names if name in SCRIPTED_TOOL_ARGS]})
+
+    def _reply(self, messages: List[BaseMessage]) -> AIMessage:
+        if not self.tool_names or any(isinstance(message, ToolMessage) for message in messages):
+            return self._message()
+        trip = current_trip.get()
+        tool_calls = [
+            {"name": name, "args": SCRIPTED_TOOL_ARGS[name](trip), "id": f"call_{index}", "type": "tool_call"}
+            for index, name in enumerate(self.tool_names)
+        ]
+        return AIMessage(content="", tool_calls=tool_calls)
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager: Optional[CallbackManagerForLLMRun] = None, **kwargs: Any) -> ChatResult:
+        self._record(messages)
+        time.sleep(self.latency)
+        return self._result(self._reply(messages))
+
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                         run_manager: Optional[AsyncCallbackManagerForLLMRun] = None, **kwargs: Any) -> ChatResult:
+        self._record(messages)
+        await asyncio.sleep(self.latency)
+        return self._result(self._reply(messages))
@@ -0,0 +1,201 @@
+"""Deterministic offline benchmark harness for plan generation.
+
+Replays the recorded upstream fixtures through a local transport and replaces Gemini with
+a scripted fake model that calls the API-backed tools like the real ReAct agents do, so the
+whole Phase 1 pipeline (graph, tools, API clients, caches, governor) runs without network
+access or API keys. Plans are read from a JSONL file of /plan/create request bodies and
+driven through PackingAgent.graph or the FastAPI app at the chosen concurrency:
+
+    python -m backend.benchmarks.harness --target app --concurrency 8 --plans 48
+    python -m backend.benchmarks.harness --requests my_plans.jsonl --json-out baseline.json
+
+Reports throughput, p50/p95/p99 plan latency, RSS and event-loop lag. The plan and LLM
+response caches and upstream rate limits are off unless --plan-cache, --llm-cache or the
+*_RATE_LIMIT variables are set, so runs with the same arguments are comparable.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import resource
+import statistics
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List
+
+from backend.benchmarks.fakes import ScriptedChatModel, current_trip
+from backend.benchmarks.prompt_growth import current_rss_mb
+
+DEFAULT_REQUESTS = Path(__file__).parent / "fixtures" / "plan_requests.jsonl"
+RATE_LIMITS = ("GEOAPIFY_RATE_LIMIT", "OPENWEATHER_RATE_LIMIT", "AMADEUS_RATE_LIMIT", "TAVILY_RATE_LIMIT",
+               "GEMINI_RATE_LIMIT")
+
+
+def load_requests(path: str) -> List[Dict[str, Any]]:
+    """Plan requests of a JSONL file, one /plan/create body per line."""
+    with open(path, encoding="utf-8") as file:
+        return [json.loads(line) for line in file if line.strip()]
+
+
+def percentile(values: List[float], percent: int) -> float:
+    """Percentile of the values, e.g. percent=95 for p95 (the single value if there is only one)."""
+    if len(values) < 2:
+        return values[0] if values else 0.0
+    return statistics.quantiles(values, n=100, method="inclusive")[percent - 1]
+
+
+async def sample_loop_lag(interval: float, lags: List[float], stop: asyncio.Event) -> None:
+    """Record how late the event loop wakes up from sleeps of interval seconds."""
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append(time.perf_counter() - start - interval)
+
+
+async def drive(plans: List[Dict[str, Any]], concurrency: int,
+                send: Callable[[int, Dict[str, Any]], Awaitable[None]]) -> Dict[str, Any]:
+    """Send the plans with at most concurrency in flight and time each one."""
+    latencies: List[float] = []
+    errors = 0
+    queue: asyncio.Queue = asyncio.Queue()
+    for index, trip in enumerate(plans):
+        queue.put_nowait((index, trip))
+
+    async def worker() -> None:
+        nonlocal errors
+        while not queue.empty():
+            index, trip = queue.get_nowait()
+            current_trip.set(trip)
+            start = time.perf_counter()
+            try:
+                await send(index, trip)
+                latencies.append(time.perf_counter() - start)
+            except Exception as e:
+                errors += 1
+                print(f"Error in benchmark plan {index}: {e}")
+
+    lags: List[float] = []
+    stop = asyncio.Event()
+    sampler = asyncio.create_task(sample_loop_lag(0.01, lags, stop))
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    wall = time.perf_counter() - start
+    stop.set()
+    await sampler
+
+    return {
+        "plans": len(plans),
+        "errors": errors,
+        "wall_seconds": round(wall, 3),
+        "throughput_plans_per_second": round(len(latencies) / wall, 3) if wall else 0.0,
+        "latency_seconds": {
+            "p50": round(percentile(latencies, 50), 3),
+            "p95": round(percentile(latencies, 95), 3),
+            "p99": round(percentile(latencies, 99), 3),
+            "max": round(max(latencies, default=0.0), 3),
+        },
+        "loop_lag_ms": {
+            "p50": round(percentile(lags, 50) * 1000, 2),
+            "p99": round(percentile(lags, 99) * 1000, 2),
+            "max": round(max(lags, default=0.0) * 1000, 2),
+        },
+    }
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    from backend.batch import generate_itinerary
+    from backend.benchmarks.plan_create_load import install_fake_llm
+    from backend.benchmarks.upstreams import install_fixture_transport
+
+    install_fake_llm(args.llm_latency, ScriptedChatModel)
+    fixtures = install_fixture_transport(args.http_latency)
+
+    from backend.agents.packing_agent import PackingAgent
+    from backend.api_clients.http_client import aclose_clients
+    from backend.schemas import CreatePlanRequest
+    from backend.tracing import llm_seconds, tool_seconds
+
+    requests = load_requests(args.requests)
+    plans = [requests[index % len(requests)] for index in range(args.plans or len(requests))]
+
+    if args.target == "graph":
+        agent = PackingAgent()
+
+        async def send(index: int, trip: Dict[str, Any]) -> None:
+            await generate_itinerary(agent.graph, CreatePlanRequest(**trip, thread_id=f"benchmark-{index}"))
+
+        report = await drive(plans, args.concurrency, send)
+    else:
+        import httpx
+        from backend.main import app
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=None) as client:
+            async def send(index: int, trip: Dict[str, Any]) -> None:
+                response = await client.post("/plan/create", json=dict(trip, thread_id=f"benchmark-{index}"))
+                response.raise_for_status()
+
+            report = await drive(plans, args.concurrency, send)
+    await aclose_clients()
+
+    report.update({
+        "target": args.target,
+        "concurrency": args.concurrency,
+        "llm_latency": args.llm_latency,
+        "http_latency": args.http_latency,
+        "plan_cache": args.plan_cache,
+        "llm_cache": args.llm_cache,
+        "llm_calls": llm_seconds.stats()["count"],
+        "tool_calls": tool_seconds.stats()["count"],
+        "upstream_requests": sum(fixtures.requests.values()),
+        "rss_mb": round(current_rss_mb(), 1),
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    })
+    return report
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    latency, lag = report["latency_seconds"], report["loop_lag_ms"]
+    print(f"target {report['target']}, concurrency {report['concurrency']}, "
+          f"LLM latency {report['llm_latency']}s, HTTP latency {report['http_latency']}s, "
+          f"plan cache {'on' if report['plan_cache'] else 'off'}, LLM cache {'on' if report['llm_cache'] else 'off'}")
+    print(f"plans:              {report['plans']} ({report['errors']} errors) in {report['wall_seconds']}s")
+    print(f"throughput:         {report['throughput_plans_per_second']} plans/s")
+    print(f"latency:            p50 {latency['p50']}s, p95 {latency['p95']}s, p99 {latency['p99']}s, max {latency['max']}s")
+    print(f"event-loop lag:     p50 {lag['p50']}ms, p99 {lag['p99']}ms, max {lag['max']}ms")
+    print(f"calls:              {report['llm_calls']} LLM, {report['tool_calls']} tool, "
+          f"{report['upstream_requests']} upstream HTTP")
+    print(f"memory:             RSS {report['rss_mb']} MB, peak {report['peak_rss_mb']} MB")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target", choices=("graph", "app"), default="graph",
+                        help="Drive PackingAgent.graph directly or POST /plan/create on the FastAPI app.")
+    parser.add_argument("--requests", default=str(DEFAULT_REQUESTS), help="JSONL file of /plan/create bodies.")
+    parser.add_argument("--plans", type=int, default=0, help="Plans to run, cycling through the requests (default: one each).")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="Seconds each fake LLM call takes.")
+    parser.add_argument("--http-latency", type=float, default=0.05, help="Seconds each fixture HTTP response takes.")
+    parser.add_argument("--plan-cache", action="store_true", help="Enable the plan-level response cache.")
+    parser.add_argument("--llm-cache", action="store_true", help="Enable the LLM response cache of the LLM_CACHE_NODES.")
+    parser.add_argument("--json-out", help="Write the report to this JSON file, e.g. to keep a baseline.")
+    args = parser.parse_args()
+
+    # Configuration is read on import, so it has to be set before the backend is loaded.
+    os.environ.setdefault("TAVILY_API_KEY", "benchmark")
+    os.environ["PLAN_CACHE_ENABLED"] = "true" if args.plan_cache else "false"
+    if not args.llm_cache:
+        os.environ["LLM_CACHE_NODES"] = ""
+    for name in RATE_LIMITS:
+        os.environ.setdefault(name, "0")
+
+    report = asyncio.run(run(args))
+    print_report(report)
+    if args.json_out:
+        Path(args.json_out).write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
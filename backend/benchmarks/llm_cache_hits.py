@@ -0,0 +1,86 @@
+"""Benchmark of the LLM response cache on resubmitted plans.
+
+Runs every plan request once, then submits the same requests again --repeats times, like
+retries and duplicate submissions, with the plan cache off. Tool data is served from the
+recorded fixtures and the API caches, so the resubmitted plans send the agents and the
+synthesizer the same messages, which the LLM cache answers without a model call:
+
+    python -m backend.benchmarks.llm_cache_hits --repeats 2 --llm-latency 0.5
+"""
+
+import argparse
+import asyncio
+import os
+from typing import Any, Dict
+
+from backend.benchmarks.fakes import ScriptedChatModel
+from backend.benchmarks.harness import DEFAULT_REQUESTS, RATE_LIMITS, drive, load_requests
+
+
+async def run(args: argparse.Namespace) -> None:
+    from backend.batch import generate_itinerary
+    from backend.benchmarks.plan_create_load import install_fake_llm
+    from backend.benchmarks.upstreams import install_fixture_transport
+
+    install_fake_llm(args.llm_latency, ScriptedChatModel)
+    install_fixture_transport(args.http_latency)
+
+    from backend.agents.llm_cache import llm_cache_stats
+    from backend.agents.packing_agent import PackingAgent
+    from backend.api_clients.http_client import aclose_clients
+    from backend.cache import cache_stats
+    from backend.schemas import CreatePlanRequest
+    from backend.tracing import llm_seconds
+
+    requests = load_requests(args.requests)
+    agent = PackingAgent()
+
+    reports: Dict[str, Dict[str, Any]] = {}
+    for name, plans in (("first", requests), ("repeat", requests * args.repeats)):
+        llm_calls = llm_seconds.stats()["count"]
+        hits = cache_stats()["llm_responses"]["hits"]
+
+        async def send(index: int, trip: Dict[str, Any]) -> None:
+            await generate_itinerary(agent.graph, CreatePlanRequest(**trip, thread_id=f"{name}-{index}"))
+
+        report = await drive(plans, args.concurrency, send)
+        cache_hits = cache_stats()["llm_responses"]["hits"] - hits
+        report["model_calls_per_plan"] = (llm_seconds.stats()["count"] - llm_calls - cache_hits) / len(plans)
+        report["cache_hits_per_plan"] = cache_hits / len(plans)
+        reports[name] = report
+    await aclose_clients()
+
+    print(f"\n{len(requests)} requests, {args.repeats} resubmissions each, concurrency {args.concurrency}, "
+          f"LLM latency {args.llm_latency}s\n")
+    print(f"{'pass':<8}{'plans':>7}{'model calls/plan':>18}{'cache hits/plan':>17}{'p50':>9}{'p95':>9}{'errors':>8}")
+    for name, report in reports.items():
+        latency = report["latency_seconds"]
+        print(f"{name:<8}{report['plans']:>7}{report['model_calls_per_plan']:>18.2f}"
+              f"{report['cache_hits_per_plan']:>17.2f}{latency['p50']:>8.2f}s{latency['p95']:>8.2f}s"
+              f"{report['errors']:>8}")
+
+    print(f"\n{'node':<13}{'hits':>7}{'misses':>8}{'hit rate':>10}{'seconds saved':>15}")
+    for node, stats in llm_cache_stats().items():
+        print(f"{node:<13}{stats['hits']:>7}{stats['misses']:>8}{stats['hit_rate']:>10.1%}{stats['seconds_saved']:>15.2f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", default=str(DEFAULT_REQUESTS), help="JSONL file of /plan/create bodies.")
+    parser.add_argument("--repeats", type=int, default=2, help="Times every request is submitted again.")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--llm-latency", type=float, default=0.5, help="Seconds each fake LLM call takes.")
+    parser.add_argument("--http-latency", type=float, default=0.05, help="Seconds each fixture HTTP response takes.")
+    args = parser.parse_args()
+
+    # Configuration is read on import, so it has to be set before the backend is loaded.
+    os.environ.setdefault("TAVILY_API_KEY", "benchmark")
+    os.environ["PLAN_CACHE_ENABLED"] = "false"
+    os.environ.pop("LLM_CACHE_NODES", None)
+    for name in RATE_LIMITS:
+        os.environ.setdefault(name, "0")
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Benchmark of the bytes and approximate tokens each tool output saves after trimming.
+
+Compares the old indent=2 dump of the raw upstream response with the compact projection,
+using the recorded fixtures in backend/benchmarks/fixtures:
+
+    python -m backend.benchmarks.payload_size
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Callable
+
+from backend.api_clients.hotel_rental_api import format_hotel_offers
+from backend.api_clients.projections import (
+    compact_json,
+    summarize_flight_offers,
+    summarize_forecast,
+    summarize_places,
+)
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+# (tool, fixture, old output, new output)
+TOOLS: list[tuple[str, str, Callable[[Any], str], Callable[[Any], str]]] = [
+    ("get_weather", "openweather_forecast.json",
+     lambda data: json.dumps(data, indent=2), lambda data: compact_json(summarize_forecast(data))),
+    ("get_activities_of_city", "geoapify_places_catering.json",
+     lambda data: json.dumps(data, indent=2), lambda data: compact_json(summarize_places(data))),
+    ("get_accommodation_data", "geoapify_places_accommodation.json",
+     lambda data: json.dumps(data, indent=2), lambda data: compact_json(summarize_places(data))),
+    ("get_car_rental_data", "geoapify_places_rental_car.json",
+     lambda data: json.dumps(data, indent=2), lambda data: compact_json(summarize_places(data))),
+    ("get_flight_data_async", "amadeus_flight_offers.json",
+     lambda data: json.dumps(data, indent=2), lambda data: compact_json(summarize_flight_offers(data))),
+    ("get_hotel_data_async", "amadeus_hotel_offers.json",
+     lambda data: json.dumps({"hotels": format_hotel_offers(data)}, indent=2),
+     lambda data: compact_json({"hotels": format_hotel_offers(data)})),
+]
+
+
+def approx_tokens(text: str) -> int:
+    """Rough token estimate (about 4 characters per token for JSON-heavy text)."""
+    return len(text) // 4
+
+
+def load_fixture(name: str) -> Any:
+    return json.loads((FIXTURES / name).read_text(encoding="utf-8"))
+
+
+def main() -> None:
+    print(f"{'tool':<24}{'old bytes':>11}{'new bytes':>11}{'saved':>8}{'~tokens saved':>15}")
+    total_old = total_new = 0
+    for tool_name, fixture, old_output, new_output in TOOLS:
+        data = load_fixture(fixture)
+        old = old_output(data)
+        new = new_output(data)
+        old_bytes, new_bytes = len(old.encode()), len(new.encode())
+        total_old += old_bytes
+        total_new += new_bytes
+        print(f"{tool_name:<24}{old_bytes:>11}{new_bytes:>11}{1 - new_bytes / old_bytes:>8.0%}"
+              f"{approx_tokens(old) - approx_tokens(new):>15}")
+    print(f"{'total':<24}{total_old:>11}{total_new:>11}{1 - total_new / total_old:>8.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Benchmark of places lookups served by the local places index versus the live Geoapify API.
+
+Builds a temporary index from the recorded fixtures with the ingestion job, then times the
+activities, accommodation and car rental lookups against the index and against the
+fixture-backed "live" API, whose round trip is simulated with --http-latency:
+
+    python -m backend.benchmarks.places_index_latency --lookups 200 --http-latency 0.15
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+from typing import Awaitable, Callable, Dict, List
+
+CITIES = ["Paris, Ile-de-France, France", "Rome, Lazio, Italy", "Tokyo, Japan", "Austin, Texas, United States"]
+
+
+async def time_calls(call: Callable[[str], Awaitable[str]], lookups: int) -> List[float]:
+    durations = []
+    for index in range(lookups):
+        start = time.perf_counter()
+        await call(CITIES[index % len(CITIES)])
+        durations.append(time.perf_counter() - start)
+    return durations
+
+
+def summary(durations: List[float]) -> Dict[str, float]:
+    return {
+        "p50_ms": statistics.median(durations) * 1000,
+        "p95_ms": statistics.quantiles(durations, n=20)[-1] * 1000,
+    }
+
+
+async def run(args: argparse.Namespace) -> None:
+    from backend.benchmarks.upstreams import install_fixture_transport
+
+    fixtures = install_fixture_transport(args.http_latency)
+
+    from backend.api_clients import accommodation_api, car_rental_api, travel_search_api
+    from backend.api_clients.http_client import aclose_clients
+    from backend.cache import AsyncTTLCache
+    from backend.places_index import places_index
+    from backend.places_ingest import snapshot_cities
+
+    counts = await snapshot_cities(places_index, CITIES, concurrency=4)
+    print(f"Indexed {counts['ok']} cities with {places_index.stats()['places']} places "
+          f"using {sum(fixtures.requests.values())} fixture requests.")
+    # Warm the place id cache, so both sides only time the places lookup.
+    for city in CITIES:
+        await travel_search_api.get_place_id_of_city(city)
+
+    lookups: Dict[str, Callable[[str], Awaitable[str]]] = {
+        "activities": lambda city: travel_search_api.get_activities_of_city(True, True, True, city),
+        "accommodation": accommodation_api.get_accommodation_data,
+        "car rental": car_rental_api.get_car_rental_data,
+    }
+
+    local = {name: await time_calls(call, args.lookups) for name, call in lookups.items()}
+
+    # Live: no index, and an activities cache that never keeps an entry.
+    for module in (travel_search_api, accommodation_api, car_rental_api):
+        module.places_index = None
+    travel_search_api.activities_cache = AsyncTTLCache("benchmark_activities_uncached", maxsize=0, ttl=None)
+    requests_before = sum(fixtures.requests.values())
+    live = {name: await time_calls(call, args.lookups) for name, call in lookups.items()}
+    live_requests = sum(fixtures.requests.values()) - requests_before
+    await aclose_clients()
+
+    print(f"\n{args.lookups} lookups per function, simulated API latency {args.http_latency * 1000:.0f} ms\n")
+    print(f"{'lookup':<16}{'local p50':>12}{'local p95':>12}{'live p50':>12}{'live p95':>12}{'speedup':>10}")
+    for name in lookups:
+        local_stats, live_stats = summary(local[name]), summary(live[name])
+        print(f"{name:<16}{local_stats['p50_ms']:>10.3f}ms{local_stats['p95_ms']:>10.3f}ms"
+              f"{live_stats['p50_ms']:>10.1f}ms{live_stats['p95_ms']:>10.1f}ms"
+              f"{live_stats['p50_ms'] / local_stats['p50_ms']:>9.0f}x")
+    print(f"\nindex lookups: {places_index.stats()['hits']} hits; live lookups made {live_requests} API requests")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lookups", type=int, default=200, help="Lookups per function and side.")
+    parser.add_argument("--http-latency", type=float, default=0.15, help="Simulated Geoapify round trip in seconds.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        # Configuration is read on import, so the index has to be set before the backend is loaded.
+        os.environ["PLACES_INDEX_DB"] = os.path.join(directory, "places.sqlite")
+        os.environ.setdefault("GEOAPIFY_RATE_LIMIT", "0")
+        asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Benchmark of the plan-level cache on a stream of near-identical /plan/create requests.
+
+Requests vary the destination spelling, shift the start date within the week and move the
+budget by a few percent, like users planning the same trip. The fake LLM makes every agent
+call cost --llm-latency seconds, so cache hits show up as skipped agent latency.
+
+    python -m backend.benchmarks.plan_cache_hits --plans 50
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import time
+from datetime import date, timedelta
+
+os.environ["PLAN_CACHE_ENABLED"] = "true"
+
+from backend.benchmarks.plan_create_load import PLAN_REQUEST, install_fake_llm  # noqa: E402
+
+DESTINATIONS = ["Paris", "paris", "Paris, France", " PARIS ,france"]
+
+
+def similar_request(rng: random.Random) -> dict:
+    """A request for the same trip as PLAN_REQUEST with small variations."""
+    start = date.fromisoformat(PLAN_REQUEST["start_date"]) + timedelta(days=rng.randint(0, 2))
+    return dict(
+        PLAN_REQUEST,
+        destination=rng.choice(DESTINATIONS),
+        start_date=start.isoformat(),
+        end_date=(start + timedelta(days=7)).isoformat(),
+        budget=int(PLAN_REQUEST["budget"] * rng.uniform(0.97, 1.03)),
+    )
+
+
+async def run(plans: int, seed: int) -> None:
+    from backend.agents.packing_agent import PackingAgent
+    from backend.api_clients.travel_search_api import place_id_cache
+    from backend.cache import cache_stats, normalize_text
+
+    # Geocoding is what makes the spellings equivalent; seed it instead of calling Geoapify.
+    for city in DESTINATIONS + [PLAN_REQUEST["origin_city"]]:
+        place_id_cache.set(normalize_text(city), f"place-{normalize_text(city).split(',')[0]}")
+
+    agent = PackingAgent()
+    rng = random.Random(seed)
+    latencies = []
+    for index in range(plans):
+        state = dict(similar_request(rng), initial_plan_complete=False, messages=[])
+        start = time.perf_counter()
+        await agent.graph.ainvoke(state, config={"configurable": {"thread_id": f"plan-{index}"}})
+        latencies.append(time.perf_counter() - start)
+
+    print(f"first plan latency:        {latencies[0]:.2f}s")
+    print(f"mean latency of the rest:  {sum(latencies[1:]) / max(len(latencies) - 1, 1):.2f}s")
+    for name, stats in cache_stats().items():
+        if name.startswith("plan_"):
+            print(f"{name:<26} hit rate {stats['hit_rate']:.0%} ({stats['misses']} misses, size {stats['size']})")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--plans", type=int, default=50)
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="Seconds each fake LLM call takes.")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    install_fake_llm(args.llm_latency)
+    asyncio.run(run(args.plans, args.seed))
+
+
+if __name__ == "__main__":
+    main()
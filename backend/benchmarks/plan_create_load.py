@@ -0,0 +1,89 @@
+"""Load benchmark showing whether concurrent /plan/create requests overlap or serialize.
+
+Every Gemini model is replaced with a FakeChatModel, so no API keys or network are needed:
+
+    python -m backend.benchmarks.plan_create_load --concurrency 20 --llm-latency 0.2
+"""
+
+import argparse
+import asyncio
+import os
+import time
+from typing import Any, Type
+
+import httpx
+
+from backend.benchmarks.fakes import FakeChatModel
+
+os.environ.setdefault("TAVILY_API_KEY", "benchmark")
+# Measure the full pipeline; plan_cache_hits.py and llm_cache_hits.py cover the caches.
+os.environ.setdefault("PLAN_CACHE_ENABLED", "false")
+os.environ.setdefault("LLM_CACHE_NODES", "")
+# Direct mode fetches upstream data in code, which the fake model cannot stand in for.
+os.environ.setdefault("AGENT_FETCH_MODE", "react")
+
+PLAN_REQUEST = {
+    "origin_city": "New York",
+    "destination": "Paris",
+    "start_date": "2025-10-15",
+    "end_date": "2025-10-22",
+    "adults": 2,
+    "budget": 4000,
+    "foodie": True,
+    "entertainment": False,
+    "business": False,
+}
+
+
+def install_fake_llm(latency: float, model_class: Type[FakeChatModel] = FakeChatModel) -> None:
+    """Swap the Gemini chat model for a FakeChatModel (or a subclass) in every agent module.
+
+    The fake keeps the response cache the agent passes, so cached nodes behave as with Gemini.
+    """
+    from backend.agents import budget_agent, packing_agent, suggestion_agent, weather_agent
+
+    def fake_llm(*_args: Any, cache: Any = None, **_kwargs: Any) -> FakeChatModel:
+        return model_class(latency=latency, cache=cache)
+
+    for module in (packing_agent, weather_agent, suggestion_agent, budget_agent):
+        module.GovernedChatGoogleGenerativeAI = fake_llm
+
+
+async def create_plan(client: httpx.AsyncClient) -> float:
+    """Send one /plan/create request and return its latency in seconds."""
+    start = time.perf_counter()
+    response = await client.post("/plan/create", json=PLAN_REQUEST)
+    response.raise_for_status()
+    return time.perf_counter() - start
+
+
+async def run(concurrency: int) -> None:
+    from backend.main import app
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=None) as client:
+        single = await create_plan(client)
+
+        start = time.perf_counter()
+        latencies = await asyncio.gather(*(create_plan(client) for _ in range(concurrency)))
+        wall = time.perf_counter() - start
+
+    serialized = single * concurrency
+    print(f"single request latency:       {single:.2f}s")
+    print(f"{concurrency} concurrent requests wall: {wall:.2f}s (max request {max(latencies):.2f}s)")
+    print(f"fully serialized would take:  {serialized:.2f}s")
+    print(f"overlap factor:               {serialized / wall:.1f}x (1.0x means requests serialize)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="Seconds each fake LLM call takes.")
+    args = parser.parse_args()
+
+    install_fake_llm(args.llm_latency)
+    asyncio.run(run(args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Regression benchmark: the synthesizer prompt and process RSS must stay flat across plans.
+
+Runs N plans through one PackingAgent (like the singleton in backend/main.py) with a fake LLM,
+deleting each plan's thread from the checkpointer afterwards, so only state the agent itself
+keeps can grow. RSS is sampled after --warmup plans, once imports, pools and caches are filled,
+and the run fails if it grows by more than --rss-tolerance-mb afterwards:
+
+    python -m backend.benchmarks.prompt_growth --plans 200 --rss-tolerance-mb 5
+"""
+
+import argparse
+import asyncio
+import resource
+import sys
+from typing import cast
+
+from backend.benchmarks.fakes import FakeChatModel
+from backend.benchmarks.plan_create_load import PLAN_REQUEST, install_fake_llm
+
+
+def current_rss_mb() -> float:
+    """Current resident set size in MB (peak RSS where /proc is unavailable)."""
+    try:
+        with open("/proc/self/statm") as statm:
+            pages = int(statm.read().split()[1])
+        return pages * resource.getpagesize() / 1024 / 1024
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+async def run(plans: int, report_every: int, warmup: int, rss_tolerance_mb: float) -> bool:
+    from langchain_core.runnables import RunnableConfig
+
+    from backend.agents.packing_agent import PackingAgent
+
+    agent = PackingAgent()
+    synthesis_llm = cast(FakeChatModel, agent.synthesis_llm)
+    prompt_sizes = []
+    baseline_rss = current_rss_mb()
+    for index in range(1, plans + 1):
+        thread_id = f"plan-{index}"
+        config: RunnableConfig = {"configurable": {"thread_id": thread_id}}
+        state = dict(PLAN_REQUEST, initial_plan_complete=False, messages=[])
+        await agent.graph.ainvoke(state, config=config)
+        await agent.memory.adelete_thread(thread_id)
+        prompt_sizes.append(synthesis_llm.last_prompt_chars)
+        if index == warmup:
+            baseline_rss = current_rss_mb()
+        if index == 1 or index % report_every == 0:
+            print(f"plan {index:>5}: synthesizer prompt {prompt_sizes[-1]:>7} chars, "
+                  f"agent system prompt {len(agent.system_prompt):>6} chars, RSS {current_rss_mb():.1f} MB")
+
+    flat = max(prompt_sizes) == min(prompt_sizes)
+    print("prompt size is flat" if flat else "prompt size GREW across plans")
+    growth = current_rss_mb() - baseline_rss
+    rss_flat = growth <= rss_tolerance_mb
+    print(f"RSS grew {growth:.1f} MB after plan {warmup} (tolerance {rss_tolerance_mb:.1f} MB): "
+          f"{'flat' if rss_flat else 'GREW'}")
+    return flat and rss_flat
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--plans", type=int, default=200)
+    parser.add_argument("--report-every", type=int, default=50)
+    parser.add_argument("--warmup", type=int, default=20, help="Plans run before the RSS baseline is taken.")
+    parser.add_argument("--rss-tolerance-mb", type=float, default=5.0,
+                        help="RSS growth after the warm-up that still counts as flat.")
+    args = parser.parse_args()
+    if args.plans <= args.warmup:
+        parser.error("--plans must be larger than --warmup")
+
+    install_fake_llm(latency=0)
+    flat = asyncio.run(run(args.plans, args.report_every, args.warmup, args.rss_tolerance_mb))
+    sys.exit(0 if flat else 1)
+
+
+if __name__ == "__main__":
+    main()
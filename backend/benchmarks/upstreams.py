@@ -0,0 +1,125 @@
+"""Replay of the recorded upstream fixtures through a local httpx transport.
+
+Every request the API clients send to Geoapify, OpenWeather or Amadeus is answered from
+backend/benchmarks/fixtures after a fixed latency, so benchmarks exercise the real clients,
+caches, governor and projections without network access.
+"""
+
+import asyncio
+import json
+from collections import Counter
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+# Geoapify category prefix -> places fixture recorded for it.
+PLACES_FIXTURES = {
+    "catering": "geoapify_places_catering.json",
+    "leisure": "geoapify_places_leisure.json",
+    "natural": "geoapify_places_leisure.json",
+    "tourism": "geoapify_places_leisure.json",
+    "heritage": "geoapify_places_leisure.json",
+    "beach": "geoapify_places_leisure.json",
+    "entertainment": "geoapify_places_entertainment.json",
+    "accommodation": "geoapify_places_accommodation.json",
+    "rental": "geoapify_places_rental_car.json",
+}
+
+# (host, path) -> fixture for every other upstream endpoint.
+ROUTES = {
+    ("api.geoapify.com", "/v1/geocode/search"): "geoapify_geocode.json",
+    ("api.openweathermap.org", "/data/2.5/forecast"): "openweather_forecast.json",
+    ("test.api.amadeus.com", "/v1/security/oauth2/token"): "amadeus_token.json",
+    ("test.api.amadeus.com", "/v2/shopping/flight-offers"): "amadeus_flight_offers.json",
+    ("test.api.amadeus.com", "/v1/reference-data/locations/hotels/by-city"): "amadeus_hotels_by_city.json",
+    ("test.api.amadeus.com", "/v3/shopping/hotel-offers"): "amadeus_hotel_offers.json",
+}
+
+
+@lru_cache(maxsize=None)
+def _fixture_bytes(name: str) -> bytes:
+    return (FIXTURES / name).read_bytes()
+
+
+def _places(categories: str) -> bytes:
+    """Features of every category fixture requested, in request order and without duplicates."""
+    names: List[str] = []
+    for category in categories.split(","):
+        name = PLACES_FIXTURES.get(category.split(".")[0])
+        if name and name not in names:
+            names.append(name)
+    if len(names) == 1:
+        return _fixture_bytes(names[0])
+
+    features: List[Dict[str, Any]] = []
+    seen = set()
+    for name in names:
+        for feature in json.loads(_fixture_bytes(name))["features"]:
+            place_id = feature.get("properties", {}).get("place_id")
+            if place_id not in seen:
+                seen.add(place_id)
+                features.append(feature)
+    return json.dumps({"type": "FeatureCollection", "features": features}).encode()
+
+
+def _hotel_offers(hotel_ids: str) -> bytes:
+    """Offers of the requested hotels only, like Amadeus answers each chunk of ids."""
+    wanted = set(hotel_ids.split(","))
+    offers = json.loads(_fixture_bytes(ROUTES[("test.api.amadeus.com", "/v3/shopping/hotel-offers")]))
+    offers["data"] = [offer for offer in offers.get("data", []) if offer.get("hotel", {}).get("hotelId") in wanted]
+    return json.dumps(offers).encode()
+
+
+def _city_location(keyword: str) -> bytes:
+    """City search answer built from the keyword, since codes only need to be stable per city."""
+    code = keyword.replace(" ", "")[:3].upper()
+    return json.dumps({"data": [{"type": "location", "subType": "CITY", "name": keyword, "iataCode": code}]}).encode()
+
+
+class FixtureTransport(httpx.AsyncBaseTransport):
+    """Answers upstream requests from the recorded fixtures after a fixed latency."""
+
+    def __init__(self, latency: float = 0.05):
+        self.latency = latency
+        self.requests: Counter = Counter()
+
+    def _body(self, request: httpx.Request) -> Optional[bytes]:
+        if request.url.host == "api.geoapify.com" and request.url.path == "/v2/places":
+            return _places(request.url.params.get("categories", ""))
+        if request.url.path == "/v3/shopping/hotel-offers":
+            return _hotel_offers(request.url.params.get("hotelIds", ""))
+        if request.url.path == "/v1/reference-data/locations":
+            return _city_location(request.url.params.get("keyword", ""))
+        name = ROUTES.get((request.url.host, request.url.path))
+        return _fixture_bytes(name) if name else None
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(self.latency)
+        self.requests[f"{request.url.host}{request.url.path}"] += 1
+        body = self._body(request)
+        if body is None:
+            return httpx.Response(404, json={"error": f"No fixture for {request.url.path}"}, request=request)
+        return httpx.Response(200, content=body, headers={"Content-Type": "application/json"}, request=request)
+
+
+def install_fixture_transport(latency: float) -> FixtureTransport:
+    """Make every pooled API client send its requests to a FixtureTransport.
+
+    The governed transport stays in front of it, so rate limits, retries and HTTP spans
+    behave as in production.
+    """
+    from backend.api_clients import http_client
+    from backend.api_clients.governor import GovernedTransport
+    from backend.config import HTTP_TIMEOUT
+
+    fixtures = FixtureTransport(latency)
+
+    def new_client() -> httpx.AsyncClient:
+        return httpx.AsyncClient(transport=GovernedTransport(fixtures), timeout=HTTP_TIMEOUT)
+
+    http_client._new_client = new_client
+    return fixtures
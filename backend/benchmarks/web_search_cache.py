@@ -0,0 +1,83 @@
+"""Benchmark of the shared web search cache on the queries agents issue across many plans.
+
+Replays weather, activity and taxi-fare searches for the destinations of the plan requests,
+with varied wording, against the offline stub backend and reports the hit rate, upstream
+searches saved and how much trimming shrinks each result:
+
+    python -m backend.benchmarks.web_search_cache --plans 500 --concurrency 20
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+from typing import List
+
+from backend.benchmarks.harness import DEFAULT_REQUESTS, load_requests
+
+# Wordings of the same searches, as different agent runs phrase them.
+QUERY_TEMPLATES = (
+    ("weather {city} {month}", "Weather in {city} in {month}", "What is the weather in {city} in {month}?"),
+    ("best restaurants in {city}", "Best Restaurants {city}", "the best restaurants in {city}"),
+    ("average taxi and uber price in {city}", "Average taxi, Uber price {city}"),
+)
+
+
+def plan_queries(plans: int) -> List[str]:
+    """Queries of the agents for the plans, cycling through the requests and wordings."""
+    from datetime import date
+
+    requests = load_requests(str(DEFAULT_REQUESTS))
+    queries = []
+    for index in range(plans):
+        trip = requests[index % len(requests)]
+        city = trip["destination"]
+        month = date.fromisoformat(trip["start_date"]).strftime("%B")
+        for templates in QUERY_TEMPLATES:
+            queries.append(templates[index % len(templates)].format(city=city, month=month))
+    return queries
+
+
+async def run(args: argparse.Namespace) -> None:
+    from backend.agents.web_search import get_web_search, stub_search, web_search_cache
+
+    search = get_web_search()
+    queries = plan_queries(args.plans)
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def one(query: str) -> None:
+        async with semaphore:
+            await search.ainvoke({"query": query})
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(query) for query in queries))
+    wall = time.perf_counter() - start
+
+    stats = web_search_cache.stats()
+    raw = json.dumps(await stub_search(queries[0], latency=0))
+    trimmed = json.dumps(await search.ainvoke({"query": queries[0]}))
+    print(f"{len(queries)} searches for {args.plans} plans in {wall:.2f}s "
+          f"(stub latency {args.latency * 1000:.0f} ms, concurrency {args.concurrency})")
+    print(f"upstream searches:  {stats['misses']} ({len(queries) - stats['misses']} saved)")
+    print(f"cache:              {stats['hits']} hits, {stats['coalesced']} coalesced, "
+          f"hit rate {stats['hit_rate']:.1%}, {stats['size']} entries")
+    print(f"result size:        {len(raw)} bytes raw -> {len(trimmed)} bytes trimmed "
+          f"({1 - len(trimmed) / len(raw):.0%} smaller)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--plans", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.3, help="Seconds each stub search takes.")
+    args = parser.parse_args()
+
+    # Configuration is read on import, so it has to be set before the backend is loaded.
+    os.environ["WEB_SEARCH_BACKEND"] = "stub"
+    os.environ["WEB_SEARCH_STUB_LATENCY"] = str(args.latency)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,258 @@
+"""In-memory LRU caches with TTL, single-flight loading and optional SQLite persistence."""
+
+import asyncio
+import concurrent.futures
+import json
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Set, Tuple
+
+from backend.metrics import gauge
+
+_caches: Dict[str, "AsyncTTLCache"] = {}
+
+
+def normalize_text(text: str) -> str:
+    """Normalize free text such as a city for cache keys, e.g. " Paris ,France" -> "paris, france"."""
+    return re.sub(r"\s*,\s*", ", ", " ".join(text.lower().split())).strip(", ")
+
+
+class SQLiteCacheStore:
+    """Persistent key/value tier for a cache, stored as JSON in a SQLite file."""
+    def __init__(self, path: str, namespace: str):
+        self.namespace = namespace
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS cache_entries ("
+                "namespace TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, expires_at REAL, "
+                "PRIMARY KEY (namespace, key))"
+            )
+
+    def get(self, key: str, grace: float = 0.0) -> Optional[Tuple[Any, Optional[float]]]:
+        """Get the (value, expires_at) stored for the key, if it expired less than grace seconds ago."""
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT value, expires_at FROM cache_entries WHERE namespace = ? AND key = ?",
+                (self.namespace, key)
+            ).fetchone()
+        if row is None:
+            return None
+        value, expires_at = row
+        if expires_at is not None and expires_at + grace <= time.time():
+            return None
+        return json.loads(value), expires_at
+
+    def set(self, key: str, value: Any, expires_at: Optional[float]) -> None:
+        """Store a JSON-serializable value for the key."""
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO cache_entries (namespace, key, value, expires_at) VALUES (?, ?, ?, ?)",
+                (self.namespace, key, json.dumps(value), expires_at)
+            )
+
+
+class AsyncTTLCache:
+    """Bounded LRU cache whose entries expire after a TTL.
+
+    Concurrent loads of the same key share a single call to the loader (single-flight), also
+    across the event loops of different threads, and hits, misses and coalesced loads are
+    counted for metrics. With
+    stale_ttl, expired entries are still served for that long while one background refresh
+    replaces them (stale-while-revalidate).
+    """
+    def __init__(self, name: str, maxsize: int, ttl: Optional[float], store: Optional[SQLiteCacheStore] = None,
+                 align_ttl: bool = False, stale_ttl: float = 0.0):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.store = store
+        self.align_ttl = align_ttl
+        self.stale_ttl = stale_ttl
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[str, Tuple[Any, Optional[float]]]" = OrderedDict()
+        # Thread-safe futures, so callers on any event loop can wait for a load started on another.
+        self._in_flight: Dict[str, concurrent.futures.Future] = {}
+        self._refresh_tasks: Set[asyncio.Task] = set()
+        self._lock = threading.Lock()
+        _caches[name] = self
+
+    def _expires_at(self) -> Optional[float]:
+        if self.ttl is None:
+            return None
+        now = time.time()
+        if self.align_ttl:
+            # Expire at the end of the current TTL-sized slot, e.g. the next 3-hour boundary.
+            return (now // self.ttl + 1) * self.ttl
+        return now + self.ttl
+
+    def _lookup(self, key: str) -> Optional[Tuple[Any, Optional[float]]]:
+        """Get the (value, expires_at) entry for the key, including stale entries still within stale_ttl."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at = entry[1]
+                if expires_at is None or expires_at + self.stale_ttl > time.time():
+                    self._entries.move_to_end(key)
+                    return entry
+                del self._entries[key]
+
+        if self.store is not None:
+            stored = self.store.get(key, grace=self.stale_ttl)
+            if stored is not None:
+                self._remember(key, *stored)
+                return stored
+        return None
+
+    def get(self, key: str, count: bool = False) -> Optional[Any]:
+        """Get a fresh cached value (memory first, then the persistent store) or None.
+
+        Args:
+            key (str): Normalized cache key.
+            count (bool): Count the lookup as a hit or miss in the stats, for callers that
+                load missing values themselves instead of using get_or_load.
+        """
+        entry = self._lookup(key)
+        value = None
+        if entry is not None and (entry[1] is None or entry[1] > time.time()):
+            value = entry[0]
+        if count:
+            with self._lock:
+                if value is None:
+                    self.misses += 1
+                else:
+                    self.hits += 1
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        """Cache a value in memory and in the persistent store, if any."""
+        expires_at = self._expires_at()
+        self._remember(key, value, expires_at)
+        if self.store is not None:
+            self.store.set(key, value, expires_at)
+
+    def _remember(self, key: str, value: Any, expires_at: Optional[float]) -> None:
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    async def get_or_load(self, key: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """Get the cached value for the key or load it once, sharing the load with concurrent callers.
+
+        Args:
+            key (str): Normalized cache key.
+            loader: Coroutine function fetching the value on a miss; None results are not cached.
+
+        Returns:
+            The cached or freshly loaded value.
+        """
+        entry = self._lookup(key)
+        if entry is not None:
+            value, expires_at = entry
+            if expires_at is None or expires_at > time.time():
+                with self._lock:
+                    self.hits += 1
+                return value
+            with self._lock:
+                self.stale_hits += 1
+            self._refresh_in_background(key, loader)
+            return value
+
+        future, leader = self._claim(key)
+        if not leader:
+            with self._lock:
+                self.coalesced += 1
+            return await asyncio.shield(asyncio.wrap_future(future))
+
+        with self._lock:
+            self.misses += 1
+        return await self._load(key, loader, future)
+
+    def _claim(self, key: str) -> Tuple[concurrent.futures.Future, bool]:
+        """Get the in-flight load of the key, or register a new one; True if the caller has to load it."""
+        with self._lock:
+            future = self._in_flight.get(key)
+            if future is not None:
+                return future, False
+            future = self._in_flight[key] = concurrent.futures.Future()
+            return future, True
+
+    def _refresh_in_background(self, key: str, loader: Callable[[], Awaitable[Any]]) -> None:
+        future, leader = self._claim(key)
+        if not leader:
+            return
+        task = asyncio.create_task(self._load(key, loader, future))
+        self._refresh_tasks.add(task)
+        task.add_done_callback(self._refresh_done)
+
+    def _refresh_done(self, task: asyncio.Task) -> None:
+        self._refresh_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            print(f"Error refreshing {self.name} cache: {task.exception()}")
+
+    async def _load(self, key: str, loader: Callable[[], Awaitable[Any]], future: concurrent.futures.Future) -> Any:
+        try:
+            value = await loader()
+            if value is not None:
+                self.set(key, value)
+            future.set_result(value)
+            return value
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+
+    def clear(self) -> None:
+        """Drop every in-memory entry; the persistent store, if any, is kept."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters, LRU evictions and current size of the cache."""
+        with self._lock:
+            served_from_cache = self.hits + self.stale_hits + self.coalesced
+            lookups = served_from_cache + self.misses
+            return {
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "evictions": self.evictions,
+                "hit_rate": served_from_cache / lookups if lookups else 0.0,
+                "size": len(self._entries),
+            }
+
+
+def cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Statistics of every cache created in this process, keyed by cache name."""
+    return {name: cache.stats() for name, cache in _caches.items()}
+
+
+def clear_caches() -> None:
+    """Drop the in-memory entries of every cache, e.g. between benchmark runs."""
+    for cache in list(_caches.values()):
+        cache.clear()
+
+
+gauge("cache_hit_ratio", "Share of cache lookups served from the cache.",
+      lambda: [({"cache": name}, stats["hit_rate"]) for name, stats in cache_stats().items()])
+gauge("cache_entries", "Entries held in memory by each cache.",
+      lambda: [({"cache": name}, stats["size"]) for name, stats in cache_stats().items()])
+gauge("cache_evictions", "Entries evicted by each cache to stay within its size.",
+      lambda: [({"cache": name}, stats["evictions"]) for name, stats in cache_stats().items()])
@@ -0,0 +1,165 @@
+"""Load runtime configuration from .env file."""
+
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+def _get_bool(name: str, default: bool) -> bool:
+    """Read a boolean flag such as "true"/"false" or "1"/"0" from the environment."""
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+# Phase 1 topology: "serial" chains weather -> suggestion -> budget, "parallel" starts the
+# weather agent, the suggestion agent's places fetch and the budget agent at once, and only the
+# suggestion LLM call waits for the weather text.
+PHASE1_TOPOLOGY = os.getenv("PHASE1_TOPOLOGY", "serial").lower()
+
+# Shared HTTP connection pools used by the API clients (one pool per upstream host).
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "20"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))
+HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "5"))
+HTTP2_ENABLED = _get_bool("HTTP2_ENABLED", True)
+
+# Size of the bounded thread pool used for work that has to stay synchronous
+# (sync-only tools and graph nodes run with run_in_executor).
+SYNC_WORKER_THREADS = int(os.getenv("SYNC_WORKER_THREADS", "16"))
+
+# Geocoding cache for Geoapify place ids; GEOCODE_CACHE_DB enables a persistent SQLite tier.
+GEOCODE_CACHE_SIZE = int(os.getenv("GEOCODE_CACHE_SIZE", "2048"))
+GEOCODE_CACHE_TTL = float(os.getenv("GEOCODE_CACHE_TTL", str(30 * 24 * 3600)))
+GEOCODE_CACHE_DB = os.getenv("GEOCODE_CACHE_DB", "")
+
+# Geoapify places results per (place id, purpose categories); ACTIVITIES_CACHE_DB enables a persistent
+# SQLite tier. Points of interest change slowly, so entries live for a week by default.
+ACTIVITIES_CACHE_SIZE = int(os.getenv("ACTIVITIES_CACHE_SIZE", "1024"))
+ACTIVITIES_CACHE_TTL = float(os.getenv("ACTIVITIES_CACHE_TTL", str(7 * 24 * 3600)))
+ACTIVITIES_CACHE_DB = os.getenv("ACTIVITIES_CACHE_DB", "")
+
+# Local places index built by python -m backend.places_ingest: when PLACES_INDEX_DB is set, the
+# places clients query it first and fall back to Geoapify for cities missing from it or whose
+# snapshot is older than PLACES_INDEX_MAX_AGE seconds. PLACES_INDEX_LIMIT places are
+# snapshotted per category group.
+PLACES_INDEX_DB = os.getenv("PLACES_INDEX_DB", "")
+PLACES_INDEX_MAX_AGE = float(os.getenv("PLACES_INDEX_MAX_AGE", str(30 * 24 * 3600)))
+PLACES_INDEX_LIMIT = int(os.getenv("PLACES_INDEX_LIMIT", "50"))
+
+# OpenWeather forecast cache: entries expire at the end of each forecast slot (3 hours by
+# default) and are served stale for WEATHER_CACHE_STALE_TTL seconds while a refresh runs.
+WEATHER_CACHE_SIZE = int(os.getenv("WEATHER_CACHE_SIZE", "1024"))
+WEATHER_CACHE_TTL = float(os.getenv("WEATHER_CACHE_TTL", str(3 * 3600)))
+WEATHER_CACHE_STALE_TTL = float(os.getenv("WEATHER_CACHE_STALE_TTL", "900"))
+
+# Refresh the Amadeus OAuth2 token this many seconds before it expires.
+AMADEUS_TOKEN_REFRESH_MARGIN = float(os.getenv("AMADEUS_TOKEN_REFRESH_MARGIN", "60"))
+
+# Amadeus hotel search: the hotel ids of a city are cached for HOTEL_IDS_CACHE_TTL seconds
+# (HOTEL_IDS_CACHE_DB enables a persistent SQLite tier), offers for up to HOTEL_SEARCH_LIMIT
+# hotels are fetched concurrently in chunks of HOTEL_OFFERS_CHUNK_SIZE ids and the
+# HOTEL_RESULTS_LIMIT cheapest hotels are returned.
+HOTEL_IDS_CACHE_SIZE = int(os.getenv("HOTEL_IDS_CACHE_SIZE", "512"))
+HOTEL_IDS_CACHE_TTL = float(os.getenv("HOTEL_IDS_CACHE_TTL", str(7 * 24 * 3600)))
+HOTEL_IDS_CACHE_DB = os.getenv("HOTEL_IDS_CACHE_DB", "")
+HOTEL_SEARCH_LIMIT = int(os.getenv("HOTEL_SEARCH_LIMIT", "30"))
+HOTEL_OFFERS_CHUNK_SIZE = int(os.getenv("HOTEL_OFFERS_CHUNK_SIZE", "10"))
+HOTEL_RESULTS_LIMIT = int(os.getenv("HOTEL_RESULTS_LIMIT", "10"))
+
+# Checkpointer for graph state: "memory" keeps threads in this process only, "sqlite" stores
+# them in CHECKPOINT_DB so several workers can share threads. Threads idle for CHECKPOINT_TTL
+# seconds are evicted and only the newest CHECKPOINT_HISTORY_LIMIT checkpoints per thread are kept.
+CHECKPOINTER = os.getenv("CHECKPOINTER", "memory").lower()
+CHECKPOINT_DB = os.getenv("CHECKPOINT_DB", "checkpoints.sqlite")
+CHECKPOINT_TTL = float(os.getenv("CHECKPOINT_TTL", str(7 * 24 * 3600)))
+CHECKPOINT_HISTORY_LIMIT = int(os.getenv("CHECKPOINT_HISTORY_LIMIT", "10"))
+
+# Context policy of the Phase 2 supervisor: only the last SUPERVISOR_MAX_TURNS user turns are
+# sent verbatim, older turns are folded into a rolling summary (once at least
+# SUPERVISOR_SUMMARY_BATCH messages have left the window) and the window is shrunk further
+# when it exceeds SUPERVISOR_TOKEN_BUDGET estimated tokens. Tool outputs of earlier turns are
+# cut to SUPERVISOR_TOOL_OUTPUT_CHARS characters.
+SUPERVISOR_MAX_TURNS = int(os.getenv("SUPERVISOR_MAX_TURNS", "6"))
+SUPERVISOR_TOKEN_BUDGET = int(os.getenv("SUPERVISOR_TOKEN_BUDGET", "12000"))
+SUPERVISOR_SUMMARY_ENABLED = _get_bool("SUPERVISOR_SUMMARY_ENABLED", True)
+SUPERVISOR_SUMMARY_BATCH = int(os.getenv("SUPERVISOR_SUMMARY_BATCH", "4"))
+SUPERVISOR_TOOL_OUTPUT_CHARS = int(os.getenv("SUPERVISOR_TOOL_OUTPUT_CHARS", "1500"))
+
+# Plan-level cache of the Phase 1 agent responses, keyed on the normalized plan request
+# (geocoded destination, dates bucketed to PLAN_CACHE_DATE_BUCKET_DAYS days and budget bucketed
+# to steps of PLAN_CACHE_BUDGET_STEP, e.g. 0.1 for 10%). Each response has its own TTL and
+# PLAN_CACHE_DB enables a persistent SQLite tier.
+PLAN_CACHE_ENABLED = _get_bool("PLAN_CACHE_ENABLED", True)
+PLAN_CACHE_SIZE = int(os.getenv("PLAN_CACHE_SIZE", "512"))
+PLAN_CACHE_DB = os.getenv("PLAN_CACHE_DB", "")
+PLAN_CACHE_DATE_BUCKET_DAYS = int(os.getenv("PLAN_CACHE_DATE_BUCKET_DAYS", "7"))
+PLAN_CACHE_BUDGET_STEP = float(os.getenv("PLAN_CACHE_BUDGET_STEP", "0.1"))
+PLAN_CACHE_WEATHER_TTL = float(os.getenv("PLAN_CACHE_WEATHER_TTL", str(3 * 3600)))
+PLAN_CACHE_SUGGESTION_TTL = float(os.getenv("PLAN_CACHE_SUGGESTION_TTL", str(24 * 3600)))
+PLAN_CACHE_BUDGET_TTL = float(os.getenv("PLAN_CACHE_BUDGET_TTL", str(3600)))
+
+# Batch plan generation (/plan/batch and python -m backend.batch): plans generated at once.
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "4"))
+BATCH_MAX_CONCURRENCY = int(os.getenv("BATCH_MAX_CONCURRENCY", "16"))
+
+# Web search tool shared by every agent: WEB_SEARCH_BACKEND is "tavily" or "stub" (offline
+# canned results after WEB_SEARCH_STUB_LATENCY seconds). Results are cached per normalized query
+# for WEB_SEARCH_CACHE_TTL seconds (WEB_SEARCH_CACHE_DB enables a persistent SQLite tier) and
+# trimmed to WEB_SEARCH_MAX_RESULTS results of at most WEB_SEARCH_CONTENT_CHARS characters.
+WEB_SEARCH_BACKEND = os.getenv("WEB_SEARCH_BACKEND", "tavily").lower()
+WEB_SEARCH_CACHE_SIZE = int(os.getenv("WEB_SEARCH_CACHE_SIZE", "2048"))
+WEB_SEARCH_CACHE_TTL = float(os.getenv("WEB_SEARCH_CACHE_TTL", str(6 * 3600)))
+WEB_SEARCH_CACHE_DB = os.getenv("WEB_SEARCH_CACHE_DB", "")
+WEB_SEARCH_MAX_RESULTS = int(os.getenv("WEB_SEARCH_MAX_RESULTS", "5"))
+WEB_SEARCH_CONTENT_CHARS = int(os.getenv("WEB_SEARCH_CONTENT_CHARS", "600"))
+WEB_SEARCH_STUB_LATENCY = float(os.getenv("WEB_SEARCH_STUB_LATENCY", "0.2"))
+
+# Response cache of Gemini calls keyed on model, temperature and a hash of the messages, for the
+# nodes listed in LLM_CACHE_NODES (weather, suggestion, budget, synthesizer; the supervisor is
+# never cached). Entries live LLM_CACHE_TTL seconds; LLM_CACHE_DB enables a persistent SQLite tier.
+LLM_CACHE_NODES = frozenset(
+    node.strip() for node in os.getenv("LLM_CACHE_NODES", "weather,suggestion,budget,synthesizer").split(",")
+    if node.strip() and node.strip() != "supervisor"
+)
+LLM_CACHE_SIZE = int(os.getenv("LLM_CACHE_SIZE", "1024"))
+LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", str(24 * 3600)))
+LLM_CACHE_DB = os.getenv("LLM_CACHE_DB", "")
+
+# How the weather, suggestion and budget agents get their data: "direct" fetches the data their
+# prompts always ask for first in code, concurrently, and makes one LLM call (falling back to the
+# ReAct loop when required data is missing); "react", the default, always runs the tool-calling loop.
+AGENT_FETCH_MODE = os.getenv("AGENT_FETCH_MODE", "react").lower()
+
+# Plan jobs (POST /plan/jobs): PLAN_JOB_WORKERS plans run at once, at most PLAN_JOB_QUEUE_SIZE
+# wait in line (more are rejected with 503), and finished jobs are kept PLAN_JOB_RESULT_TTL seconds.
+PLAN_JOB_WORKERS = int(os.getenv("PLAN_JOB_WORKERS", "4"))
+PLAN_JOB_QUEUE_SIZE = int(os.getenv("PLAN_JOB_QUEUE_SIZE", "100"))
+PLAN_JOB_RESULT_TTL = float(os.getenv("PLAN_JOB_RESULT_TTL", "3600"))
+
+# Per-upstream governor: requests per second (token bucket, 0 disables the rate limit) and
+# maximum requests in flight. Requests over the limits wait in line instead of failing, and
+# 429/503 answers are retried up to UPSTREAM_MAX_RETRIES times with jittered exponential
+# backoff starting at UPSTREAM_BACKOFF_BASE seconds, or after the upstream's Retry-After.
+GEOAPIFY_RATE_LIMIT = float(os.getenv("GEOAPIFY_RATE_LIMIT", "5"))
+GEOAPIFY_MAX_IN_FLIGHT = int(os.getenv("GEOAPIFY_MAX_IN_FLIGHT", "10"))
+OPENWEATHER_RATE_LIMIT = float(os.getenv("OPENWEATHER_RATE_LIMIT", "1"))
+OPENWEATHER_MAX_IN_FLIGHT = int(os.getenv("OPENWEATHER_MAX_IN_FLIGHT", "5"))
+AMADEUS_RATE_LIMIT = float(os.getenv("AMADEUS_RATE_LIMIT", "10"))
+AMADEUS_MAX_IN_FLIGHT = int(os.getenv("AMADEUS_MAX_IN_FLIGHT", "10"))
+TAVILY_RATE_LIMIT = float(os.getenv("TAVILY_RATE_LIMIT", "5"))
+TAVILY_MAX_IN_FLIGHT = int(os.getenv("TAVILY_MAX_IN_FLIGHT", "10"))
+GEMINI_RATE_LIMIT = float(os.getenv("GEMINI_RATE_LIMIT", "0"))
+GEMINI_MAX_IN_FLIGHT = int(os.getenv("GEMINI_MAX_IN_FLIGHT", "32"))
+UPSTREAM_MAX_RETRIES = int(os.getenv("UPSTREAM_MAX_RETRIES", "4"))
+UPSTREAM_BACKOFF_BASE = float(os.getenv("UPSTREAM_BACKOFF_BASE", "0.5"))
+UPSTREAM_BACKOFF_MAX = float(os.getenv("UPSTREAM_BACKOFF_MAX", "30"))
+
+# Per-thread trace dumps (GET /traces/{thread_id}): spans of the last TRACE_MAX_THREADS
+# threads are kept in memory, at most TRACE_MAX_SPANS each. Histograms on /metrics are
+# always recorded.
+TRACE_ENABLED = _get_bool("TRACE_ENABLED", False)
+TRACE_MAX_THREADS = int(os.getenv("TRACE_MAX_THREADS", "256"))
+TRACE_MAX_SPANS = int(os.getenv("TRACE_MAX_SPANS", "2000"))
@@ -2,16 +2,17 @@
 
 from datetime import date
 
-from langchain_core.runnables import RunnableConfig
 from langchain_core.tools import tool
 
-from backend.agents.budget_agent import BudgetAgent
-from backend.agents.suggestion_agent import SuggestionAgent
-from backend.agents.weather_agent import WeatherAgent
+from backend.agents.budget_agent import get_budget_agent
+from backend.agents.suggestion_agent import get_suggestion_agent
+from backend.agents.weather_agent import get_weather_agent
+from backend.intents.rest_agent_intents import with_sync_fallback
 
 
+@with_sync_fallback
 @tool
-def weather_tool(destination: str, start_date: str, end_date: str) -> RunnableConfig | str:
+async def weather_tool(destination: str, start_date: str, end_date: str) -> str:
     """Gets the weather forecast for a given location and date range.
 
     Args:
@@ -23,18 +24,18 @@ def weather_tool(destination: str, start_date: str, end_date: str) -> RunnableCo
         The weather agent's response with weather data and recommendations
     """
     try:
-        weather_agent = WeatherAgent(
+        return await get_weather_agent().aget_weather_data(
             city_to_visit=destination,
             begin_date=date.fromisoformat(start_date),
             end_date=date.fromisoformat(end_date)
         )
-        return weather_agent.get_weather_data()
     except Exception as e:
         return f"Error getting weather data: {str(e)}"
 
 
+@with_sync_fallback
 @tool
-def suggestion_tool(destination: str, foodie: bool, entertainment: bool, business: bool, weather_report: str) -> RunnableConfig | str:
+async def suggestion_tool(destination: str, foodie: bool, entertainment: bool, business: bool, weather_report: str) -> str:
     """Gets activity suggestions based on interests and weather.
 
     Args:
@@ -48,19 +49,20 @@ def suggestion_tool(destination: str, foodie: bool, entertainment: bool, busines
         The suggestion agent's response with activity suggestions according to the user's interests and weather conditions
     """
     try:
-        suggestion_agent = SuggestionAgent(
+        return await get_suggestion_agent().aget_activities_agently(
             city_to_visit=destination,
             foodie=foodie,
+            business=business,
             entertainment=entertainment,
-            business=business
+            weather_response=weather_report
         )
-        return suggestion_agent.get_activities_agently(weather_report)
     except Exception as e:
         return f"Error getting activity suggestions: {str(e)}"
 
 
+@with_sync_fallback
 @tool
-def budget_tool(origin: str, destination: str, start_date: str, end_date: str, adults: int, budget: int, suggestions: str) -> RunnableConfig | str :
+async def budget_tool(origin: str, destination: str, start_date: str, end_date: str, adults: int, budget: int, suggestions: str) -> str:
     """Gets a budget analysis for the trip.
 
     Args:
@@ -76,14 +78,14 @@ def budget_tool(origin: str, destination: str, start_date: str, end_date: str, a
         The budget agent's response with budget analysis and recommendations according to the user's budget and trip details
     """
     try:
-        budget_agent = BudgetAgent(
+        return await get_budget_agent().aget_budget(
             budget=budget,
             origin_city=origin,
             destination=destination,
             start_date=start_date,
             end_date=end_date,
-            adults=adults
+            adults=adults,
+            suggestion_response=suggestions
         )
-        return budget_agent.get_budget(suggestions)
     except Exception as e:
         return f"Error getting budget analysis: {str(e)}"
\ No newline at end of file
@@ -1,43 +1,116 @@
 """Weather Agent, Suggestion Agent and Budget Agent Intents Module."""
 
 import asyncio
-from langchain_core.tools import tool
+from typing import Any, Coroutine, TypeVar, cast
+
+from langchain_core.tools import BaseTool, StructuredTool, tool
 from backend.api_clients.flight_api import get_flight_data_async
 from backend.api_clients.hotel_rental_api import get_hotel_data_async
 from backend.api_clients.accommodation_api import get_accommodation_data
 from backend.api_clients.car_rental_api import get_car_rental_data
 from backend.api_clients.travel_search_api import get_activities_of_city
 from backend.api_clients.weather_data import get_weather
+from backend.api_clients.http_client import aclose_clients
+
+
+T = TypeVar("T")
+
+
+def run_sync(coro: Coroutine[Any, Any, T]) -> T:
+    """Run a coroutine on a throwaway event loop and close the pooled clients it opened."""
+    async def _run() -> T:
+        try:
+            return await coro
+        finally:
+            await aclose_clients()
+
+    return asyncio.run(_run())
+
+
+def with_sync_fallback(async_tool: BaseTool) -> BaseTool:
+    """Let a coroutine-native tool also be invoked synchronously (e.g. from ``.stream()``)."""
+    if not isinstance(async_tool, StructuredTool) or async_tool.coroutine is None:
+        raise TypeError(f"{async_tool.name} is not a coroutine tool")
+    coroutine = async_tool.coroutine
+
+    def func(**kwargs: Any) -> Any:
+        return run_sync(cast(Coroutine[Any, Any, Any], coroutine(**kwargs)))
+
+    async_tool.func = func
+    return async_tool
 
+
+@with_sync_fallback
 @tool
-def get_weather_data_of_city(city: str) -> str:
-    """Sync wrapper for the async function."""
-    return asyncio.run(get_weather(city))
+async def get_weather_data_of_city(city: str) -> str | None:
+    """Get the 5-day / 3-hour weather forecast of a city from OpenWeatherMap.
+
+    Args:
+        city: The city name.
+    """
+    return await get_weather(city)
+
 
+@with_sync_fallback
 @tool
-def get_flight_data(origin: str, destination: str, departure_date: str, return_date: str, adults: int = 1) -> str:
-    """Sync wrapper for the async function."""
-    return asyncio.run(get_flight_data_async(origin, destination, departure_date, return_date, adults))
+async def get_flight_data(origin: str, destination: str, departure_date: str, return_date: str, adults: int = 1) -> str:
+    """Get round-trip flight offers from Amadeus.
 
+    Args:
+        origin: Airport code of the origin city.
+        destination: Airport code of the destination city.
+        departure_date: Date in YYYY-MM-DD format.
+        return_date: Date in YYYY-MM-DD format.
+        adults: Number of adults travelling.
+    """
+    return await get_flight_data_async(origin, destination, departure_date, return_date, adults)
 
+
+@with_sync_fallback
 @tool
-def get_hotel_data(city_code: str, check_in: str, check_out: str, adults: int = 1) -> str:
-    """Sync wrapper for the async function."""
-    return asyncio.run(get_hotel_data_async(city_code, check_in, check_out, adults)) # london IATA code = "LON" and "LCY"
+async def get_hotel_data(city_code: str, check_in: str, check_out: str, adults: int = 1) -> str:
+    """Get hotel offers with prices from Amadeus.
+
+    Args:
+        city_code: IATA city code of the destination (e.g. "NYC").
+        check_in: Check-in date in YYYY-MM-DD format.
+        check_out: Check-out date in YYYY-MM-DD format.
+        adults: Number of adults travelling.
+    """
+    return await get_hotel_data_async(city_code, check_in, check_out, adults) # london IATA code = "LON" and "LCY"
 
 
+@with_sync_fallback
 @tool
-def get_accommodation_data_of_city(city: str) -> str:
-    """Sync wrapper for the async function."""
-    return asyncio.run(get_accommodation_data(city))
+async def get_accommodation_data_of_city(city: str) -> str:
+    """Get accommodation options (without prices) of a city from Geoapify.
 
+    Args:
+        city: The city name with state and country.
+    """
+    return await get_accommodation_data(city)
+
+
+@with_sync_fallback
 @tool
-def get_car_rental_data_of_city(city: str) -> str:
-    """Sync wrapper for the async function."""
-    return asyncio.run(get_car_rental_data(city))
+async def get_car_rental_data_of_city(city: str) -> str:
+    """Get car rental places (without prices) of a city from Geoapify.
 
+    Args:
+        city: The city name with state and country.
+    """
+    return await get_car_rental_data(city)
 
+
+@with_sync_fallback
 @tool
-def get_activities_data_of_city_sync(foodie: bool, business: bool ,adventure_or_fun: bool, city_to_visit: str) -> str:
-    """Sync wrapper for the async function."""
-    return asyncio.run(get_activities_of_city(foodie, business, adventure_or_fun, city_to_visit))
+async def get_activities_data_of_city_sync(foodie: bool, business: bool ,adventure_or_fun: bool, city_to_visit: str) -> str | None:
+    """Get places to visit in a city from Geoapify based on the purpose of the trip.
+
+    Args:
+        foodie: Whether the user wants restaurants and cafes.
+        business: Whether the user is on a business trip and wants places to relax.
+        adventure_or_fun: Whether the user wants entertainment places.
+        city_to_visit: The city name with state and country.
+    """
+    return await get_activities_of_city(foodie, business, adventure_or_fun, city_to_visit)
@@ -0,0 +1,162 @@
+"""Plan jobs: submit a plan, let a background worker pool generate it, and poll for the result.
+
+A job is accepted at once and queued; PLAN_JOB_WORKERS worker tasks run the Phase 1 graph
+for queued jobs and record the weather, suggestion and budget responses as soon as their
+agents finish, so a client that polls (or reconnects after dropping) sees partial results
+instead of restarting the pipeline. Finished jobs are kept for PLAN_JOB_RESULT_TTL seconds.
+"""
+
+import asyncio
+import time
+import uuid
+from collections import Counter, OrderedDict
+from typing import Any, Dict, List, Optional
+
+from langgraph.graph.state import CompiledStateGraph
+
+from backend.config import PLAN_JOB_WORKERS, PLAN_JOB_QUEUE_SIZE, PLAN_JOB_RESULT_TTL
+from backend.metrics import gauge
+from backend.schemas import CreatePlanRequest
+from backend.streaming import message_text
+from backend.tracing import run_config
+
+# Graph state fields reported while a job is still running.
+PARTIAL_FIELDS = ("weather_response", "suggestion_response", "budget_response")
+
+
+class PlanJobQueueFull(Exception):
+    """Raised when a plan job is submitted while PLAN_JOB_QUEUE_SIZE jobs are already waiting."""
+
+
+class PlanJob:
+    """Status and (partial) results of one plan job."""
+    def __init__(self, request: CreatePlanRequest):
+        self.job_id = uuid.uuid4().hex
+        self.request = request
+        self.status = "queued"
+        self.partial: Dict[str, str] = {}
+        self.itinerary: Optional[str] = None
+        self.error: Optional[str] = None
+        self.submitted_at = time.time()
+        self.finished_at: Optional[float] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.job_id,
+            "thread_id": self.request.thread_id,
+            "status": self.status,
+            **self.partial,
+            "itinerary": self.itinerary,
+            "error": self.error,
+            "submitted_at": self.submitted_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class PlanJobs:
+    """In-process job queue served by a bounded pool of asyncio worker tasks.
+
+    Workers are started on the running event loop by the first submit, so slow Gemini calls
+    only ever occupy a worker, never a request handler.
+    """
+    def __init__(self, graph: CompiledStateGraph, workers: int = PLAN_JOB_WORKERS,
+                 max_queued: int = PLAN_JOB_QUEUE_SIZE, result_ttl: float = PLAN_JOB_RESULT_TTL):
+        self.graph = graph
+        self.workers = workers
+        self.max_queued = max_queued
+        self.result_ttl = result_ttl
+        self._jobs: "OrderedDict[str, PlanJob]" = OrderedDict()
+        # Jobs by thread id, so a client retrying a submit gets its running job back.
+        self._by_thread: Dict[str, str] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        gauge("plan_jobs", "Plan jobs kept in memory, by status.",
+              lambda: [({"status": status}, count) for status, count in self.stats().items()])
+
+    def _start_workers(self) -> asyncio.Queue:
+        if self._queue is None or not self._tasks:
+            self._queue = asyncio.Queue(maxsize=self.max_queued)
+            self._tasks = [asyncio.create_task(self._work(self._queue)) for _ in range(self.workers)]
+        return self._queue
+
+    def _prune(self) -> None:
+        """Forget finished jobs older than the result TTL."""
+        now = time.time()
+        for job_id, job in list(self._jobs.items()):
+            if job.finished_at is not None and job.finished_at + self.result_ttl <= now:
+                del self._jobs[job_id]
+                if self._by_thread.get(job.request.thread_id) == job_id:
+                    del self._by_thread[job.request.thread_id]
+
+    def submit(self, request: CreatePlanRequest) -> PlanJob:
+        """Queue a plan request, or return the unfinished or successful job of the same thread.
+
+        Raises:
+            PlanJobQueueFull: If the queue already holds max_queued jobs.
+        """
+        self._prune()
+        existing = self._jobs.get(self._by_thread.get(request.thread_id, ""))
+        if existing is not None and existing.status != "error":
+            return existing
+
+        job = PlanJob(request)
+        try:
+            self._start_workers().put_nowait(job)
+        except asyncio.QueueFull:
+            raise PlanJobQueueFull(f"{self.max_queued} plan jobs are already queued.")
+        self._jobs[job.job_id] = job
+        self._by_thread[request.thread_id] = job.job_id
+        return job
+
+    def get(self, job_id: str) -> Optional[PlanJob]:
+        """The job with this id, or None if it is unknown or its result expired."""
+        self._prune()
+        return self._jobs.get(job_id)
+
+    async def _work(self, queue: asyncio.Queue) -> None:
+        while True:
+            job = await queue.get()
+            try:
+                await self._run(job)
+            finally:
+                queue.task_done()
+
+    async def _run(self, job: PlanJob) -> None:
+        job.status = "running"
+        config = run_config(job.request.thread_id)
+
+        initial_data = job.request.model_dump()
+        initial_data["initial_plan_complete"] = False
+        initial_data["messages"] = []
+
+        try:
+            async for update in self.graph.astream(initial_data, config=config, stream_mode="updates"):
+                for node_update in update.values():
+                    for field in PARTIAL_FIELDS:
+                        if (node_update or {}).get(field):
+                            job.partial[field] = node_update[field]
+
+            state = await self.graph.aget_state(config)
+            messages = state.values.get("messages", [])
+            if not messages:
+                raise ValueError("AI failed to generate an itinerary.")
+            job.itinerary = message_text(messages[-1])
+            job.status = "done"
+        except Exception as e:
+            print(f"Error in plan job {job.job_id}: {e}")
+            job.error = str(e)
+            job.status = "error"
+        finally:
+            job.finished_at = time.time()
+
+    async def stop(self) -> None:
+        """Cancel the workers; queued and running jobs are dropped."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queue = None
+
+    def stats(self) -> Dict[str, int]:
+        """Number of stored jobs per status."""
+        return dict(Counter(job.status for job in self._jobs.values()))
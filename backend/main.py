@@ -1,43 +1,47 @@
 """Root entry point for the packing assistant backend"""
 
-import uuid
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict
+
 import fastapi
-from pydantic import BaseModel, Field
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from langchain_core.messages import HumanMessage
 
+from backend.agents.llm_cache import llm_cache_stats
 from backend.agents.packing_agent import PackingAgent
+from backend.api_clients.amadues_api_client import amadeus
+from backend.api_clients.governor import governor_stats
+from backend.api_clients.http_client import aclose_clients
+from backend.batch import generate_itinerary, run_batch
+from backend.cache import cache_stats
+from backend.config import SYNC_WORKER_THREADS, BATCH_CONCURRENCY
+from backend.jobs import PlanJobs, PlanJobQueueFull
+from backend.metrics import metrics_stats, render_prometheus
+from backend.places_index import places_index
+from backend.schemas import (CreatePlanRequest, ChatRequest, CreatePlanResponse, ChatResponse, BatchPlanRequest,
+                             PlanJobResponse)
+from backend.streaming import stream_graph
+from backend.tracing import get_trace, run_config
 
-app = fastapi.FastAPI()
 
-master_agent = PackingAgent()
+@asynccontextmanager
+async def lifespan(_app: fastapi.FastAPI) -> AsyncIterator[None]:
+    """Bound the thread pool for blocking work and close the pooled upstream HTTP clients on shutdown."""
+    executor = ThreadPoolExecutor(max_workers=SYNC_WORKER_THREADS, thread_name_prefix="sync-worker")
+    asyncio.get_running_loop().set_default_executor(executor)
+    yield
+    await plan_jobs.stop()
+    await aclose_clients()
+    executor.shutdown(wait=False)
+
 
-class CreatePlanRequest(BaseModel):
-    """Model for the initial travel plan request."""
-    origin_city: str
-    destination: str
-    start_date: str = Field(..., examples=["2025-10-15"])
-    end_date: str = Field(..., examples=["2025-10-22"])
-    adults: int = Field(..., gt=0)
-    budget: int = Field(..., gt=0)
-    foodie: bool = False
-    entertainment: bool = False
-    business: bool = False
-    thread_id: str = Field(default_factory=lambda: str(uuid.uuid4()), description="Unique identifier for the chat thread")
-
-
-class ChatRequest(BaseModel):
-    """Model for a follow-up chat message."""
-    thread_id: str
-    user_input: str
-
-class CreatePlanResponse(BaseModel):
-    """Response model for the itinerary creation."""
-    thread_id: str
-    itinerary: str
-
-class ChatResponse(BaseModel):
-    """Response model for the chat interaction."""
-    ai_message: str
+app = fastapi.FastAPI(lifespan=lifespan)
+
+master_agent = PackingAgent()
+plan_jobs = PlanJobs(master_agent.graph)
 
 @app.post("/plan/create", response_model=CreatePlanResponse)
 async def create_itinerary(request: CreatePlanRequest) -> CreatePlanResponse:
@@ -54,18 +58,7 @@ async def create_itinerary(request: CreatePlanRequest) -> CreatePlanResponse:
         HTTPException: If the AI fails to generate an itinerary or if invalid details are provided.
     """
     try:
-        config = {"configurable": {"thread_id": request.thread_id}}
-
-        initial_data = request.model_dump()
-        initial_data["initial_plan_complete"] = False
-        initial_data["messages"] = []
-
-        response = await master_agent.graph.ainvoke(initial_data, config=config)
-
-        itinerary = response["messages"][-1].content if response.get("messages") else None
-
-        if not itinerary:
-            raise fastapi.exceptions.HTTPException(status_code=500, detail="AI failed to generate an itinerary.")
+        itinerary = await generate_itinerary(master_agent.graph, request)
 
         return CreatePlanResponse(thread_id=request.thread_id, itinerary=itinerary)
 
@@ -73,6 +66,28 @@ async def create_itinerary(request: CreatePlanRequest) -> CreatePlanResponse:
         print(f"Error in /plan/create: {e}")
         raise fastapi.exceptions.HTTPException(status_code=400, detail="Invalid details provided or an error occurred.")
 
+@app.post("/plan/create/stream")
+async def create_itinerary_stream(request: CreatePlanRequest) -> StreamingResponse:
+    """
+    Creates a new travel itinerary and streams its progress as server-sent events
+
+    Emits "progress" events as the weather, suggestion and budget agents finish, "token" events
+    while the itinerary is written, and a final "done" event with the thread ID and itinerary.
+
+    Args:
+        request (CreatePlanRequest): The request containing travel details.
+
+    Returns:
+        StreamingResponse: The text/event-stream response.
+    """
+    config = run_config(request.thread_id)
+
+    initial_data = request.model_dump()
+    initial_data["initial_plan_complete"] = False
+    initial_data["messages"] = []
+
+    return _event_stream(stream_graph(master_agent.graph, initial_data, config, "itinerary"))
+
 @app.post("/plan/chat", response_model=ChatResponse)
 async def chat_with_master_agent(request: ChatRequest) -> ChatResponse:
     """
@@ -88,7 +103,7 @@ async def chat_with_master_agent(request: ChatRequest) -> ChatResponse:
         HTTPException: If the thread ID is missing or if the AI fails to generate a response.
     """
     try:
-        config = {"configurable": {"thread_id": request.thread_id}}
+        config = run_config(request.thread_id)
 
         response = await master_agent.graph.ainvoke(
             {"messages": [HumanMessage(content=request.user_input)]},
@@ -103,4 +118,142 @@ async def chat_with_master_agent(request: ChatRequest) -> ChatResponse:
 
     except Exception as e:
         print(f"Error in /plan/chat: {e}")
-        raise fastapi.exceptions.HTTPException(status_code=500, detail=f"An error occurred: {str(e)}")
\ No newline at end of file
+        raise fastapi.exceptions.HTTPException(status_code=500, detail=f"An error occurred: {str(e)}")
+
+@app.post("/plan/chat/stream")
+async def chat_with_master_agent_stream(request: ChatRequest) -> StreamingResponse:
+    """
+    Handles a follow-up chat message and streams the answer as server-sent events
+
+    Emits "progress" events for the supervisor and tool calls, "token" events while the answer
+    is written, and a final "done" event with the full AI message.
+
+    Args:
+        request (ChatRequest): The request containing the thread ID and user input.
+
+    Returns:
+        StreamingResponse: The text/event-stream response.
+    """
+    config = run_config(request.thread_id)
+    graph_input = {"messages": [HumanMessage(content=request.user_input)]}
+
+    return _event_stream(stream_graph(master_agent.graph, graph_input, config, "ai_message"))
+
+@app.post("/plan/batch")
+async def create_itineraries_batch(request: BatchPlanRequest) -> StreamingResponse:
+    """
+    Creates many travel itineraries and streams the results as JSON lines
+
+    Plans run with bounded concurrency and share the agent, connection pools and caches. Each
+    line holds the plan's "id" (its thread ID), a "status" of "ok" or "error", and the
+    "itinerary" or "error". Results arrive in completion order, so a client that loses the
+    connection can resend only the requests whose IDs it has not received.
+
+    Args:
+        request (BatchPlanRequest): The plan requests and optional concurrency.
+
+    Returns:
+        StreamingResponse: The application/x-ndjson response.
+    """
+    plans = ((plan.thread_id, plan.model_dump()) for plan in request.requests)
+    results = run_batch(master_agent.graph, plans, request.concurrency or BATCH_CONCURRENCY)
+
+    async def lines() -> AsyncIterator[str]:
+        async for result in results:
+            yield json.dumps(result) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+@app.post("/plan/jobs", response_model=PlanJobResponse, status_code=202)
+async def submit_plan_job(request: CreatePlanRequest) -> PlanJobResponse:
+    """
+    Queues a travel itinerary to be generated in the background and returns its job at once
+
+    Resubmitting a request with the thread ID of a queued, running or finished job returns that
+    job instead of starting the pipeline again, so clients can safely retry dropped requests.
+
+    Args:
+        request (CreatePlanRequest): The request containing travel details.
+
+    Returns:
+        PlanJobResponse: The job ID and its current status.
+
+    Raises:
+        HTTPException: If too many jobs are already queued.
+    """
+    try:
+        job = plan_jobs.submit(request)
+    except PlanJobQueueFull as e:
+        raise fastapi.exceptions.HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+    return PlanJobResponse(**job.to_dict())
+
+@app.get("/plan/jobs/{job_id}", response_model=PlanJobResponse)
+async def get_plan_job(job_id: str) -> PlanJobResponse:
+    """
+    Returns the status of a plan job, the agent responses finished so far and, once done, the itinerary
+
+    Args:
+        job_id (str): The job ID returned by POST /plan/jobs.
+
+    Returns:
+        PlanJobResponse: The job status and results.
+
+    Raises:
+        HTTPException: If the job is unknown or its result has expired.
+    """
+    job = plan_jobs.get(job_id)
+    if job is None:
+        raise fastapi.exceptions.HTTPException(status_code=404, detail="Plan job not found or expired.")
+    return PlanJobResponse(**job.to_dict())
+
+@app.get("/stats")
+async def get_stats() -> Dict[str, Any]:
+    """
+    Returns the hit rates and sizes of the in-process caches, the LLM response cache per node, the upstream governor queues, the Amadeus token counters, the plan jobs, the places index and the recorded histograms
+
+    Returns:
+        dict: Cache statistics keyed by cache name, LLM cache hits and seconds saved keyed by
+        node, governor statistics keyed by upstream, Amadeus token refresh and 401 retry counts,
+        plan job counts keyed by status, places index counters (None without PLACES_INDEX_DB) and
+        histogram statistics keyed by metric name.
+    """
+    return {"caches": cache_stats(), "llm_cache": llm_cache_stats(), "upstreams": governor_stats(),
+            "amadeus": amadeus.stats(), "jobs": plan_jobs.stats(), "places_index": places_index.stats() if places_index else None,
+            "metrics": metrics_stats()}
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics() -> PlainTextResponse:
+    """
+    Returns the latency and token histograms and the cache and upstream gauges in the Prometheus text format
+
+    Returns:
+        PlainTextResponse: The metrics exposition, ready to be scraped by Prometheus.
+    """
+    return PlainTextResponse(render_prometheus(), media_type="text/plain; version=0.0.4")
+
+@app.get("/traces/{thread_id}")
+async def get_thread_trace(thread_id: str) -> Dict[str, Any]:
+    """
+    Returns the timing spans recorded for a chat thread (needs TRACE_ENABLED)
+
+    Args:
+        thread_id (str): The thread ID of the plan or chat.
+
+    Returns:
+        dict: The thread ID, its spans ordered by start time and the number of dropped spans.
+
+    Raises:
+        HTTPException: If no trace was recorded for the thread.
+    """
+    trace = get_trace(thread_id)
+    if trace is None:
+        raise fastapi.exceptions.HTTPException(status_code=404, detail="No trace recorded for this thread.")
+    return trace
+
+def _event_stream(events: AsyncIterator[str]) -> StreamingResponse:
+    """Wrap server-sent events in a response that proxies won't buffer."""
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
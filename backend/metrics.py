@@ -0,0 +1,132 @@
+"""In-process metrics shared by the agents and API clients, exported in Prometheus text format."""
+
+import bisect
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+# Bucket upper bounds for token counts (prompt sizes grow from ~1k to tens of thousands).
+TOKEN_BUCKETS: Tuple[float, ...] = (500, 1000, 2000, 4000, 8000, 16000, 32000, 64000, 128000)
+# Bucket upper bounds in seconds, from a cached HTTP call to a full plan.
+LATENCY_BUCKETS: Tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class _Series:
+    def __init__(self, bucket_count: int):
+        # One counter per bucket plus the implicit +Inf bucket.
+        self.counts = [0] * (bucket_count + 1)
+        self.count = 0
+        self.sum = 0.0
+
+
+class Histogram:
+    """Cumulative histogram with fixed bucket upper bounds and one series per label set."""
+
+    def __init__(self, name: str, description: str, buckets: Tuple[float, ...]):
+        self.name = name
+        self.description = description
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[Labels, _Series] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        """Record one observation, e.g. observe(0.42, node="synthesizer")."""
+        key = tuple(sorted((name, str(label)) for name, label in labels.items()))
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = _Series(len(self.buckets))
+            series.counts[index] += 1
+            series.count += 1
+            series.sum += value
+
+    def stats(self, **labels: str) -> Dict[str, Any]:
+        """Count, sum, mean and cumulative bucket counts of the series matching the labels.
+
+        Args:
+            labels: Label values to filter on; without labels every series is summed up.
+        """
+        wanted = {(name, str(label)) for name, label in labels.items()}
+        counts = [0] * (len(self.buckets) + 1)
+        count, total = 0, 0.0
+        with self._lock:
+            for key, series in self._series.items():
+                if not wanted <= set(key):
+                    continue
+                counts = [a + b for a, b in zip(counts, series.counts)]
+                count += series.count
+                total += series.sum
+
+        cumulative = []
+        running = 0
+        for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+            running += bucket_count
+            cumulative.append((bound, running))
+        return {
+            "count": count,
+            "sum": total,
+            "mean": round(total / count, 4) if count else 0.0,
+            "buckets": cumulative,
+        }
+
+    def render(self) -> List[str]:
+        """Prometheus text exposition lines of every series."""
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series_items = sorted(self._series.items())
+            for key, series in series_items:
+                running = 0
+                for bound, bucket_count in zip(self.buckets + (float("inf"),), series.counts):
+                    running += bucket_count
+                    le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                    lines.append(f"{self.name}_bucket{_format_labels(key + (('le', le),))} {running}")
+                lines.append(f"{self.name}_sum{_format_labels(key)} {series.sum:g}")
+                lines.append(f"{self.name}_count{_format_labels(key)} {series.count}")
+        return lines
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    escaped = (f'{name}="{value}"'.replace("\n", " ") for name, value in labels)
+    return "{" + ",".join(escaped) + "}"
+
+
+_histograms: Dict[str, Histogram] = {}
+_histograms_lock = threading.Lock()
+# Gauges are read on export from callbacks returning (labels, value) pairs.
+_gauges: Dict[str, Tuple[str, Callable[[], Iterable[Tuple[Dict[str, str], float]]]]] = {}
+
+
+def histogram(name: str, description: str, buckets: Tuple[float, ...]) -> Histogram:
+    """Return the histogram registered under name, creating it on first use."""
+    with _histograms_lock:
+        if name not in _histograms:
+            _histograms[name] = Histogram(name, description, buckets)
+        return _histograms[name]
+
+
+def gauge(name: str, description: str, collect: Callable[[], Iterable[Tuple[Dict[str, str], float]]]) -> None:
+    """Register a gauge whose values are collected when the metrics are exported."""
+    _gauges[name] = (description, collect)
+
+
+def metrics_stats() -> Dict[str, Dict[str, Any]]:
+    """Statistics of every histogram created in this process, keyed by name."""
+    return {name: hist.stats() for name, hist in _histograms.items()}
+
+
+def render_prometheus() -> str:
+    """Every histogram and gauge in the Prometheus text exposition format."""
+    lines = []
+    for hist in list(_histograms.values()):
+        lines.extend(hist.render())
+    for name, (description, collect) in list(_gauges.items()):
+        lines.append(f"# HELP {name} {description}")
+        lines.append(f"# TYPE {name} gauge")
+        for labels, value in collect():
+            key = tuple(sorted((label, str(label_value)) for label, label_value in labels.items()))
+            lines.append(f"{name}{_format_labels(key)} {value:g}")
+    return "\n".join(lines) + "\n"
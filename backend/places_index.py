@@ -0,0 +1,160 @@
+"""Local SQLite/FTS5 index of Geoapify places, snapshotted per destination city.
+
+Built and refreshed offline by python -m backend.places_ingest. The travel search,
+accommodation and car rental clients query it before calling Geoapify, so popular
+destinations are served without any network call.
+"""
+
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from backend.cache import normalize_text
+from backend.config import PLACES_INDEX_DB, PLACES_INDEX_MAX_AGE
+
+
+def _phrase(text: str) -> str:
+    """FTS5 phrase matching a Geoapify category or id, e.g. "catering.cafe" -> "catering cafe"."""
+    return '"' + text.replace('"', "").replace(".", " ") + '"'
+
+
+class PlacesIndex:
+    """Places of each indexed city, searchable by Geoapify category.
+
+    A place's categories are indexed with FTS5, so a parent category such as "entertainment"
+    matches every entertainment.* place, the same way the Geoapify places API filters them.
+    """
+    def __init__(self, path: str, max_age: float = PLACES_INDEX_MAX_AGE):
+        self.max_age = max_age
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS cities ("
+                "city_key TEXT PRIMARY KEY, city TEXT NOT NULL, place_id TEXT NOT NULL, refreshed_at REAL NOT NULL)"
+            )
+            self._connection.execute("CREATE INDEX IF NOT EXISTS cities_place_id ON cities (place_id)")
+            self._connection.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS places USING fts5("
+                "city_place_id, categories, position UNINDEXED, summary UNINDEXED)"
+            )
+
+    def place_id(self, city: str) -> Optional[str]:
+        """Geoapify place id recorded for the city when it was indexed, if any."""
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT place_id FROM cities WHERE city_key = ?", (normalize_text(city),)
+            ).fetchone()
+        return row[0] if row else None
+
+    async def aplace_id(self, city: str) -> Optional[str]:
+        """Async version of place_id that queries SQLite in a worker thread."""
+        return await asyncio.to_thread(self.place_id, city)
+
+    def _is_fresh(self, place_id: str) -> bool:
+        row = self._connection.execute(
+            "SELECT MAX(refreshed_at) FROM cities WHERE place_id = ?", (place_id,)
+        ).fetchone()
+        return row[0] is not None and row[0] + self.max_age > time.time()
+
+    def lookup(self, place_id: str, category_groups: Sequence[Sequence[str]], limit: int) -> Optional[List[Dict[str, Any]]]:
+        """Places of an indexed city matching the categories, or None if the city is not indexed.
+
+        Args:
+            place_id (str): Geoapify place id of the city.
+            category_groups: Category lists queried separately, so each group gets its share.
+            limit (int): Places returned per group.
+
+        Returns:
+            Place summaries in Geoapify's order without duplicates, or None on a miss (the city
+            was never indexed or its snapshot is older than max_age).
+        """
+        with self._lock:
+            if not self._is_fresh(place_id):
+                self.misses += 1
+                return None
+            self.hits += 1
+
+            places: List[Dict[str, Any]] = []
+            seen = set()
+            for categories in category_groups:
+                query = (f"city_place_id:{_phrase(place_id)} AND "
+                         f"categories:({' OR '.join(_phrase(category) for category in categories)})")
+                rows = self._connection.execute(
+                    "SELECT rowid, summary FROM places WHERE places MATCH ? ORDER BY position LIMIT ?",
+                    (query, limit)
+                ).fetchall()
+                for rowid, summary in rows:
+                    if rowid not in seen:
+                        seen.add(rowid)
+                        places.append(json.loads(summary))
+        return places
+
+    async def alookup(self, place_id: str, category_groups: Sequence[Sequence[str]],
+                      limit: int) -> Optional[List[Dict[str, Any]]]:
+        """Async version of lookup that queries SQLite in a worker thread, off the event loop."""
+        return await asyncio.to_thread(self.lookup, place_id, category_groups, limit)
+
+    def replace_city(self, city: str, place_id: str, features: Iterable[Dict[str, Any]],
+                     summaries: Iterable[Dict[str, Any]]) -> int:
+        """Replace the snapshot of a city with new Geoapify features and their summaries.
+
+        Args:
+            city (str): The city name with state and country, as users enter it.
+            place_id (str): Geoapify place id of the city.
+            features: Raw Geoapify place features, in the order Geoapify ranked them.
+            summaries: summarize_places output for the same features.
+
+        Returns:
+            Number of places stored.
+        """
+        rows = []
+        seen = set()
+        for position, (feature, summary) in enumerate(zip(features, summaries)):
+            properties = feature.get("properties", {})
+            feature_id = properties.get("place_id") or json.dumps(summary, sort_keys=True)
+            if feature_id in seen:
+                continue
+            seen.add(feature_id)
+            rows.append((place_id, " ".join(properties.get("categories", [])), position, json.dumps(summary)))
+
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM places WHERE places MATCH ?", (f"city_place_id:{_phrase(place_id)}",))
+            self._connection.executemany(
+                "INSERT INTO places (city_place_id, categories, position, summary) VALUES (?, ?, ?, ?)", rows
+            )
+            self._connection.execute(
+                "INSERT OR REPLACE INTO cities (city_key, city, place_id, refreshed_at) VALUES (?, ?, ?, ?)",
+                (normalize_text(city), city, place_id, time.time())
+            )
+        return len(rows)
+
+    def cities(self, older_than: float = 0.0) -> List[str]:
+        """Indexed cities whose snapshot is at least older_than seconds old."""
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT city FROM cities WHERE refreshed_at <= ? ORDER BY city", (time.time() - older_than,)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def stats(self) -> Dict[str, Any]:
+        """Indexed cities and places plus lookup hits and misses."""
+        with self._lock:
+            cities = self._connection.execute("SELECT COUNT(*) FROM cities").fetchone()[0]
+            places = self._connection.execute("SELECT COUNT(*) FROM places").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "cities": cities,
+            "places": places,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+places_index: Optional[PlacesIndex] = PlacesIndex(PLACES_INDEX_DB) if PLACES_INDEX_DB else None
@@ -0,0 +1,121 @@
+"""Build and refresh the local places index (see backend.places_index) from Geoapify.
+
+Snapshot the restaurants, sights, entertainment, accommodation and car rentals of the cities
+listed one per line in a text file, then refresh old snapshots periodically (e.g. from cron):
+
+    PLACES_INDEX_DB=places.sqlite python -m backend.places_ingest cities.txt
+    PLACES_INDEX_DB=places.sqlite python -m backend.places_ingest --refresh --older-than 604800
+
+Each city is geocoded once and its place id is stored with the snapshot, so indexed cities
+are later served without any network call.
+"""
+
+import argparse
+import asyncio
+from typing import Any, Dict, List, Tuple
+
+from backend.api_clients.accommodation_api import ACCOMMODATION_CATEGORIES
+from backend.api_clients.car_rental_api import CAR_RENTAL_CATEGORIES
+from backend.api_clients.http_client import aclose_clients, get_client
+from backend.api_clients.projections import summarize_places
+from backend.api_clients.travel_search_api import (BUSINESS_CATEGORIES, ENTERTAINMENT_CATEGORIES, FOODIE_CATEGORIES,
+                                                   fetch_place_id_of_city)
+from backend.api_key_load import GEOAPIFY_API_KEY
+from backend.config import PLACES_INDEX_DB, PLACES_INDEX_LIMIT
+from backend.places_index import PlacesIndex
+
+# Category groups snapshotted for every city, one Geoapify request each.
+SNAPSHOT_GROUPS: Tuple[Tuple[str, ...], ...] = (
+    FOODIE_CATEGORIES,
+    BUSINESS_CATEGORIES,
+    ENTERTAINMENT_CATEGORIES,
+    ACCOMMODATION_CATEGORIES,
+    CAR_RENTAL_CATEGORIES,
+)
+
+
+async def fetch_places(place_id: str, categories: Tuple[str, ...], limit: int) -> List[Dict[str, Any]]:
+    """Raw Geoapify place features of the categories in a city."""
+    url = f"https://api.geoapify.com/v2/places?categories={','.join(categories)}&filter=place:{place_id}&limit={limit}&apiKey={GEOAPIFY_API_KEY}"
+    client = get_client(url)
+    response = await client.get(url)
+    response.raise_for_status()
+    return response.json().get("features", [])
+
+
+async def snapshot_city(index: PlacesIndex, city: str, limit: int = PLACES_INDEX_LIMIT) -> int:
+    """Geocode a city, fetch every snapshot group concurrently and replace its places in the index.
+
+    Returns:
+        Number of places stored for the city.
+    """
+    place_id = await fetch_place_id_of_city(city)
+    if not place_id:
+        raise ValueError(f"Could not geocode {city}.")
+
+    groups = await asyncio.gather(*(fetch_places(place_id, categories, limit) for categories in SNAPSHOT_GROUPS))
+    features = [feature for group in groups for feature in group]
+    summaries = summarize_places({"features": features})
+    return await asyncio.to_thread(index.replace_city, city, place_id, features, summaries)
+
+
+async def snapshot_cities(index: PlacesIndex, cities: List[str], concurrency: int) -> Dict[str, int]:
+    """Snapshot the cities with at most concurrency of them in flight.
+
+    Returns:
+        Counts of "ok" and "error" cities.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    counts = {"ok": 0, "error": 0}
+
+    async def snapshot(city: str) -> None:
+        async with semaphore:
+            try:
+                stored = await snapshot_city(index, city)
+                counts["ok"] += 1
+                print(f"{city}: {stored} places")
+            except Exception as e:
+                counts["error"] += 1
+                print(f"Error indexing {city}: {e}")
+
+    await asyncio.gather(*(snapshot(city) for city in cities))
+    return counts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Snapshot Geoapify places of destination cities into the local index.")
+    parser.add_argument("cities", nargs="?", help="Text file with one city (name, state, country) per line.")
+    parser.add_argument("--db", default=PLACES_INDEX_DB, help="SQLite file of the index (default: PLACES_INDEX_DB).")
+    parser.add_argument("--refresh", action="store_true", help="Also re-snapshot the cities already in the index.")
+    parser.add_argument("--older-than", type=float, default=0.0,
+                        help="With --refresh, only re-snapshot cities indexed at least this many seconds ago.")
+    parser.add_argument("--concurrency", type=int, default=4)
+    args = parser.parse_args()
+
+    if not args.db:
+        parser.error("set PLACES_INDEX_DB or pass --db")
+    if not args.cities and not args.refresh:
+        parser.error("pass a cities file, --refresh or both")
+
+    index = PlacesIndex(args.db)
+    cities: List[str] = []
+    if args.cities:
+        with open(args.cities, encoding="utf-8") as file:
+            cities.extend(line.strip() for line in file if line.strip())
+    if args.refresh:
+        cities.extend(city for city in index.cities(older_than=args.older_than) if city not in cities)
+
+    async def run() -> Dict[str, int]:
+        try:
+            return await snapshot_cities(index, cities, args.concurrency)
+        finally:
+            await aclose_clients()
+
+    counts = asyncio.run(run())
+    stats = index.stats()
+    print(f"Indexed {counts['ok']} cities ({counts['error']} failed); "
+          f"the index holds {stats['places']} places of {stats['cities']} cities.")
+
+
+if __name__ == "__main__":
+    main()
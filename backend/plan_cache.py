@@ -0,0 +1,117 @@
+"""Plan-level cache of the Phase 1 agent responses, keyed on the normalized plan request."""
+
+import asyncio
+import math
+from datetime import date
+from typing import Any, Awaitable, Callable, Dict, Mapping, Optional
+
+from backend.api_clients.travel_search_api import get_place_id_of_city
+from backend.cache import AsyncTTLCache, SQLiteCacheStore, normalize_text
+from backend.config import (PLAN_CACHE_ENABLED, PLAN_CACHE_SIZE, PLAN_CACHE_DB, PLAN_CACHE_DATE_BUCKET_DAYS,
+                            PLAN_CACHE_BUDGET_STEP, PLAN_CACHE_WEATHER_TTL, PLAN_CACHE_SUGGESTION_TTL,
+                            PLAN_CACHE_BUDGET_TTL)
+from backend.intents.rest_agent_intents import run_sync
+
+
+def _stage_cache(stage: str, ttl: float) -> AsyncTTLCache:
+    name = f"plan_{stage}_response"
+    return AsyncTTLCache(
+        name,
+        maxsize=PLAN_CACHE_SIZE,
+        ttl=ttl,
+        store=SQLiteCacheStore(PLAN_CACHE_DB, name) if PLAN_CACHE_DB else None
+    )
+
+
+stage_caches: Dict[str, AsyncTTLCache] = {
+    "weather": _stage_cache("weather", PLAN_CACHE_WEATHER_TTL),
+    "suggestion": _stage_cache("suggestion", PLAN_CACHE_SUGGESTION_TTL),
+    "budget": _stage_cache("budget", PLAN_CACHE_BUDGET_TTL),
+}
+
+
+def bucket_date(value: str, days: int = PLAN_CACHE_DATE_BUCKET_DAYS) -> str:
+    """First day of the days-long bucket holding an ISO date, e.g. the week of 2025-10-15."""
+    day = date.fromisoformat(value)
+    if days <= 1:
+        return day.isoformat()
+    return date.fromordinal(day.toordinal() // days * days).isoformat()
+
+
+def bucket_budget(budget: int, step: float = PLAN_CACHE_BUDGET_STEP) -> int:
+    """Log-scale budget bucket, so budgets within about step (e.g. 10%) of each other share a bucket."""
+    if budget <= 0 or step <= 0:
+        return budget
+    return round(math.log(budget) / math.log1p(step))
+
+
+async def canonical_city(city: str) -> str:
+    """Geoapify place id of the city, so spellings like "Paris" and "paris, France" share entries."""
+    try:
+        place_id = await get_place_id_of_city(city)
+    except Exception as e:
+        print(f"Error canonicalizing city {city}: {e}")
+        place_id = None
+    return place_id or normalize_text(city)
+
+
+async def stage_key(stage: str, state: Mapping[str, Any]) -> str:
+    """Cache key of one Phase 1 stage, built only from the request fields that stage depends on.
+
+    Args:
+        stage (str): "weather", "suggestion" or "budget".
+        state: Graph state holding the plan request fields.
+
+    Returns:
+        The normalized cache key.
+    """
+    destination = await canonical_city(state["destination"])
+    dates = f"{bucket_date(state['start_date'])}|{bucket_date(state['end_date'])}"
+    key = f"{destination}|{dates}"
+    if stage == "weather":
+        return key
+
+    interests = f"foodie={state['foodie']}|business={state['business']}|entertainment={state['entertainment']}"
+    if stage == "suggestion":
+        return f"{key}|{interests}"
+
+    origin = await canonical_city(state["origin_city"])
+    # The budget agent only sees suggestions in the serial topology, which changes its answer.
+    with_suggestions = bool(state.get("suggestion_response"))
+    return (f"{origin}|{key}|adults={state['adults']}|budget={bucket_budget(state['budget'])}|{interests}"
+            f"|suggestions={with_suggestions}")
+
+
+async def stage_cached(stage: str, state: Mapping[str, Any]) -> bool:
+    """Whether the plan cache already holds a fresh response of the stage, so its data need not be fetched."""
+    return PLAN_CACHE_ENABLED and stage_caches[stage].get(await stage_key(stage, state)) is not None
+
+
+async def cached_stage(stage: str, state: Mapping[str, Any], loader: Callable[[], Awaitable[str]]) -> str:
+    """Get the response of a Phase 1 stage from the plan cache, or run the agent once and cache it.
+
+    Args:
+        stage (str): "weather", "suggestion" or "budget".
+        state: Graph state holding the plan request fields.
+        loader: Coroutine function running the agent on a miss.
+
+    Returns:
+        The cached or fresh agent response. Empty responses are returned but not cached, so a
+        failed stage is retried by the next plan instead of being served for the whole TTL.
+    """
+    if not PLAN_CACHE_ENABLED:
+        return await loader()
+
+    async def load() -> Optional[str]:
+        response = await loader()
+        return response if response and response.strip() else None
+
+    response = await stage_caches[stage].get_or_load(await stage_key(stage, state), load)
+    return response if response is not None else ""
+
+
+def cached_stage_sync(stage: str, state: Mapping[str, Any], loader: Callable[[], str]) -> str:
+    """Synchronous variant of cached_stage whose loader runs the synchronous agent method."""
+    if not PLAN_CACHE_ENABLED:
+        return loader()
+    return run_sync(cached_stage(stage, state, lambda: asyncio.to_thread(loader)))
@@ -0,0 +1,56 @@
+"""Request and response models of the packing assistant API."""
+
+import uuid
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+from backend.config import BATCH_MAX_CONCURRENCY
+
+
+class CreatePlanRequest(BaseModel):
+    """Model for the initial travel plan request."""
+    origin_city: str
+    destination: str
+    start_date: str = Field(..., examples=["2025-10-15"])
+    end_date: str = Field(..., examples=["2025-10-22"])
+    adults: int = Field(..., gt=0)
+    budget: int = Field(..., gt=0)
+    foodie: bool = False
+    entertainment: bool = False
+    business: bool = False
+    thread_id: str = Field(default_factory=lambda: str(uuid.uuid4()), description="Unique identifier for the chat thread")
+
+
+class ChatRequest(BaseModel):
+    """Model for a follow-up chat message."""
+    thread_id: str
+    user_input: str
+
+class CreatePlanResponse(BaseModel):
+    """Response model for the itinerary creation."""
+    thread_id: str
+    itinerary: str
+
+class ChatResponse(BaseModel):
+    """Response model for the chat interaction."""
+    ai_message: str
+
+class BatchPlanRequest(BaseModel):
+    """Model for generating many travel plans in one request."""
+    requests: List[CreatePlanRequest]
+    concurrency: Optional[int] = Field(default=None, gt=0, le=BATCH_MAX_CONCURRENCY,
+                                       description="Plans generated at once, BATCH_CONCURRENCY by default")
+
+class PlanJobResponse(BaseModel):
+    """Status of a plan job, with the agent responses available so far."""
+    job_id: str
+    thread_id: str
+    status: str = Field(..., description="queued, running, done or error")
+    weather_response: Optional[str] = None
+    suggestion_response: Optional[str] = None
+    budget_response: Optional[str] = None
+    itinerary: Optional[str] = None
+    error: Optional[str] = None
+    submitted_at: float
+    finished_at: Optional[float] = None
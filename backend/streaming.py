@@ -0,0 +1,69 @@
+"""Server-sent events (SSE) for streaming PackingAgent graph runs to the client."""
+
+import json
+from typing import Any, AsyncIterator, Dict, cast
+
+from langchain_core.messages import BaseMessage
+from langchain_core.runnables import RunnableConfig
+from langgraph.graph.state import CompiledStateGraph
+
+from backend.tracing import bind_thread_id
+
+# Nodes whose LLM output is streamed token by token; the specialist agents only report progress.
+TOKEN_STREAMING_NODES = ("synthesizer", "supervisor")
+
+
+def sse_event(event: str, data: Dict[str, Any]) -> str:
+    """Format one server-sent event."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def message_text(message: BaseMessage) -> str:
+    """Text of a message or chunk whose content may be a string or a list of content parts."""
+    content = message.content
+    if isinstance(content, str):
+        return content
+    return "".join(part.get("text", "") if isinstance(part, dict) else str(part) for part in content)
+
+
+async def stream_graph(graph: CompiledStateGraph, graph_input: Dict[str, Any], config: RunnableConfig,
+                       result_key: str) -> AsyncIterator[str]:
+    """Run the graph and yield its progress as server-sent events.
+
+    Emits a "progress" event whenever a node finishes, "token" events while the synthesizer
+    or supervisor generates text, then one "done" event whose data holds result_key with the
+    final AI message (or an "error" event if the run fails).
+
+    Args:
+        graph: The compiled PackingAgent graph.
+        graph_input: Input state for the run.
+        config: Run config holding the thread_id.
+        result_key: Key of the final message in the "done" event, e.g. "itinerary".
+    """
+    # The generator may run in another task than the endpoint that built the config.
+    bind_thread_id(config["configurable"]["thread_id"])
+    try:
+        async for item in graph.astream(graph_input, config=config, stream_mode=["updates", "messages"]):
+            # With a list of stream modes every item is a (mode, chunk) pair.
+            mode, chunk = cast(tuple[str, Any], item)
+            if mode == "updates":
+                for node in chunk:
+                    yield sse_event("progress", {"node": node, "status": "done"})
+            else:
+                message, metadata = chunk
+                if metadata.get("langgraph_node") in TOKEN_STREAMING_NODES:
+                    text = message_text(message)
+                    if text:
+                        yield sse_event("token", {"node": metadata["langgraph_node"], "content": text})
+
+        state = await graph.aget_state(config)
+        messages = state.values.get("messages", [])
+        if not messages:
+            yield sse_event("error", {"detail": "AI failed to generate a response."})
+            return
+
+        yield sse_event("done", {"thread_id": config["configurable"]["thread_id"], result_key: message_text(messages[-1])})
+
+    except Exception as e:
+        print(f"Error while streaming graph run: {e}")
+        yield sse_event("error", {"detail": f"An error occurred: {str(e)}"})
@@ -0,0 +1,190 @@
+"""Timing spans for graph nodes, ReAct steps, tool calls, LLM calls and upstream HTTP requests.
+
+Spans are recorded by a LangChain callback handler attached to every graph run (see
+run_config) and by the governed HTTP transport. Each span feeds a Prometheus-style histogram
+and, with TRACE_ENABLED, the in-memory trace of its thread_id.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+from langchain_core.runnables import RunnableConfig
+
+from backend.config import TRACE_ENABLED, TRACE_MAX_SPANS, TRACE_MAX_THREADS
+from backend.metrics import LATENCY_BUCKETS, TOKEN_BUCKETS, histogram
+
+graph_run_seconds = histogram("graph_run_duration_seconds", "Duration of whole graph runs (a plan or a chat turn).",
+                              LATENCY_BUCKETS)
+node_seconds = histogram("node_duration_seconds", "Duration of each PackingAgent graph node.", LATENCY_BUCKETS)
+react_step_seconds = histogram("react_step_duration_seconds",
+                               "Duration of each ReAct step (agent = LLM decision, tools = tool calls) of the specialist agents.",
+                               LATENCY_BUCKETS)
+tool_seconds = histogram("tool_duration_seconds", "Duration of each tool call.", LATENCY_BUCKETS)
+llm_seconds = histogram("llm_call_duration_seconds", "Duration of each LLM call.", LATENCY_BUCKETS)
+llm_tokens = histogram("llm_tokens", "Input and output tokens of each LLM call.", TOKEN_BUCKETS)
+
+# Thread of the graph run in progress, for spans recorded outside LangChain callbacks (HTTP).
+current_thread_id: ContextVar[Optional[str]] = ContextVar("current_thread_id", default=None)
+
+_traces: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_traces_lock = threading.Lock()
+
+
+def record_span(kind: str, name: str, start: float, duration: float, thread_id: Optional[str] = None,
+                **attributes: Any) -> None:
+    """Add a finished span to the trace of its thread, if tracing is enabled.
+
+    Args:
+        kind (str): "graph", "node", "react_step", "tool", "llm" or "http".
+        name (str): Node, tool, model or request name.
+        start (float): time.perf_counter() at the start of the span.
+        duration (float): Duration in seconds.
+        thread_id: Thread of the span; defaults to the thread bound to the current context.
+        attributes: Extra fields such as the status or token counts.
+    """
+    thread_id = thread_id or current_thread_id.get()
+    if not TRACE_ENABLED or thread_id is None:
+        return
+
+    span = {
+        "kind": kind,
+        "name": name,
+        "start": round(time.time() - (time.perf_counter() - start), 6),
+        "duration_ms": round(duration * 1000, 3),
+        **attributes,
+    }
+    with _traces_lock:
+        trace = _traces.get(thread_id)
+        if trace is None:
+            trace = _traces[thread_id] = {"thread_id": thread_id, "spans": [], "dropped_spans": 0}
+            while len(_traces) > TRACE_MAX_THREADS:
+                _traces.popitem(last=False)
+        _traces.move_to_end(thread_id)
+        if len(trace["spans"]) < TRACE_MAX_SPANS:
+            trace["spans"].append(span)
+        else:
+            trace["dropped_spans"] += 1
+
+
+def get_trace(thread_id: str) -> Optional[Dict[str, Any]]:
+    """Spans recorded for a thread, ordered by start time, or None if none were kept."""
+    with _traces_lock:
+        trace = _traces.get(thread_id)
+        if trace is None:
+            return None
+        return dict(trace, spans=sorted(trace["spans"], key=lambda span: span["start"]))
+
+
+class InstrumentationCallbackHandler(BaseCallbackHandler):
+    """Callback handler turning LangGraph/LangChain run events into timing spans.
+
+    Runs inline so the overhead stays at a dictionary update per event.
+    """
+    run_inline = True
+
+    def __init__(self):
+        self._runs: Dict[UUID, Tuple[str, str, float, Optional[str], Dict[str, str]]] = {}
+
+    def _start(self, run_id: UUID, kind: str, name: str, metadata: Optional[Dict[str, Any]], **labels: str) -> None:
+        thread_id = (metadata or {}).get("thread_id")
+        self._runs[run_id] = (kind, name, time.perf_counter(), thread_id, labels)
+
+    def _end(self, run_id: UUID, status: str = "ok", **attributes: Any) -> None:
+        run = self._runs.pop(run_id, None)
+        if run is None:
+            return
+        kind, name, start, thread_id, labels = run
+        duration = time.perf_counter() - start
+
+        if kind == "graph":
+            graph_run_seconds.observe(duration)
+        elif kind == "node":
+            node_seconds.observe(duration, node=name)
+        elif kind == "react_step":
+            react_step_seconds.observe(duration, **labels)
+        elif kind == "tool":
+            tool_seconds.observe(duration, tool=name)
+        elif kind == "llm":
+            llm_seconds.observe(duration, model=name, **labels)
+        record_span(kind, name, start, duration, thread_id, status=status, **labels, **attributes)
+
+    def on_chain_start(self, serialized: Optional[Dict[str, Any]], inputs: Any, *, run_id: UUID,
+                       parent_run_id: Optional[UUID] = None, metadata: Optional[Dict[str, Any]] = None,
+                       **kwargs: Any) -> None:
+        metadata = metadata or {}
+        name = kwargs.get("name")
+        node = metadata.get("langgraph_node")
+        namespace = metadata.get("checkpoint_ns")
+        if parent_run_id is None:
+            self._start(run_id, "graph", name or "graph", metadata)
+        elif node and name == node:
+            if not namespace:
+                self._start(run_id, "node", node, metadata)
+            else:
+                # Nodes of a ReAct agent run inside the namespace of the PackingAgent node calling it.
+                self._start(run_id, "react_step", node, metadata, agent=namespace.split(":")[0], step=node)
+
+    def on_chain_end(self, outputs: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end(run_id)
+
+    def on_chain_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end(run_id, status="error")
+
+    def on_tool_start(self, serialized: Optional[Dict[str, Any]], input_str: str, *, run_id: UUID,
+                      metadata: Optional[Dict[str, Any]] = None, **kwargs: Any) -> None:
+        name = kwargs.get("name") or (serialized or {}).get("name") or "tool"
+        self._start(run_id, "tool", name, metadata)
+
+    def on_tool_end(self, output: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end(run_id)
+
+    def on_tool_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end(run_id, status="error")
+
+    def on_chat_model_start(self, serialized: Optional[Dict[str, Any]], messages: List[List[Any]], *,
+                            run_id: UUID, metadata: Optional[Dict[str, Any]] = None, **kwargs: Any) -> None:
+        metadata = metadata or {}
+        namespace = metadata.get("checkpoint_ns") or metadata.get("langgraph_node") or "none"
+        model = metadata.get("ls_model_name") or "unknown"
+        self._start(run_id, "llm", model, metadata, node=namespace.split(":")[0])
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any) -> None:
+        run = self._runs.get(run_id)
+        usage = None
+        if response.generations and response.generations[0]:
+            usage = getattr(response.generations[0][0], "message", None)
+            usage = getattr(usage, "usage_metadata", None)
+        # Responses served from the LLM cache carry no token counts.
+        if run is None or not usage or "input_tokens" not in usage:
+            self._end(run_id)
+            return
+        _, model, _, _, labels = run
+        llm_tokens.observe(usage["input_tokens"], model=model, direction="input", **labels)
+        llm_tokens.observe(usage["output_tokens"], model=model, direction="output", **labels)
+        self._end(run_id, input_tokens=usage["input_tokens"], output_tokens=usage["output_tokens"])
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end(run_id, status="error")
+
+
+instrumentation = InstrumentationCallbackHandler()
+
+
+def bind_thread_id(thread_id: str) -> None:
+    """Attribute spans recorded outside callbacks (upstream HTTP requests) in this context to thread_id."""
+    current_thread_id.set(thread_id)
+
+
+def run_config(thread_id: str) -> RunnableConfig:
+    """Config for a graph run on thread_id with the instrumentation callbacks attached.
+
+    Also binds thread_id to the current context, so call it in the task that runs the graph.
+    """
+    bind_thread_id(thread_id)
+    return {"configurable": {"thread_id": thread_id}, "callbacks": [instrumentation]}
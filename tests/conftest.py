@@ -0,0 +1,6 @@
+import os
+
+# Configuration is read on import, so the backend (and the app in backend.main) can be
+# imported without real API keys.
+for name in ("GEMINI_API_KEY", "GEMINI_PRO_API_KEY", "TAVILY_API_KEY"):
+    os.environ.setdefault(name, "test")
@@ -0,0 +1,82 @@
+import asyncio
+import threading
+
+import httpx
+
+from backend.api_clients import amadues_api_client
+from backend.api_clients.amadues_api_client import AmadeusApi
+
+API_URL = "https://test.api.amadeus.com/v1/reference-data/locations"
+
+
+def install_upstream(monkeypatch, expires_in=1799, token_delay=0.0):
+    """Fake Amadeus that issues token-1, token-2, ... and only accepts the newest one."""
+    issued = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/v1/security/oauth2/token":
+            await asyncio.sleep(token_delay)
+            issued.append(f"token-{len(issued) + 1}")
+            body = {"access_token": issued[-1]}
+            if expires_in is not None:
+                body["expires_in"] = expires_in
+            return httpx.Response(200, json=body)
+        if not issued or request.headers["Authorization"] != f"Bearer {issued[-1]}":
+            return httpx.Response(401, json={"errors": [{"title": "Invalid access token"}]})
+        return httpx.Response(200, json={"data": []})
+
+    monkeypatch.setattr(amadues_api_client, "get_client",
+                        lambda url: httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    return issued
+
+
+def test_rejected_token_is_refreshed_and_request_retried(monkeypatch):
+    issued = install_upstream(monkeypatch)
+    client = AmadeusApi()
+    client.token = "revoked"
+    client.token_expires_at = float("inf")
+
+    response = asyncio.run(client.get(API_URL, {"keyword": "PAR"}))
+
+    assert response.status_code == 200
+    assert issued == ["token-1"]
+    assert client.stats() == {"token_refreshes": 1, "unauthorized_retries": 1}
+
+
+def test_concurrent_rejections_refresh_the_token_once(monkeypatch):
+    issued = install_upstream(monkeypatch, token_delay=0.05)
+    client = AmadeusApi()
+    client.token = "revoked"
+    client.token_expires_at = float("inf")
+
+    async def run():
+        return await asyncio.gather(*(client.get(API_URL, {"keyword": "PAR"}) for _ in range(5)))
+
+    assert [response.status_code for response in asyncio.run(run())] == [200] * 5
+    assert issued == ["token-1"]
+
+
+def test_threads_on_separate_event_loops_refresh_the_token_once(monkeypatch):
+    issued = install_upstream(monkeypatch, token_delay=0.2)
+    client = AmadeusApi()
+    tokens = []
+    threads = [threading.Thread(target=lambda: tokens.append(asyncio.run(client.get_token())))
+               for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert tokens == ["token-1"] * 4
+    assert issued == ["token-1"]
+
+
+def test_missing_expires_in_defaults_to_token_lifetime(monkeypatch):
+    install_upstream(monkeypatch, expires_in=None)
+    client = AmadeusApi()
+
+    asyncio.run(client.get_token())
+    asyncio.run(client.get_token())
+
+    assert client.token_refreshes == 1
+    assert client.token_expires_at > amadues_api_client.time.time() + 1700
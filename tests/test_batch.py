@@ -0,0 +1,64 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+from langchain_core.messages import AIMessage
+
+from backend.batch import completed_ids, run_file
+
+TRIP = {"origin_city": "Lyon", "destination": "Paris", "start_date": "2030-05-01", "end_date": "2030-05-03",
+        "adults": 1, "budget": 1000}
+
+
+class FakeGraph:
+    def __init__(self):
+        self.planned = []
+        self.checkpointer = SimpleNamespace(adelete_thread=self.adelete_thread)
+
+    async def ainvoke(self, data, config):
+        self.planned.append(data["thread_id"])
+        return {"messages": [AIMessage(content=f"Itinerary for {data['thread_id']}")]}
+
+    async def adelete_thread(self, thread_id):
+        pass
+
+
+def write_lines(path, lines):
+    path.write_text("".join(lines), encoding="utf-8")
+
+
+def test_missing_output_has_no_completed_ids(tmp_path):
+    assert completed_ids(str(tmp_path / "missing.jsonl")) == set()
+
+
+def test_completed_ids_drop_a_truncated_last_line(tmp_path):
+    output = tmp_path / "out.jsonl"
+    write_lines(output, [
+        json.dumps({"id": "a", "status": "ok"}) + "\n",
+        json.dumps({"id": "b", "status": "error", "error": "timeout"}) + "\n",
+        json.dumps({"id": "c", "status": "ok"})[:12],
+    ])
+
+    assert completed_ids(str(output)) == {"a"}
+    assert output.read_text(encoding="utf-8").endswith('"timeout"}\n')
+
+
+def test_resume_skips_completed_plans_and_retries_the_rest(tmp_path):
+    requests = tmp_path / "plans.jsonl"
+    output = tmp_path / "out.jsonl"
+    write_lines(requests, [json.dumps(dict(TRIP, id=plan_id)) + "\n" for plan_id in ("a", "b", "c")])
+    write_lines(output, [
+        json.dumps({"id": "a", "status": "ok", "itinerary": "Done before"}) + "\n",
+        json.dumps({"id": "b", "status": "error", "error": "timeout"}) + "\n",
+        '{"id": "c", "status": "o',
+    ])
+    graph = FakeGraph()
+
+    counts = asyncio.run(run_file(graph, str(requests), str(output), concurrency=2))
+
+    assert counts == {"skipped": 1, "ok": 2, "error": 0}
+    assert sorted(graph.planned) == ["b", "c"]
+    results = [json.loads(line) for line in output.read_text(encoding="utf-8").splitlines()]
+    assert [result["id"] for result in results[:2]] == ["a", "b"]
+    assert sorted(result["id"] for result in results[2:]) == ["b", "c"]
+    assert completed_ids(str(output)) == {"a", "b", "c"}
@@ -0,0 +1,107 @@
+import asyncio
+import threading
+import time
+
+from backend.cache import AsyncTTLCache, SQLiteCacheStore
+
+
+def counting_loader(value, delay=0.0):
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        await asyncio.sleep(delay)
+        return value
+
+    return loader, calls
+
+
+def test_concurrent_loads_share_one_call():
+    cache = AsyncTTLCache("test_coalescing", maxsize=10, ttl=60)
+    loader, calls = counting_loader("Paris", delay=0.05)
+
+    async def run():
+        return await asyncio.gather(*(cache.get_or_load("paris", loader) for _ in range(5)))
+
+    assert asyncio.run(run()) == ["Paris"] * 5
+    assert len(calls) == 1
+    assert cache.stats()["misses"] == 1 and cache.stats()["coalesced"] == 4
+
+
+def test_loads_on_different_event_loops_share_one_call():
+    cache = AsyncTTLCache("test_coalescing_threads", maxsize=10, ttl=60)
+    loader, calls = counting_loader("Paris", delay=0.2)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(asyncio.run(cache.get_or_load("paris", loader))))
+               for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == ["Paris"] * 4
+    assert len(calls) == 1
+
+
+def test_failed_loads_are_shared_and_not_cached():
+    cache = AsyncTTLCache("test_failures", maxsize=10, ttl=60)
+
+    async def failing():
+        await asyncio.sleep(0.05)
+        raise RuntimeError("upstream down")
+
+    async def run():
+        return await asyncio.gather(*(cache.get_or_load("paris", failing) for _ in range(3)), return_exceptions=True)
+
+    assert [str(result) for result in asyncio.run(run())] == ["upstream down"] * 3
+    assert cache.get("paris") is None
+
+
+def test_entries_expire_after_ttl():
+    cache = AsyncTTLCache("test_ttl", maxsize=10, ttl=0.1)
+    cache.set("paris", "Paris")
+    assert cache.get("paris") == "Paris"
+    time.sleep(0.15)
+    assert cache.get("paris") is None
+    assert cache.stats()["size"] == 0
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = AsyncTTLCache("test_lru", maxsize=2, ttl=None)
+    cache.set("paris", "Paris")
+    cache.set("rome", "Rome")
+    cache.get("paris")
+    cache.set("oslo", "Oslo")
+
+    assert cache.get("rome") is None
+    assert cache.get("paris") == "Paris" and cache.get("oslo") == "Oslo"
+    assert cache.stats()["evictions"] == 1
+
+
+def test_stale_entries_are_served_while_refreshing():
+    cache = AsyncTTLCache("test_stale", maxsize=10, ttl=0.1, stale_ttl=10)
+    loader, calls = counting_loader("Fresh Paris")
+
+    async def run():
+        cache.set("paris", "Stale Paris")
+        await asyncio.sleep(0.15)
+        stale = await cache.get_or_load("paris", loader)
+        await asyncio.sleep(0.05)
+        return stale, await cache.get_or_load("paris", loader)
+
+    assert asyncio.run(run()) == ("Stale Paris", "Fresh Paris")
+    assert len(calls) == 1
+    assert cache.stats()["stale_hits"] == 1
+
+
+def test_sqlite_tier_survives_a_new_cache(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    AsyncTTLCache("test_store", maxsize=10, ttl=60, store=SQLiteCacheStore(path, "places")).set("paris", {"n": 1})
+    AsyncTTLCache("test_store", maxsize=10, ttl=0.05, store=SQLiteCacheStore(path, "places")).set("rome", {"n": 2})
+    time.sleep(0.1)
+
+    reopened = AsyncTTLCache("test_store", maxsize=10, ttl=60, store=SQLiteCacheStore(path, "places"))
+    assert reopened.get("paris") == {"n": 1}
+    assert reopened.get("rome") is None
+    assert AsyncTTLCache("test_store_other", maxsize=10, ttl=60,
+                         store=SQLiteCacheStore(path, "other")).get("paris") is None
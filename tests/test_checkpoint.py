@@ -0,0 +1,88 @@
+import asyncio
+import time
+
+from langgraph.checkpoint.base import empty_checkpoint
+
+from backend.checkpoint import SQLiteCheckpointSaver
+
+
+def config(thread_id, checkpoint_id=None):
+    configurable = {"thread_id": thread_id, "checkpoint_ns": ""}
+    if checkpoint_id:
+        configurable["checkpoint_id"] = checkpoint_id
+    return {"configurable": configurable}
+
+
+def put(saver, thread_id, parent=None, step=0):
+    checkpoint = empty_checkpoint()
+    checkpoint["channel_values"] = {"step": step}
+    return saver.put(config(thread_id, parent), checkpoint, {"source": "loop", "step": step}, {})
+
+
+def test_put_get_and_list_round_trip(tmp_path):
+    saver = SQLiteCheckpointSaver(str(tmp_path / "checkpoints.sqlite"))
+    first = put(saver, "trip", step=0)
+    second = put(saver, "trip", parent=first["configurable"]["checkpoint_id"], step=1)
+    saver.put_writes(second, [("messages", "hello")], task_id="task-1")
+
+    latest = saver.get_tuple(config("trip"))
+    assert latest.config == second
+    assert latest.checkpoint["channel_values"] == {"step": 1}
+    assert latest.metadata["step"] == 1
+    assert latest.parent_config == first
+    assert latest.pending_writes == [("task-1", "messages", "hello")]
+
+    assert saver.get_tuple(first).checkpoint["channel_values"] == {"step": 0}
+    assert [t.config for t in saver.list(config("trip"))] == [second, first]
+    assert [t.config for t in saver.list(config("trip"), before=second)] == [first]
+    assert [t.config for t in saver.list(config("trip"), filter={"step": 0})] == [first]
+    assert saver.get_tuple(config("other")) is None
+
+
+def test_async_methods_match_sync(tmp_path):
+    saver = SQLiteCheckpointSaver(str(tmp_path / "checkpoints.sqlite"))
+
+    async def run():
+        stored = await saver.aput(config("trip"), empty_checkpoint(), {"step": 0}, {})
+        latest = await saver.aget_tuple(config("trip"))
+        listed = [t.config async for t in saver.alist(config("trip"))]
+        await saver.adelete_thread("trip")
+        return stored, latest.config, listed, await saver.aget_tuple(config("trip"))
+
+    stored, latest, listed, deleted = asyncio.run(run())
+    assert latest == stored and listed == [stored]
+    assert deleted is None
+
+
+def test_history_is_pruned_to_limit(tmp_path):
+    saver = SQLiteCheckpointSaver(str(tmp_path / "checkpoints.sqlite"), history_limit=3)
+    stored = []
+    for step in range(6):
+        parent = stored[-1]["configurable"]["checkpoint_id"] if stored else None
+        stored.append(put(saver, "trip", parent=parent, step=step))
+        saver.put_writes(stored[-1], [("messages", step)], task_id=f"task-{step}")
+
+    assert [t.config for t in saver.list(config("trip"))] == stored[:2:-1]
+    assert saver.get_tuple(stored[0]) is None
+    writes = saver._connection.execute("SELECT COUNT(*) FROM writes").fetchone()[0]
+    assert writes == 3
+
+
+def test_expired_threads_are_evicted(tmp_path):
+    saver = SQLiteCheckpointSaver(str(tmp_path / "checkpoints.sqlite"), ttl=0.2, eviction_interval=3600)
+    put(saver, "old")
+    time.sleep(0.3)
+    put(saver, "fresh")
+
+    assert saver.evict_expired_threads() == 1
+    assert saver.get_tuple(config("old")) is None
+    assert saver.get_tuple(config("fresh")) is not None
+
+
+def test_checkpoints_survive_reopening(tmp_path):
+    path = str(tmp_path / "checkpoints.sqlite")
+    stored = put(SQLiteCheckpointSaver(path), "trip", step=7)
+
+    reopened = SQLiteCheckpointSaver(path).get_tuple(config("trip"))
+    assert reopened.config == stored
+    assert reopened.checkpoint["channel_values"] == {"step": 7}
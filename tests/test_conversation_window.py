@@ -0,0 +1,75 @@
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+
+from backend.agents.conversation_window import compact_tool_outputs, estimate_tokens, transcript, window_start
+
+
+def turn(number, tool_output="x" * 40):
+    call = {"name": "weather_tool", "args": {"destination": "Paris"}, "id": f"call-{number}"}
+    return [
+        HumanMessage(content=f"Question {number}"),
+        AIMessage(content="", tool_calls=[call]),
+        ToolMessage(content=tool_output, tool_call_id=f"call-{number}", name="weather_tool"),
+        AIMessage(content=f"Answer {number}"),
+    ]
+
+
+def history(turns, **kwargs):
+    return [message for number in range(turns) for message in turn(number, **kwargs)]
+
+
+def start(messages, summarized=0, max_turns=3, token_budget=10_000, tool_output_chars=1000, summary_batch=1):
+    return window_start(messages, summarized, max_turns, token_budget, tool_output_chars, summary_batch)
+
+
+def test_short_history_is_sent_whole():
+    assert start(history(3)) == 0
+
+
+def test_window_keeps_the_latest_turns():
+    # Turns start every 4 messages; with 5 turns and max_turns=3 the window starts at turn 2.
+    assert start(history(5)) == 8
+
+
+def test_window_never_starts_before_the_summary():
+    assert start(history(5), summarized=12) == 12
+
+
+def test_small_overflow_waits_for_a_summary_batch():
+    assert start(history(5), summary_batch=10) == 0
+    assert start(history(5), summarized=4, summary_batch=10) == 4
+    assert start(history(8), summary_batch=10) == 20
+
+
+def test_token_budget_drops_whole_turns_but_keeps_the_latest():
+    messages = history(4, tool_output="x" * 400)
+    last_two_turns = estimate_tokens(messages[8:])
+    assert start(messages, max_turns=10, token_budget=last_two_turns, summary_batch=100) == 8
+    assert start(messages, max_turns=10, token_budget=last_two_turns - 1, summary_batch=100) == 12
+    assert start(messages, max_turns=10, token_budget=1, summary_batch=100) == 12
+
+
+def test_window_starts_at_a_user_turn():
+    messages = history(6)
+    first = start(messages, max_turns=2, token_budget=60)
+    assert isinstance(messages[first], HumanMessage)
+
+
+def test_old_tool_outputs_are_cut_but_the_latest_turn_is_kept():
+    messages = history(2, tool_output="y" * 100)
+    compacted = compact_tool_outputs(messages, 10)
+
+    assert compacted[2].content == "y" * 10 + " ...[truncated]"
+    assert compacted[6].content == "y" * 100
+    assert messages[2].content == "y" * 100
+    assert compacted[0] is messages[0]
+    assert estimate_tokens(compacted) < estimate_tokens(messages)
+
+
+def test_transcript_lists_turns_and_tool_calls():
+    text = transcript(turn(1, tool_output="Sunny and warm"), tool_output_chars=5)
+    assert text.splitlines() == [
+        "User: Question 1",
+        "Assistant called weather_tool with {'destination': 'Paris'}",
+        "Tool (weather_tool): Sunny",
+        "Assistant: Answer 1",
+    ]
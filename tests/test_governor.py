@@ -0,0 +1,152 @@
+import asyncio
+import threading
+import time
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+
+import httpx
+
+from backend.agents.governed import _is_throttled
+from backend.api_clients import governor
+from backend.api_clients.governor import GovernedTransport, UpstreamGovernor, retry_after_seconds
+
+
+class Concurrency:
+    def __init__(self):
+        self.current = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        with self._lock:
+            self.current += 1
+            self.peak = max(self.peak, self.current)
+
+    def __exit__(self, *exc):
+        with self._lock:
+            self.current -= 1
+
+
+def test_requests_over_the_cap_wait_in_line():
+    upstream = UpstreamGovernor("test", rate=0, max_in_flight=2)
+    running = Concurrency()
+
+    async def call():
+        async with upstream.slot():
+            with running:
+                await asyncio.sleep(0.05)
+
+    async def run():
+        await asyncio.gather(*(call() for _ in range(6)))
+
+    asyncio.run(run())
+    assert running.peak == 2
+    assert upstream.stats()["requests"] == 6 and upstream.stats()["max_queued"] >= 4
+    assert upstream.stats()["queued"] == 0 and upstream.stats()["in_flight"] == 0
+
+
+def test_cap_is_shared_by_event_loops_and_sync_callers():
+    upstream = UpstreamGovernor("test", rate=0, max_in_flight=2)
+    running = Concurrency()
+
+    def sync_call():
+        with upstream.sync_slot():
+            with running:
+                time.sleep(0.05)
+
+    async def async_call():
+        async with upstream.slot():
+            with running:
+                await asyncio.sleep(0.05)
+
+    threads = [threading.Thread(target=sync_call) for _ in range(3)]
+    threads += [threading.Thread(target=lambda: asyncio.run(async_call())) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert running.peak == 2
+    assert upstream.stats()["requests"] == 6 and upstream.stats()["in_flight"] == 0
+
+
+def test_cancelled_waiter_gives_up_its_place():
+    upstream = UpstreamGovernor("test", rate=0, max_in_flight=1)
+
+    async def run():
+        async with upstream.slot():
+            waiter = asyncio.create_task(upstream.slot().__aenter__())
+            await asyncio.sleep(0.01)
+            waiter.cancel()
+        async with upstream.slot():
+            return upstream.stats()
+
+    stats = asyncio.run(asyncio.wait_for(run(), 1))
+    assert stats["in_flight"] == 1 and stats["queued"] == 0
+
+
+def test_rate_limit_spaces_requests():
+    upstream = UpstreamGovernor("test", rate=10, max_in_flight=10)
+
+    async def run():
+        start = time.monotonic()
+        for _ in range(12):
+            async with upstream.slot():
+                pass
+        return time.monotonic() - start
+
+    # The first ten requests use the burst, the other two wait 1/10 s each.
+    assert asyncio.run(run()) >= 0.19
+
+
+def test_retry_after_is_parsed_from_seconds_and_dates():
+    assert retry_after_seconds(httpx.Headers({"Retry-After": "3"})) == 3.0
+    date = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=30), usegmt=True)
+    assert 25 < retry_after_seconds(httpx.Headers({"Retry-After": date})) <= 30
+    assert retry_after_seconds(httpx.Headers({"Retry-After": "soon"})) is None
+    assert retry_after_seconds(httpx.Headers()) is None
+
+
+def test_backoff_follows_retry_after_and_grows_exponentially(monkeypatch):
+    monkeypatch.setattr(governor, "UPSTREAM_BACKOFF_BASE", 0.5)
+    monkeypatch.setattr(governor, "UPSTREAM_BACKOFF_MAX", 30)
+    upstream = UpstreamGovernor("test", rate=0, max_in_flight=1)
+
+    assert 2.0 <= upstream.backoff(0, retry_after=2.0) <= 2.5
+    assert 60 > upstream.backoff(0, retry_after=60.0) >= 30
+    for attempt, ceiling in ((0, 0.5), (2, 2.0), (4, 8.0), (10, 30)):
+        assert ceiling / 2 <= upstream.backoff(attempt) <= ceiling
+    assert upstream.stats()["throttled"] == 6
+
+
+def test_throttled_responses_are_retried_after_retry_after(monkeypatch):
+    monkeypatch.setattr(governor, "UPSTREAM_BACKOFF_BASE", 0.01)
+    monkeypatch.setitem(governor.upstream_governors, "geoapify", UpstreamGovernor("geoapify", 0, 2))
+    answers = [httpx.Response(429, headers={"Retry-After": "0.1"}), httpx.Response(503), httpx.Response(200)]
+    sent = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        sent.append(time.monotonic())
+        return answers[len(sent) - 1]
+
+    async def run():
+        async with httpx.AsyncClient(transport=GovernedTransport(httpx.MockTransport(handler))) as client:
+            return await client.get("https://api.geoapify.com/v2/places")
+
+    assert asyncio.run(run()).status_code == 200
+    assert len(sent) == 3
+    assert sent[1] - sent[0] >= 0.1
+    assert governor.upstream_governors["geoapify"].stats()["throttled"] == 2
+
+
+def test_tavily_throttling_is_detected_from_the_status_code():
+    class HTTPError(Exception):
+        def __init__(self, status_code):
+            super().__init__("HTTP error")
+            self.response = type("Response", (), {"status_code": status_code})()
+
+    assert _is_throttled({"error": ValueError("Error 429: Too many requests")})
+    assert _is_throttled({"error": HTTPError(503)})
+    assert not _is_throttled({"error": HTTPError(401)})
+    assert not _is_throttled({"error": ValueError("Error 400: max_results must be below 429")})
+    assert not _is_throttled({"results": []})
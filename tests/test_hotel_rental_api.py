@@ -0,0 +1,50 @@
+import asyncio
+from datetime import date
+
+import pytest
+
+from backend.api_clients import hotel_rental_api
+from backend.api_clients.hotel_rental_api import get_hotel_offers_chunked, rank_hotels_by_price
+
+CHECK_IN, CHECK_OUT = date(2026, 6, 1), date(2026, 6, 5)
+
+
+def fake_offers(failing_ids):
+    async def get_hotel_offers(hotel_ids, check_in, check_out, adults=1):
+        if set(hotel_ids) & failing_ids:
+            raise RuntimeError(f"no rooms in {hotel_ids[0]}")
+        return {"data": [{"hotel": {"hotelId": hotel_id}} for hotel_id in hotel_ids]}
+    return get_hotel_offers
+
+
+def test_a_failed_chunk_only_drops_its_own_hotels(monkeypatch):
+    monkeypatch.setattr(hotel_rental_api, "HOTEL_OFFERS_CHUNK_SIZE", 2)
+    monkeypatch.setattr(hotel_rental_api, "get_hotel_offers", fake_offers({"H3"}))
+
+    offers = asyncio.run(get_hotel_offers_chunked(["H1", "H2", "H3", "H4", "H5"], CHECK_IN, CHECK_OUT))
+
+    assert [offer["hotel"]["hotelId"] for offer in offers["data"]] == ["H1", "H2", "H5"]
+
+
+def test_the_first_error_is_raised_when_every_chunk_fails(monkeypatch):
+    monkeypatch.setattr(hotel_rental_api, "HOTEL_OFFERS_CHUNK_SIZE", 2)
+    monkeypatch.setattr(hotel_rental_api, "get_hotel_offers", fake_offers({"H1", "H3"}))
+
+    with pytest.raises(RuntimeError, match="no rooms in H1"):
+        asyncio.run(get_hotel_offers_chunked(["H1", "H2", "H3"], CHECK_IN, CHECK_OUT))
+
+
+def test_hotels_without_prices_are_ranked_last():
+    hotels = [
+        {"hotelId": "H1", "offers": [{"price": None}]},
+        {"hotelId": "H2", "offers": [{"price": "250.00"}, {"price": "120.00"}]},
+        {"hotelId": "H3", "offers": []},
+        {"hotelId": "H2", "offers": [{"price": "10.00"}]},
+        {"hotelId": "H4", "offers": [{"price": "not a price"}, {"price": "180.00"}]},
+    ]
+
+    ranked = rank_hotels_by_price(hotels, limit=3)
+
+    assert [hotel["hotelId"] for hotel in ranked] == ["H2", "H4", "H1"]
+    assert [offer["price"] for offer in ranked[0]["offers"]] == ["120.00", "250.00"]
+    assert [offer["price"] for offer in ranked[1]["offers"]] == ["180.00", "not a price"]
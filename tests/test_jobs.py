@@ -0,0 +1,143 @@
+import asyncio
+from types import SimpleNamespace
+
+from fastapi.testclient import TestClient
+from langchain_core.messages import AIMessage
+
+from backend.jobs import PlanJobQueueFull, PlanJobs
+from backend.schemas import CreatePlanRequest
+
+
+class FakeGraph:
+    """Phase 1 graph that reports the weather agent, then waits for the test to let it finish."""
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+        self.finish = asyncio.Event()
+        self.runs = 0
+
+    async def astream(self, data, config, stream_mode):
+        self.runs += 1
+        yield {"weather_agent": {"weather_response": f"Sunny in {data['destination']}"}}
+        await self.finish.wait()
+        if self.fail:
+            raise RuntimeError("Gemini is down")
+        yield {"synthesizer": {"final_itinerary": "Day 1"}}
+
+    async def aget_state(self, config):
+        return SimpleNamespace(values={"messages": [AIMessage(content="Day 1: Louvre")]})
+
+
+def plan_request(thread_id: str = "trip-1") -> CreatePlanRequest:
+    return CreatePlanRequest(origin_city="Lyon", destination="Paris", start_date="2030-05-01",
+                             end_date="2030-05-03", adults=1, budget=1000, thread_id=thread_id)
+
+
+async def settle() -> None:
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def test_jobs_report_partial_results_then_the_itinerary():
+    async def run():
+        graph = FakeGraph()
+        jobs = PlanJobs(graph, workers=2)
+        job = jobs.submit(plan_request())
+        assert job.status == "queued"
+        await settle()
+        running = dict(jobs.get(job.job_id).to_dict())
+        graph.finish.set()
+        await settle()
+        await jobs.stop()
+        return running, job.to_dict()
+
+    running, done = asyncio.run(run())
+    assert running["status"] == "running"
+    assert running["weather_response"] == "Sunny in Paris" and running["itinerary"] is None
+    assert done["status"] == "done" and done["itinerary"] == "Day 1: Louvre"
+    assert done["finished_at"] is not None
+
+
+def test_resubmitting_a_thread_returns_its_job_unless_it_failed():
+    async def run():
+        graph = FakeGraph(fail=True)
+        jobs = PlanJobs(graph, workers=1)
+        first = jobs.submit(plan_request())
+        retried = jobs.submit(plan_request())
+        other = jobs.submit(plan_request("trip-2"))
+        graph.finish.set()
+        await settle()
+        after_error = jobs.submit(plan_request())
+        await jobs.stop()
+        return first, retried, other, after_error
+
+    first, retried, other, after_error = asyncio.run(run())
+    assert retried is first and other is not first
+    assert first.status == "error" and first.error == "Gemini is down"
+    assert after_error is not first and after_error.request.thread_id == "trip-1"
+
+
+def test_full_queue_rejects_new_jobs():
+    async def run():
+        jobs = PlanJobs(FakeGraph(), workers=1, max_queued=2)
+        jobs.submit(plan_request("trip-1"))
+        jobs.submit(plan_request("trip-2"))
+        try:
+            jobs.submit(plan_request("trip-3"))
+        except PlanJobQueueFull:
+            rejected = True
+        else:
+            rejected = False
+        stats = jobs.stats()
+        await jobs.stop()
+        return rejected, stats
+
+    assert asyncio.run(run()) == (True, {"queued": 2})
+
+
+def test_finished_jobs_are_pruned_after_their_ttl():
+    async def run():
+        graph = FakeGraph()
+        graph.finish.set()
+        jobs = PlanJobs(graph, workers=1, result_ttl=0)
+        job = jobs.submit(plan_request())
+        await settle()
+        pruned = jobs.get(job.job_id)
+        resubmitted = jobs.submit(plan_request())
+        await jobs.stop()
+        return job, pruned, resubmitted
+
+    job, pruned, resubmitted = asyncio.run(run())
+    assert job.status == "done" and pruned is None
+    assert resubmitted is not job
+
+
+def test_workers_start_on_first_submit_and_restart_after_stop():
+    async def run():
+        graph = FakeGraph()
+        graph.finish.set()
+        jobs = PlanJobs(graph, workers=3)
+        before = len(jobs._tasks)
+        jobs.submit(plan_request("trip-1"))
+        started = len(jobs._tasks)
+        await settle()
+        await jobs.stop()
+        stopped = all(task.done() for task in jobs._tasks) and not jobs._tasks
+        job = jobs.submit(plan_request("trip-2"))
+        await settle()
+        await jobs.stop()
+        return before, started, stopped, job.status, graph.runs
+
+    assert asyncio.run(run()) == (0, 3, True, "done", 2)
+
+
+def test_submit_endpoint_answers_503_when_the_queue_is_full(monkeypatch):
+    from backend import main
+
+    def full(request):
+        raise PlanJobQueueFull("2 plan jobs are already queued.")
+
+    monkeypatch.setattr(main.plan_jobs, "submit", full)
+    response = TestClient(main.app).post("/plan/jobs", json=plan_request().model_dump())
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "5"
+    assert response.json()["detail"] == "2 plan jobs are already queued."
@@ -0,0 +1,102 @@
+import asyncio
+
+import pytest
+
+from backend.api_clients import car_rental_api
+from backend.places_index import PlacesIndex
+
+PARIS = "51a1f3b1c6d2"
+LYON = "51a1f3b1c6d2ff"
+
+
+def feature(place_id, categories):
+    return {"properties": {"place_id": place_id, "categories": categories}}
+
+
+def index_city(index, city, city_place_id, places):
+    features = [feature(name, categories) for name, categories in places]
+    summaries = [{"name": name} for name, _ in places]
+    return index.replace_city(city, city_place_id, features, summaries)
+
+
+def names(places):
+    return [place["name"] for place in places]
+
+
+def build_index(tmp_path, **kwargs):
+    index = PlacesIndex(str(tmp_path / "places.sqlite"), **kwargs)
+    index_city(index, "Paris, France", PARIS, [
+        ("Cafe de Flore", ["catering", "catering.cafe"]),
+        ("Le Jules Verne", ["catering", "catering.restaurant"]),
+        ("Disneyland", ["entertainment", "entertainment.theme_park"]),
+        ("Louvre", ["entertainment", "entertainment.museum", "tourism"]),
+        ("Hertz", ["rental", "rental.car"]),
+    ])
+    index_city(index, "Lyon, France", LYON, [("Bouchon", ["catering", "catering.restaurant"])])
+    return index
+
+
+def test_parent_category_matches_every_subcategory(tmp_path):
+    index = build_index(tmp_path)
+    assert names(index.lookup(PARIS, [("catering",)], 10)) == ["Cafe de Flore", "Le Jules Verne"]
+    assert names(index.lookup(PARIS, [("entertainment",)], 10)) == ["Disneyland", "Louvre"]
+
+
+def test_subcategory_only_matches_itself(tmp_path):
+    index = build_index(tmp_path)
+    assert names(index.lookup(PARIS, [("catering.cafe",)], 10)) == ["Cafe de Flore"]
+    assert names(index.lookup(PARIS, [("rental.car",)], 10)) == ["Hertz"]
+    assert index.lookup(PARIS, [("rental.bicycle",)], 10) == []
+
+
+def test_place_id_is_matched_as_a_whole(tmp_path):
+    index = build_index(tmp_path)
+    assert names(index.lookup(PARIS, [("catering.restaurant",)], 10)) == ["Le Jules Verne"]
+    assert names(index.lookup(LYON, [("catering.restaurant",)], 10)) == ["Bouchon"]
+
+
+def test_each_category_group_gets_its_share_without_duplicates(tmp_path):
+    index = build_index(tmp_path)
+    places = index.lookup(PARIS, [("catering",), ("entertainment", "tourism"), ("tourism",)], 1)
+    assert names(places) == ["Cafe de Flore", "Disneyland", "Louvre"]
+
+
+def test_unindexed_and_stale_cities_are_misses(tmp_path):
+    index = build_index(tmp_path, max_age=-1)
+    assert index.lookup(PARIS, [("catering",)], 10) is None
+    assert build_index(tmp_path).lookup("unknown", [("catering",)], 10) is None
+
+
+def test_reindexing_a_city_replaces_its_places(tmp_path):
+    index = build_index(tmp_path)
+    assert index_city(index, "Paris, France", PARIS, [("Angelina", ["catering", "catering.cafe"])]) == 1
+    assert names(index.lookup(PARIS, [("catering",)], 10)) == ["Angelina"]
+    assert index.place_id(" paris ,France") == PARIS
+    assert names(index.lookup(LYON, [("catering",)], 10)) == ["Bouchon"]
+
+
+def test_async_lookup_matches_sync(tmp_path):
+    index = build_index(tmp_path)
+    places = asyncio.run(index.alookup(PARIS, [("catering.cafe",)], 10))
+    assert names(places) == ["Cafe de Flore"]
+    assert asyncio.run(index.aplace_id("Lyon, France")) == LYON
+
+
+def test_clients_skip_the_index_without_a_place_id(tmp_path, monkeypatch):
+    index = build_index(tmp_path)
+
+    async def no_place_id(city):
+        return None
+
+    async def fake_get(url):
+        raise RuntimeError(url)
+
+    class Client:
+        get = staticmethod(fake_get)
+
+    monkeypatch.setattr(car_rental_api, "places_index", index)
+    monkeypatch.setattr(car_rental_api, "get_place_id_of_city", no_place_id)
+    monkeypatch.setattr(car_rental_api, "get_client", lambda url: Client())
+    with pytest.raises(RuntimeError):
+        asyncio.run(car_rental_api.get_car_rental_data("Nowhere"))
+    assert index.stats()["misses"] == 0 and index.stats()["hits"] == 0
@@ -0,0 +1,30 @@
+import asyncio
+
+from backend import plan_cache
+
+
+async def fake_stage_key(stage, state):
+    return f"{stage}|{state['destination']}"
+
+
+def run_stage(monkeypatch, responses, destination):
+    monkeypatch.setattr(plan_cache, "PLAN_CACHE_ENABLED", True)
+    monkeypatch.setattr(plan_cache, "stage_key", fake_stage_key)
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        return responses[len(calls) - 1]
+
+    state = {"destination": destination}
+    first = asyncio.run(plan_cache.cached_stage("weather", state, loader))
+    second = asyncio.run(plan_cache.cached_stage("weather", state, loader))
+    return first, second, len(calls)
+
+
+def test_empty_stage_responses_are_not_cached(monkeypatch):
+    assert run_stage(monkeypatch, ["", "Sunny."], "Empty City") == ("", "Sunny.", 2)
+
+
+def test_stage_responses_are_cached(monkeypatch):
+    assert run_stage(monkeypatch, ["Rainy.", "Sunny."], "Cached City") == ("Rainy.", "Rainy.", 1)
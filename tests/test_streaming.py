@@ -0,0 +1,63 @@
+import asyncio
+import json
+from typing import Any, Dict, TypedDict
+
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.graph import END, START, StateGraph
+
+from backend.streaming import stream_graph
+
+
+class State(TypedDict, total=False):
+    messages: list
+
+
+def build_graph(fail: bool = False):
+    llm = GenericFakeChatModel(messages=iter([AIMessage(content="Pack an umbrella")]))
+
+    async def weather_agent(state: State) -> Dict[str, Any]:
+        if fail:
+            raise RuntimeError("weather API down")
+        return {}
+
+    async def synthesizer(state: State) -> Dict[str, Any]:
+        return {"messages": [await llm.ainvoke("plan")]}
+
+    builder = StateGraph(State)
+    builder.add_node("weather_agent", weather_agent)
+    builder.add_node("synthesizer", synthesizer)
+    builder.add_edge(START, "weather_agent")
+    builder.add_edge("weather_agent", "synthesizer")
+    builder.add_edge("synthesizer", END)
+    return builder.compile(checkpointer=InMemorySaver())
+
+
+def collect(graph) -> list:
+    async def run():
+        config = {"configurable": {"thread_id": "trip-1"}}
+        return [event async for event in stream_graph(graph, {"messages": []}, config, "itinerary")]
+
+    events = []
+    for event in asyncio.run(run()):
+        name, data = event.strip().split("\n")
+        events.append((name.removeprefix("event: "), json.loads(data.removeprefix("data: "))))
+    return events
+
+
+def test_stream_emits_progress_tokens_and_done():
+    events = collect(build_graph())
+    progress = [data["node"] for name, data in events if name == "progress"]
+    tokens = "".join(data["content"] for name, data in events if name == "token")
+    assert progress == ["weather_agent", "synthesizer"]
+    assert tokens == "Pack an umbrella"
+    assert {data["node"] for name, data in events if name == "token"} == {"synthesizer"}
+    assert events[-1] == ("done", {"thread_id": "trip-1", "itinerary": "Pack an umbrella"})
+
+
+def test_stream_emits_error_when_a_node_fails():
+    events = collect(build_graph(fail=True))
+    assert events[-1][0] == "error"
+    assert "weather API down" in events[-1][1]["detail"]
+    assert not [name for name, _ in events if name in ("token", "done")]
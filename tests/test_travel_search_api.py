@@ -0,0 +1,22 @@
+from backend.api_clients.travel_search_api import (BUSINESS_CATEGORIES, FOODIE_CATEGORIES, activity_category_groups,
+                                                   merge_places)
+
+
+def test_every_selected_purpose_keeps_its_places():
+    restaurants = [{"name": f"Restaurant {index}"} for index in range(10)]
+    sights = [{"name": "Louvre"}, {"name": "Eiffel Tower"}]
+
+    merged = merge_places([restaurants, sights])
+
+    assert merged == restaurants + sights
+
+
+def test_places_found_by_several_purposes_are_kept_once():
+    park = {"name": "Parc des Buttes-Chaumont", "categories": ["leisure.park"]}
+
+    assert merge_places([[park, {"name": "Cafe"}], [park]]) == [park, {"name": "Cafe"}]
+
+
+def test_category_groups_default_to_sightseeing():
+    assert activity_category_groups(True, False, False) == [FOODIE_CATEGORIES]
+    assert activity_category_groups(False, False, False) == [BUSINESS_CATEGORIES]
@@ -0,0 +1,17 @@
+from backend.agents.web_search import normalize_query, search_key
+
+
+def test_normalize_query_ignores_case_punctuation_and_filler_words():
+    assert normalize_query("Best restaurants in Paris!") == normalize_query("best restaurants paris")
+
+
+def test_directional_queries_get_different_keys():
+    assert (search_key("flights from New York to Paris", {})
+            != search_key("flights from Paris to New York", {}))
+    assert (search_key("taxi fare from airport to hotel", {})
+            != search_key("taxi fare from hotel to airport", {}))
+
+
+def test_search_options_are_part_of_the_key():
+    assert search_key("weather Paris", {"topic": "news"}) != search_key("weather Paris", {})
+    assert search_key("weather Paris", {"include_domains": None}) == search_key("weather Paris", {})